@@ -4,6 +4,9 @@ Este arquivo contém a função create_app que configura todas as extensões,
 registra blueprints e configura os handlers de erro.
 """
 
+import time
+_IMPORT_STARTED = time.perf_counter()
+
 import os
 from flask import Flask, jsonify, request
 from pydantic import ValidationError
@@ -11,11 +14,28 @@ from flask_cors import CORS
 from dotenv import load_dotenv
 
 from app.config import config
-from app.extensions import db, migrate, jwt, cors, csrf
+from app.extensions import db, init_migrate, jwt, cors, csrf
 from app.utils import handle_validation_error
 from app.models import User, Restaurant
 from app.api import api_bp
+from app.services.trigram_index import restaurant_index
+from app.services.suggest import suggest_index
+from app.services.cache import response_cache
+from app.services.passwords import password_hasher
+from app.services.user_cache import user_cache
+from app.services.db_pool import database_pool
+from app.services import metrics
+from app.services.query_monitor import query_monitor
+from app.utils.geo import cep_coordinates
 from app.core.logger import logger
+from app.core.boot import BootTimer
+
+# Tempo de importação do pacote e das dependências, em milissegundos
+IMPORT_TIME_MS = round((time.perf_counter() - _IMPORT_STARTED) * 1000, 2)
+
+def _running_cli():
+    """Indica se a aplicação foi carregada pelo comando `flask` (ex.: `flask db upgrade`)."""
+    return os.environ.get('FLASK_RUN_FROM_CLI') == 'true'
 
 def create_app(config_name=None):
     """
@@ -27,28 +47,55 @@ def create_app(config_name=None):
 
     Returns:
         Flask: Aplicação Flask configurada e pronta para uso.
+
+    Com FAST_BOOT (padrão em produção) a criação pula o `db.create_all()` (o
+    esquema vem das migrações do Alembic), só registra o Flask-Migrate quando
+    a aplicação é carregada pelo comando `flask` e não registra a proteção
+    CSRF quando todas as rotas são da API. O tempo de cada etapa fica em
+    `app.extensions['boot_timings']`.
     """
+    timer = BootTimer()
     logger.info("Criando a aplicação Flask...")
     # Carrega as variáveis de ambiente do arquivo .env
-    load_dotenv()
+    with timer.phase('dotenv'):
+        load_dotenv()
     logger.debug("Variáveis de ambiente carregadas.")
 
     if config_name is None:
         config_name = os.getenv('FLASK_ENV', 'development')
-        logger.debug(f"Nenhum config_name fornecido, usando FLASK_ENV ou o padrão: {config_name}")
+        logger.debug("Nenhum config_name fornecido, usando FLASK_ENV ou o padrão: %s", config_name)
 
-    app = Flask(__name__)
-    app.config.from_object(config[config_name])
-    logger.info(f"Aplicação configurada com as definições de '{config_name}'.")
+    with timer.phase('config'):
+        app = Flask(__name__)
+        app.config.from_object(config[config_name])
+    fast_boot = app.config.get('FAST_BOOT', False)
+    logger.info("Aplicação configurada com as definições de '%s'.", config_name)
 
     # Inicializa todas as extensões necessárias
     logger.debug("Inicializando extensões...")
-    db.init_app(app)
-    migrate.init_app(app, db)
-    jwt.init_app(app)
-    cors.init_app(app, resources={r"/api/*": {"origins": app.config['CORS_ORIGINS']}})
-    csrf.init_app(app)
+    with timer.phase('extensions'):
+        database_pool.init_app(app)
+        db.init_app(app)
+        if not fast_boot or _running_cli():
+            init_migrate(app)
+        jwt.init_app(app)
+        cors.init_app(app, resources={r"/api/*": {
+            "origins": app.config['CORS_ORIGINS'],
+            "expose_headers": ['X-Next-Cursor', 'Link', 'X-Cache']
+        }})
+    with timer.phase('services'):
+        metrics.init_app(app)
+        query_monitor.init_app(app)
+        cep_coordinates.init_app(app)
+        restaurant_index.init_app(app)
+        suggest_index.init_app(app)
+        response_cache.init_app(app)
+        password_hasher.init_app(app)
+        user_cache.init_app(app)
     logger.info("Extensões Flask inicializadas (DB, Migrate, JWT, CORS, CSRF).")
+    logger.debug("Backend de busca: %s", app.config['SEARCH_BACKEND'])
+    logger.debug("Backend de cache: %s", app.config['CACHE_BACKEND'])
+    logger.debug("Pool de conexões: %s", app.config['SQLALCHEMY_ENGINE_OPTIONS'])
 
     # Adiciona cabeçalhos de segurança
     if app.config.get('ENABLE_SECURITY_HEADERS', False):
@@ -76,12 +123,12 @@ def create_app(config_name=None):
     logger.debug("Registrando manipuladores de erro (error handlers)...")
     @app.errorhandler(ValidationError)
     def validation_error_handler(error):
-        logger.error(f"Erro de validação: {error}", exc_info=True)
+        logger.error("Erro de validação: %s", error, exc_info=True)
         return handle_validation_error(error)
 
     @app.errorhandler(404)
     def not_found_error(error):
-        logger.warning(f"Recurso não encontrado (404): {request.path}")
+        logger.warning("Recurso não encontrado (404): %s", request.path)
         return jsonify({'message': 'Resource not found'}), 404
 
     @app.errorhandler(500)
@@ -92,18 +139,35 @@ def create_app(config_name=None):
 
     # Registra o blueprint da API com o prefixo /api
     logger.debug("Registrando blueprint da API em /api...")
-    app.register_blueprint(api_bp, url_prefix='/api')
+    with timer.phase('blueprints'):
+        app.register_blueprint(api_bp, url_prefix='/api')
     logger.info("Blueprint da API registrado.")
 
-    # Isentar todas as rotas /api/ da proteção CSRF após o registro
-    logger.debug("Isentando blueprint da API da proteção CSRF.")
-    csrf.exempt(api_bp)
-
-    # Cria as tabelas do banco de dados se não existirem
-    with app.app_context():
-        logger.debug("Garantindo que as tabelas do banco de dados existam...")
-        db.create_all()
-        logger.info("Tabelas do banco de dados verificadas/criadas.")
+    # Isentar todas as rotas /api/ da proteção CSRF após o registro.
+    # Os blueprints aninhados (api.auth, api.restaurants) são verificados
+    # pelo próprio nome, por isso cada um precisa ser isentado.
+    api_blueprints = [blueprint for name, blueprint in app.blueprints.items()
+                      if name == 'api' or name.startswith('api.')]
+    if fast_boot and len(api_blueprints) == len(app.blueprints):
+        # Sem rotas fora da API a proteção não teria o que verificar
+        logger.debug("Proteção CSRF não registrada: todas as rotas são da API.")
+    else:
+        csrf.init_app(app)
+        logger.debug("Isentando blueprints da API da proteção CSRF.")
+        for blueprint in api_blueprints:
+            csrf.exempt(blueprint)
 
-    logger.info(f"Aplicação Flask criada com sucesso usando a configuração '{config_name}'.")
+    if fast_boot:
+        logger.debug("FAST_BOOT: criação de tabelas ignorada (use `flask db upgrade`).")
+    else:
+        # Cria as tabelas do banco de dados se não existirem
+        with app.app_context(), timer.phase('schema'):
+            logger.debug("Garantindo que as tabelas do banco de dados existam...")
+            db.create_all()
+            logger.info("Tabelas do banco de dados verificadas/criadas.")
+
+    app.extensions['boot_timings'] = {'imports': IMPORT_TIME_MS, **timer.timings, 'total': timer.total()}
+    logger.info("Aplicação Flask criada com sucesso usando a configuração '%s'.", config_name)
+    logger.info("Inicialização em %.1f ms (importações %.1f ms; %s).",
+                timer.total(), IMPORT_TIME_MS, timer.summary())
     return app
\ No newline at end of file
@@ -3,10 +3,13 @@ Módulo que implementa as rotas de autenticação da API.
 Inclui endpoints para registro, login e obtenção de informações do usuário atual.
 """
 
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from flask import Blueprint, jsonify
+from flask_jwt_extended import create_access_token, jwt_required, get_jwt, get_jwt_identity
 from app.extensions import db, csrf
 from app.models import User
+from app.services.passwords import PasswordPoolBusy
+from app.services.query_monitor import query_monitor
+from app.services.user_cache import user_cache
 from app.utils.validators import validate_schema
 from marshmallow import Schema, fields, ValidationError
 from app.core.logger import logger
@@ -26,9 +29,10 @@ class LoginSchema(Schema):
     password = fields.String(required=True)
 
 @auth_bp.route('/login', methods=['POST'])
+@query_monitor.budget(3)  # SELECT + rehash (UPDATE do usuário e de users_generation)
 @csrf.exempt  # Isenta a rota de login da proteção CSRF
 @validate_schema(LoginSchema())
-def login():
+def login(data):
     """
     Endpoint para autenticação de usuários.
 
@@ -36,37 +40,74 @@ def login():
         tuple: (JSON response, status code)
             - 200: Login bem sucedido, retorna token de acesso
             - 401: Credenciais inválidas
+            - 503: Pool de hashing de senhas saturado (com Retry-After)
     """
-    data = request.get_json()
     email = data['email']
-    logger.info(f"Tentativa de login para o email: {email}")
+    logger.info("Tentativa de login para o email: %s", email)
 
     user = User.query.filter_by(email=email).first()
-    if not user or not user.check_password(data['password']):
-        logger.warning(f"Credenciais inválidas para o email: {email}")
-        return jsonify({'message': 'Invalid email or password'}), 401
+    try:
+        if not user or not user.check_password(data['password']):
+            logger.warning("Credenciais inválidas para o email: %s", email)
+            return jsonify({'message': 'Invalid email or password'}), 401
 
-    access_token = create_access_token(identity=str(user.id))
-    logger.info(f"Login bem-sucedido para o usuário ID: {user.id} (Email: {email})")
+        # Atualiza o hash quando o custo do bcrypt foi alterado
+        rehashed = user.password_needs_rehash()
+        if rehashed:
+            user.set_password(data['password'])
+            db.session.flush()
+    except PasswordPoolBusy:
+        logger.warning("Pool de hashing saturado, login recusado para o email: %s", email)
+        response = jsonify({'message': 'Service temporarily unavailable, try again'})
+        response.headers['Retry-After'] = '1'
+        return response, 503
+
+    # Lidos antes do commit, que expira o objeto (evita um SELECT de recarga)
+    user_id, profile, version = user.id, user.to_dict(), user.version
+    if rehashed:
+        db.session.commit()
+        logger.info("Hash da senha atualizado para o usuário ID: %s", user_id)
+
+    # O perfil público e a versão do usuário vão no token para que /me
+    # possa ser respondido sem consultar o banco
+    access_token = create_access_token(
+        identity=str(user_id),
+        additional_claims={'profile': profile, 'version': version}
+    )
+    user_cache.set(user_id, version)
+    logger.info("Login bem-sucedido para o usuário ID: %s (Email: %s)", user_id, email)
     return jsonify({'access_token': access_token}), 200
 
 @auth_bp.route('/me', methods=['GET'])
+@query_monitor.budget(2)  # geração dos usuários (a cada USER_CACHE_SYNC_INTERVAL) + usuário
 @jwt_required()
 def get_current_user():
     """
     Endpoint para obter informações do usuário autenticado.
     Requer token JWT válido.
 
+    Quando o token traz o perfil e a versão do usuário ainda é a atual
+    (confirmada pelo cache de usuários), a resposta vem do próprio token,
+    sem consultar o banco.
+
     Returns:
         tuple: (JSON response, status code)
             - 200: Informações do usuário
             - 401: Token inválido ou ausente
+            - 404: Usuário removido
     """
-    current_user_id = get_jwt_identity()
-    logger.info(f"Buscando informações para o usuário ID: {current_user_id}")
-    user = User.query.get(int(current_user_id))
+    current_user_id = int(get_jwt_identity())
+    claims = get_jwt()
+    profile = claims.get('profile')
+    if profile is not None and user_cache.get(current_user_id) == claims.get('version'):
+        logger.debug("Perfil do usuário ID %s obtido do token.", current_user_id)
+        return jsonify(profile), 200
+
+    logger.info("Buscando informações para o usuário ID: %s", current_user_id)
+    user = db.session.get(User, current_user_id)
     if not user:
-        logger.error(f"Usuário com ID {current_user_id} não encontrado no banco, mas o JWT era válido.")
+        logger.error("Usuário com ID %s não encontrado no banco, mas o JWT era válido.", current_user_id)
         return jsonify({'message': 'User not found'}), 404
-    logger.debug(f"Informações obtidas com sucesso para o usuário ID: {current_user_id}")
-    return jsonify(user.to_dict()), 200
\ No newline at end of file
+    user_cache.set(user.id, user.version)
+    logger.debug("Informações obtidas com sucesso para o usuário ID: %s", current_user_id)
+    return jsonify(user.to_dict()), 200
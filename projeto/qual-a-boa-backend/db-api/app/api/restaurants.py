@@ -3,111 +3,144 @@ Módulo que implementa as rotas da API para gerenciamento de restaurantes.
 Inclui operações CRUD e busca de restaurantes.
 """
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app, abort
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy.exc import IntegrityError
 from app.extensions import db
 from app.models import Restaurant
 from app.utils.validators import validate_schema
-from marshmallow import Schema, fields, ValidationError
-import unicodedata
+from app.services.search import parse_search_criteria, search_page, wants_fuzzy
+from app.services.pagination import PaginationError, parse_page_args, select_fields, fetch_page, page_response
+from app.services.streaming import stream_format, stream_response
+from app.services.bulk import BulkError, parse_bulk_body, bulk_write
+from app.services.catalog_version import conditional_get, catalog_etag, restaurant_etag
+from app.services.cache import response_cache
+from app.services.facets import parse_city_limit, restaurant_facets
+from app.services.opening_hours import OpenAtError, open_hours_etag
+from app.services.geo import RADIUS_STEPS, NearbyError, parse_nearby_args, nearby_restaurants
+from app.services.serialization import json_response
+from app.services.suggest import SuggestError, parse_suggest_args, suggest_index
+from app.services.db_pool import database_pool
+from app.services.query_monitor import query_monitor
+from app.schemas.restaurant import RestaurantCreate, RestaurantUpdate
 from app.core.logger import logger
 
 # Blueprint para agrupar as rotas de restaurantes
 restaurants_bp = Blueprint('restaurants', __name__)
 
-class RestaurantSchema(Schema):
-    """
-    Schema para validação dos dados de restaurante.
-
-    Campos:
-        cnpj: CNPJ do restaurante
-        name: Nome do restaurante
-        state: Estado onde está localizado
-        city: Cidade onde está localizado
-        type: Tipo de culinária/estabelecimento
-        operating_hours: Horário de funcionamento
-        postal_code: Código postal
-        street_number: Número do endereço
-    """
-    cnpj = fields.String(required=True)
-    name = fields.String(required=True)
-    state = fields.String(required=True)
-    city = fields.String(required=True)
-    type = fields.String(required=True)
-    operating_hours = fields.String(required=True)
-    postal_code = fields.String(required=True)
-    street_number = fields.String(required=True)
-
-def normalize_text(text):
-    """
-    Normaliza texto removendo acentos e convertendo para minúsculas.
-
-    Args:
-        text (str): Texto a ser normalizado
-
-    Returns:
-        str: Texto normalizado
-    """
-    if not text:
-        return ''
-    # Remove acentos
-    normalized = unicodedata.normalize('NFKD', text).encode('ASCII', 'ignore').decode('ASCII')
-    return normalized.lower()
-
 @restaurants_bp.route('/', methods=['POST'])
+@query_monitor.budget(3)
 @jwt_required()
-@validate_schema(RestaurantSchema())
-def create_restaurant():
+@validate_schema(RestaurantCreate)
+def create_restaurant(data):
     """
     Endpoint para criar um novo restaurante.
     Requer autenticação e validação dos dados.
 
+    Args:
+        data (RestaurantCreate): Dados já validados e normalizados
+
     Returns:
         tuple: (JSON response, status code)
             - 201: Restaurante criado com sucesso
             - 400: CNPJ já existe
     """
-    data = request.get_json()
-    cnpj = data['cnpj']
-    name = data['name']
-    logger.info(f"Attempting to create restaurant '{name}' with CNPJ: {cnpj}")
+    cnpj = data.cnpj
+    logger.info("Attempting to create restaurant '%s' with CNPJ: %s", data.name, cnpj)
 
-    if Restaurant.query.filter_by(cnpj=cnpj).first():
-        logger.warning(f"Restaurant creation failed: CNPJ {cnpj} already exists.")
+    restaurant = Restaurant(**data.model_dump())
+    db.session.add(restaurant)
+    # CNPJ duplicado é detectado pela restrição única, sem um SELECT prévio
+    try:
+        db.session.flush()
+    except IntegrityError:
+        db.session.rollback()
+        logger.warning("Restaurant creation failed: CNPJ %s already exists.", cnpj)
         return jsonify({'message': 'Restaurant with this CNPJ already exists'}), 400
 
-    restaurant = Restaurant(
-        cnpj=cnpj,
-        name=name,
-        state=data['state'],
-        city=data['city'],
-        type=data['type'],
-        operating_hours=data['operating_hours'],
-        postal_code=data['postal_code'],
-        street_number=data['street_number']
-    )
-
-    db.session.add(restaurant)
+    # Serializado antes do commit, que expira o objeto (evita um SELECT de recarga)
+    payload = restaurant.to_dict()
     db.session.commit()
-    logger.info(f"Restaurant '{restaurant.name}' (ID: {restaurant.id}) created successfully.")
+    logger.info("Restaurant '%s' (ID: %s) created successfully.", payload['name'], payload['id'])
+
+    return jsonify(payload), 201
+
+@restaurants_bp.route('/bulk', methods=['POST'])
+@jwt_required()
+def bulk_restaurants():
+    """
+    Endpoint para criar ou atualizar restaurantes em lote.
+    Aceita uma lista JSON ou NDJSON (Content-Type: application/x-ndjson).
+    Requer autenticação.
 
-    return jsonify(restaurant.to_dict()), 201
+    Parâmetros de consulta:
+        mode: 'insert' (padrão, CNPJ existente é erro) ou 'upsert'
+        batch_size: Linhas por INSERT/transação (padrão BULK_BATCH_SIZE)
+
+    Returns:
+        tuple: (JSON response, status code)
+            - 200: Lote processado, com o resultado de cada linha
+            - 400: Corpo ou parâmetros inválidos
+    """
+    mode = request.args.get('mode', 'insert')
+    try:
+        batch_size = int(request.args.get('batch_size', current_app.config['BULK_BATCH_SIZE']))
+        if not 1 <= batch_size <= current_app.config['BULK_MAX_BATCH_SIZE']:
+            raise BulkError(f"batch_size must be between 1 and {current_app.config['BULK_MAX_BATCH_SIZE']}")
+        items = parse_bulk_body(request)
+        logger.info("Bulk %s of %s restaurants (batch size %s).", mode, len(items), batch_size)
+        report = bulk_write(items, RestaurantCreate, mode=mode, batch_size=batch_size)
+    except ValueError as err:
+        logger.warning("Bulk request rejected: %s", err)
+        return jsonify({'message': str(err)}), 400
+
+    logger.info(
+        "Bulk %s finished: %s created, %s updated, %s failed.",
+        mode, report['created'], report['updated'], report['failed'],
+    )
+    return jsonify(report), 200
 
 @restaurants_bp.route('/', methods=['GET'])
+@query_monitor.budget(2)
+@conditional_get(catalog_etag)
+@response_cache.cached('list')
 def get_restaurants():
     """
-    Endpoint para listar todos os restaurantes.
+    Endpoint para listar os restaurantes, paginados por cursor.
+
+    Parâmetros de consulta:
+        limit: Tamanho da página (padrão PAGINATION_DEFAULT_LIMIT)
+        after: Cursor (id do último restaurante da página anterior)
+        fields: Campos a retornar, separados por vírgula
+        stream: '1' para receber o catálogo completo em streaming
+                (ou cabeçalho Accept: application/x-ndjson)
 
     Returns:
         tuple: (JSON response, status code)
-            - 200: Lista de restaurantes
+            - 200: Lista de restaurantes (cursor no cabeçalho X-Next-Cursor)
+            - 304: Catálogo não mudou desde a ETag enviada em If-None-Match
+            - 400: Parâmetros de paginação inválidos
     """
-    logger.info("Fetching all restaurants.")
-    restaurants = Restaurant.query.all()
-    logger.debug(f"Found {len(restaurants)} restaurants.")
-    return jsonify([r.to_dict() for r in restaurants]), 200
+    try:
+        page = parse_page_args(request.args)
+    except PaginationError as err:
+        logger.warning("Invalid pagination parameters: %s", err)
+        return jsonify({'message': str(err)}), 400
+
+    fmt = stream_format(request)
+    if fmt:
+        logger.info("Streaming full restaurant catalog as %s.", fmt)
+        return stream_response(select_fields(page.fields), fmt)
+
+    logger.info("Fetching restaurants page (limit=%s, after=%s).", page.limit, page.after)
+    items, next_cursor = fetch_page(select_fields(page.fields), page)
+    logger.debug("Found %s restaurants. Next cursor: %s", len(items), next_cursor)
+    return page_response(items, next_cursor)
 
 @restaurants_bp.route('/<int:id>', methods=['GET'])
+@query_monitor.budget(2)
+@conditional_get(restaurant_etag)
+@response_cache.cached('detail')
 def get_restaurant(id):
     """
     Endpoint para obter um restaurante específico.
@@ -118,23 +151,30 @@ def get_restaurant(id):
     Returns:
         tuple: (JSON response, status code)
             - 200: Dados do restaurante
+            - 304: Restaurante não mudou desde a ETag enviada em If-None-Match
             - 404: Restaurante não encontrado
     """
-    logger.info(f"Fetching restaurant with ID: {id}")
-    restaurant = Restaurant.query.get_or_404(id)
-    logger.debug(f"Successfully fetched restaurant '{restaurant.name}' (ID: {id}).")
-    return jsonify(restaurant.to_dict()), 200
+    logger.info("Fetching restaurant with ID: %s", id)
+    restaurant = db.session.execute(
+        select_fields(Restaurant.PUBLIC_FIELDS).where(Restaurant.id == id)
+    ).first()
+    if restaurant is None:
+        abort(404)
+    logger.debug("Successfully fetched restaurant '%s' (ID: %s).", restaurant.name, id)
+    return json_response(restaurant)
 
 @restaurants_bp.route('/<int:id>', methods=['PUT'])
+@query_monitor.budget(6)
 @jwt_required()
-@validate_schema(RestaurantSchema())
-def update_restaurant(id):
+@validate_schema(RestaurantUpdate)
+def update_restaurant(id, data):
     """
     Endpoint para atualizar um restaurante existente.
     Requer autenticação e validação dos dados.
 
     Args:
         id (int): ID do restaurante
+        data (RestaurantUpdate): Dados já validados e normalizados
 
     Returns:
         tuple: (JSON response, status code)
@@ -142,33 +182,30 @@ def update_restaurant(id):
             - 400: CNPJ já existe
             - 404: Restaurante não encontrado
     """
-    logger.info(f"Attempting to update restaurant with ID: {id}")
+    logger.info("Attempting to update restaurant with ID: %s", id)
     restaurant = Restaurant.query.get_or_404(id)
-    data = request.get_json()
-    new_cnpj = data['cnpj']
+    new_cnpj = data.cnpj
 
-    # Verifica se outro restaurante já possui este CNPJ
-    existing = Restaurant.query.filter_by(cnpj=new_cnpj).first()
-    if existing and existing.id != id:
-        logger.warning(f"Restaurant update failed for ID {id}: CNPJ {new_cnpj} already exists for restaurant ID {existing.id}.")
-        return jsonify({'message': 'Restaurant with this CNPJ already exists'}), 400
+    # Verifica se outro restaurante já possui este CNPJ (só quando ele muda)
+    if new_cnpj != restaurant.cnpj:
+        existing = Restaurant.query.filter_by(cnpj=new_cnpj).first()
+        if existing:
+            logger.warning("Restaurant update failed for ID %s: CNPJ %s already exists for restaurant ID %s.", id, new_cnpj, existing.id)
+            return jsonify({'message': 'Restaurant with this CNPJ already exists'}), 400
 
-    logger.debug(f"Updating fields for restaurant ID: {id}")
-    restaurant.cnpj = new_cnpj
-    restaurant.name = data['name']
-    restaurant.state = data['state']
-    restaurant.city = data['city']
-    restaurant.type = data['type']
-    restaurant.operating_hours = data['operating_hours']
-    restaurant.postal_code = data['postal_code']
-    restaurant.street_number = data['street_number']
+    logger.debug("Updating fields for restaurant ID: %s", id)
+    for field, value in data.model_dump().items():
+        setattr(restaurant, field, value)
 
+    db.session.flush()
+    payload = restaurant.to_dict()
     db.session.commit()
-    logger.info(f"Restaurant '{restaurant.name}' (ID: {id}) updated successfully.")
+    logger.info("Restaurant '%s' (ID: %s) updated successfully.", payload['name'], id)
 
-    return jsonify(restaurant.to_dict()), 200
+    return jsonify(payload), 200
 
 @restaurants_bp.route('/<int:id>', methods=['DELETE'])
+@query_monitor.budget(4)
 @jwt_required()
 def delete_restaurant(id):
     """
@@ -183,62 +220,169 @@ def delete_restaurant(id):
             - 204: Restaurante deletado com sucesso
             - 404: Restaurante não encontrado
     """
-    logger.info(f"Attempting to delete restaurant with ID: {id}")
+    logger.info("Attempting to delete restaurant with ID: %s", id)
     restaurant = Restaurant.query.get_or_404(id)
     restaurant_name = restaurant.name # Log name before deletion
     db.session.delete(restaurant)
     db.session.commit()
-    logger.info(f"Restaurant '{restaurant_name}' (ID: {id}) deleted successfully.")
+    logger.info("Restaurant '%s' (ID: %s) deleted successfully.", restaurant_name, id)
     return '', 204
 
 @restaurants_bp.route('/search', methods=['GET'])
+@query_monitor.budget(4)
+@conditional_get(open_hours_etag)
+@response_cache.cached('search')
 def search_restaurants():
     """
     Endpoint para buscar restaurantes com base em critérios.
-    Suporta busca por nome, cidade, estado e tipo.
+    Suporta busca por nome, cidade, estado e tipo, com a mesma paginação
+    por cursor da listagem (limit, after e fields).
+
+    Parâmetros de consulta:
+        open_at: Apenas restaurantes abertos no instante (ISO 8601 ou '<dia> HH:MM')
+        open_now: 1 para apenas restaurantes abertos agora
+        fuzzy: 1 para tolerar erros de digitação em nome, cidade e tipo; retorna
+               uma única página ordenada pela semelhança
 
     Returns:
         tuple: (JSON response, status code)
             - 200: Lista de restaurantes que correspondem aos critérios
+            - 304: Catálogo não mudou desde a ETag enviada em If-None-Match
+            - 400: Parâmetros de paginação ou open_at inválidos
+    """
+    try:
+        page = parse_page_args(request.args)
+    except PaginationError as err:
+        logger.warning("Invalid pagination parameters: %s", err)
+        return jsonify({'message': str(err)}), 400
+
+    try:
+        criteria = parse_search_criteria(request.args)
+    except OpenAtError as err:
+        logger.warning("Invalid open_at parameter: %s", err)
+        return jsonify({'message': str(err)}), 400
+    logger.info("Searching restaurants with parameters: %s", criteria)
+
+    # Filtra no banco de dados (ou no índice em memória), sem carregar a tabela inteira
+    items, next_cursor = search_page(criteria, page, fuzzy=wants_fuzzy(request.args))
+
+    logger.info("Search completed. Returning %s restaurants matching criteria.", len(items))
+    return page_response(items, next_cursor)
+
+@restaurants_bp.route('/suggest', methods=['GET'])
+@query_monitor.budget(2)  # versão do catálogo (a cada INDEX_SYNC_INTERVAL) + reconstrução
+def suggest_restaurants():
+    """
+    Endpoint de sugestões por prefixo (autocomplete) de nomes e cidades.
+    Servido pela estrutura em memória do worker: o banco só é lido na
+    construção e, a cada INDEX_SYNC_INTERVAL, para conferir a versão do
+    catálogo. Sem ETag nem cache de respostas, que custariam mais que a
+    própria consulta.
+
+    Parâmetros de consulta:
+        q: Prefixo digitado (sem distinção de acentos e maiúsculas)
+        field: 'name' (padrão) ou 'city'
+        limit: Quantidade de sugestões (padrão 10, máximo 50)
+
+    Returns:
+        tuple: (JSON response, status code)
+            - 200: Lista de {'value', 'count'}, da mais para a menos frequente
+            - 400: Parâmetros inválidos
+    """
+    try:
+        field, prefix, limit = parse_suggest_args(request.args)
+    except SuggestError as err:
+        logger.warning("Invalid suggest parameters: %s", err)
+        return jsonify({'message': str(err)}), 400
+
+    return jsonify(suggest_index.suggest(field, prefix, limit)), 200
+
+@restaurants_bp.route('/nearby', methods=['GET'])
+@query_monitor.budget(1 + len(RADIUS_STEPS))
+@conditional_get(catalog_etag)
+@response_cache.cached('nearby')
+def get_nearby_restaurants():
+    """
+    Endpoint com os restaurantes mais próximos de uma coordenada.
+    As coordenadas dos restaurantes vêm do CEP (tabela offline).
+
+    Parâmetros de consulta:
+        lat, lon: Coordenada de referência, em graus
+        radius_km: Raio da busca (padrão 5, máximo NEARBY_MAX_RADIUS_KM)
+        limit: Quantidade máxima de restaurantes (padrão 20)
+
+    Returns:
+        tuple: (JSON response, status code)
+            - 200: Restaurantes com latitude, longitude e distance_km, do mais próximo ao mais distante
+            - 304: Catálogo não mudou desde a ETag enviada em If-None-Match
+            - 400: Parâmetros inválidos
+    """
+    try:
+        query = parse_nearby_args(request.args)
+    except NearbyError as err:
+        logger.warning("Invalid nearby parameters: %s", err)
+        return jsonify({'message': str(err)}), 400
+
+    logger.info("Searching restaurants within %s km of (%s, %s).", query.radius_km, query.lat, query.lon)
+    items = nearby_restaurants(query)
+    logger.debug("Found %s restaurants nearby.", len(items))
+    return jsonify(items), 200
+
+@restaurants_bp.route('/facets', methods=['GET'])
+@query_monitor.budget(5)
+@conditional_get(open_hours_etag)
+@response_cache.cached('facets')
+def get_facets():
+    """
+    Endpoint com as contagens de restaurantes por estado, tipo e cidade.
+    Aceita os mesmos critérios da busca (name, city, state, type, open_at
+    e open_now).
+
+    Parâmetros de consulta:
+        city_limit: Quantidade de cidades retornadas, as mais frequentes (padrão 20)
+
+    Returns:
+        tuple: (JSON response, status code)
+            - 200: Total e contagens por faceta
+            - 304: Catálogo não mudou desde a ETag enviada em If-None-Match
+            - 400: Parâmetros inválidos
+    """
+    try:
+        city_limit = parse_city_limit(request.args)
+        criteria = parse_search_criteria(request.args)
+    except ValueError as err:
+        logger.warning("Invalid facet parameters: %s", err)
+        return jsonify({'message': str(err)}), 400
+
+    logger.info("Computing restaurant facets with parameters: %s", criteria)
+    facets = restaurant_facets(criteria, city_limit=city_limit)
+    logger.debug("Facets computed over %s restaurants.", facets['total'])
+    return jsonify(facets), 200
+
+@restaurants_bp.route('/cache/stats', methods=['GET'])
+@query_monitor.budget(0)
+@jwt_required()
+def cache_stats():
+    """
+    Endpoint com os contadores do cache de respostas do processo.
+    Requer autenticação.
+
+    Returns:
+        tuple: (JSON response, status code)
+            - 200: Backend, acertos, faltas, despejos e invalidações
+    """
+    return jsonify(response_cache.info()), 200
+
+@restaurants_bp.route('/db/stats', methods=['GET'])
+@query_monitor.budget(0)
+@jwt_required()
+def db_pool_stats():
+    """
+    Endpoint com o estado do pool de conexões do processo.
+    Requer autenticação.
+
+    Returns:
+        tuple: (JSON response, status code)
+            - 200: Conexões em uso, ociosas e de overflow, timeouts e espera
     """
-    # Obtém e decodifica os parâmetros
-    name = request.args.get('name', '').strip()
-    city = request.args.get('city', '').strip()
-    state = request.args.get('state', '').strip()
-    type_param = request.args.get('type', '').strip() # Renamed variable to avoid conflict with built-in type
-
-    # Log search parameters
-    search_params = {'name': name, 'city': city, 'state': state, 'type': type_param}
-    logger.info(f"Searching restaurants with parameters: {search_params}")
-
-    # Obtém todos os restaurantes primeiro
-    restaurants = Restaurant.query.all()
-    logger.debug(f"Initial restaurant count before filtering: {len(restaurants)}")
-
-    # Filtra em memória
-    count_before = len(restaurants)
-    if name:
-        name_normalized = normalize_text(name)
-        restaurants = [r for r in restaurants if name_normalized in normalize_text(r.name)]
-        logger.debug(f"Filtered by name '{name}'. Count: {len(restaurants)} (was {count_before})")
-        count_before = len(restaurants)
-
-    if city:
-        city_normalized = normalize_text(city)
-        restaurants = [r for r in restaurants if city_normalized in normalize_text(r.city)]
-        logger.debug(f"Filtered by city '{city}'. Count: {len(restaurants)} (was {count_before})")
-        count_before = len(restaurants)
-
-    if state:
-        state_normalized = normalize_text(state)
-        restaurants = [r for r in restaurants if state_normalized in normalize_text(r.state)]
-        logger.debug(f"Filtered by state '{state}'. Count: {len(restaurants)} (was {count_before})")
-        count_before = len(restaurants)
-
-    if type_param:
-        type_normalized = normalize_text(type_param)
-        restaurants = [r for r in restaurants if type_normalized in normalize_text(r.type)]
-        logger.debug(f"Filtered by type '{type_param}'. Count: {len(restaurants)} (was {count_before})")
-
-    logger.info(f"Search completed. Found {len(restaurants)} restaurants matching criteria.")
-    return jsonify([r.to_dict() for r in restaurants]), 200
\ No newline at end of file
+    return jsonify(database_pool.stats()), 200
@@ -3,9 +3,21 @@ Módulo de configuração da aplicação Flask.
 Define diferentes configurações para desenvolvimento, teste e produção.
 """
 
+import multiprocessing
 import os
 from datetime import timedelta
 
+def _optional_int(name):
+    """Lê uma variável de ambiente inteira, retornando None se ausente."""
+    value = os.getenv(name)
+    return int(value) if value else None
+
+def _worker_concurrency():
+    """Requests simultâneos por worker do Gunicorn (threads ou greenlets)."""
+    if os.getenv('GUNICORN_WORKER_CLASS') == 'gevent':
+        return int(os.getenv('GUNICORN_WORKER_CONNECTIONS', '1000'))
+    return int(os.getenv('GUNICORN_THREADS', '1'))
+
 class Config:
     """
     Configuração base que contém as configurações comuns a todos os ambientes.
@@ -18,6 +30,49 @@ class Config:
         API_KEY: Chave de API para serviços externos
         RATELIMIT_*: Configurações de rate limiting
         CORS_ORIGINS: Lista de origens permitidas para CORS
+        SEARCH_BACKEND: Backend da busca textual ('database' ou 'memory')
+        INDEX_SYNC_INTERVAL: Intervalo (s) entre leituras da versão do catálogo pelas
+                             estruturas em memória dos workers (índice de trigramas e
+                             sugestões), que as reconstroem após escritas de outro processo
+        PAGINATION_*: Tamanho padrão e máximo das páginas de listagem
+        STREAM_BATCH_SIZE: Linhas lidas do cursor por bloco no modo streaming
+        BULK_*: Tamanho padrão e máximo dos lotes de escrita em massa
+        CACHE_BACKEND: Backend do cache de respostas ('local', 'redis' ou 'none')
+        CACHE_TTL: Tempo de vida das entradas do cache, em segundos
+        CACHE_MAX_ENTRIES: Quantidade máxima de entradas do cache local
+        CACHE_REDIS_URL: URL do Redis usado pelo backend 'redis'
+        JSON_BACKEND: Serializador das listagens ('json' ou 'orjson', se instalado)
+        PASSWORD_HASH_ROUNDS: Custo do bcrypt; hashes com outro custo são refeitos no login
+        PASSWORD_POOL_*: Threads, fila máxima e timeout (s) do pool de hashing de senhas
+        PASSWORD_LOCK_DIR: Diretório das vagas de hashing compartilhadas pelos workers do
+                           host (definido pelo deploy/gunicorn_config.py; sem ele, o
+                           limite é por processo)
+        USER_CACHE_TTL: Validade (s) das versões de usuários usadas por /me (0 desativa)
+        USER_CACHE_SYNC_INTERVAL: Intervalo (s) entre leituras da geração dos usuários no
+                                  banco, que avisa os workers de alterações feitas em outro
+                                  processo (cache local)
+        DB_WORKERS: Processos que abrem conexões (WEB_CONCURRENCY, como no Gunicorn)
+        DB_WORKER_THREADS: Requests simultâneos por processo (threads do gthread ou
+                           conexões do gevent)
+        DB_MAX_CONNECTIONS: Conexões aceitas pelo servidor (max_connections do PostgreSQL)
+        DB_RESERVED_CONNECTIONS: Conexões reservadas para migrações, psql e monitoramento
+        DB_POOL_MODE: 'queue' (pool da aplicação) ou 'pgbouncer' (sem pool, NullPool)
+        DB_POOL_SIZE: Conexões mantidas por processo (None deriva do orçamento)
+        DB_MAX_OVERFLOW: Conexões extras por processo (None deriva do orçamento)
+        DB_POOL_TIMEOUT: Espera máxima (s) por uma conexão livre
+        DB_POOL_RECYCLE: Idade máxima (s) de uma conexão (-1 desativa)
+        DB_POOL_PRE_PING: Testa a conexão antes de cada checkout
+        DB_CONNECT_TIMEOUT: Timeout (s) da abertura de conexões com o PostgreSQL
+        FAST_BOOT: Inicialização rápida (sem create_all, Flask-Migrate só no comando `flask`)
+        METRICS_ENABLED: Coleta de métricas e rota /metrics (Prometheus)
+        QUERY_SLOW_MS: Duração (ms) a partir da qual as consultas SQL são registradas (0 desativa)
+        QUERY_LOG_PARAMS: Inclui os parâmetros no log de consultas lentas (padrão só em
+                          desenvolvimento e testes; colunas sensíveis são omitidas)
+        QUERY_REPEAT_THRESHOLD: Execuções do mesmo SELECT em uma requisição que indicam um N+1
+        QUERY_BUDGET_ENFORCE: Falha as requisições que excedem o orçamento de consultas da rota
+        CEP_COORDINATES_FILE: CSV local de coordenadas por CEP (padrão data/cep_coordinates.csv)
+        NEARBY_MAX_RADIUS_KM: Raio máximo (km) aceito pela busca por proximidade
+        OPENING_HOURS_TIMEZONE: Fuso dos horários de funcionamento, usado por open_now e open_at
     """
     SECRET_KEY = os.getenv('SECRET_KEY', 'dev')
     DEBUG = os.getenv('FLASK_DEBUG', '0') == '1'
@@ -28,31 +83,88 @@ class Config:
     RATELIMIT_DEFAULT = "100/minute"
     RATELIMIT_HEADERS_ENABLED = True
     CORS_ORIGINS = os.getenv('CORS_ORIGINS', 'http://localhost:3000,http://127.0.0.1:3000').split(',')
+    SEARCH_BACKEND = os.getenv('SEARCH_BACKEND', 'database')
+    INDEX_SYNC_INTERVAL = float(os.getenv('INDEX_SYNC_INTERVAL', '2'))
+    PAGINATION_DEFAULT_LIMIT = int(os.getenv('PAGINATION_DEFAULT_LIMIT', '100'))
+    PAGINATION_MAX_LIMIT = int(os.getenv('PAGINATION_MAX_LIMIT', '1000'))
+    STREAM_BATCH_SIZE = int(os.getenv('STREAM_BATCH_SIZE', '1000'))
+    BULK_BATCH_SIZE = int(os.getenv('BULK_BATCH_SIZE', '1000'))
+    BULK_MAX_BATCH_SIZE = int(os.getenv('BULK_MAX_BATCH_SIZE', '2000'))
+    CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'local')
+    CACHE_TTL = int(os.getenv('CACHE_TTL', '60'))
+    CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', '1024'))
+    CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    JSON_BACKEND = os.getenv('JSON_BACKEND', 'json')
+    PASSWORD_HASH_ROUNDS = int(os.getenv('PASSWORD_HASH_ROUNDS', '12'))
+    PASSWORD_POOL_WORKERS = int(os.getenv('PASSWORD_POOL_WORKERS', '2'))
+    PASSWORD_POOL_MAX_PENDING = int(os.getenv('PASSWORD_POOL_MAX_PENDING', '16'))
+    PASSWORD_POOL_TIMEOUT = float(os.getenv('PASSWORD_POOL_TIMEOUT', '10'))
+    PASSWORD_LOCK_DIR = os.getenv('PASSWORD_LOCK_DIR') or None
+    USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL', '300'))
+    USER_CACHE_SYNC_INTERVAL = float(os.getenv('USER_CACHE_SYNC_INTERVAL', '2'))
+    DB_WORKERS = int(os.getenv('WEB_CONCURRENCY', str(multiprocessing.cpu_count() * 2 + 1)))
+    DB_WORKER_THREADS = _worker_concurrency()
+    DB_MAX_CONNECTIONS = int(os.getenv('DB_MAX_CONNECTIONS', '100'))
+    DB_RESERVED_CONNECTIONS = int(os.getenv('DB_RESERVED_CONNECTIONS', '10'))
+    DB_POOL_MODE = os.getenv('DB_POOL_MODE', 'queue')
+    DB_POOL_SIZE = _optional_int('DB_POOL_SIZE')
+    DB_MAX_OVERFLOW = _optional_int('DB_MAX_OVERFLOW')
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '30'))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', '0') == '1'
+    DB_CONNECT_TIMEOUT = int(os.getenv('DB_CONNECT_TIMEOUT', '10'))
+    FAST_BOOT = os.getenv('FAST_BOOT', '0') == '1'
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', '1') == '1'
+    QUERY_SLOW_MS = float(os.getenv('QUERY_SLOW_MS', '200'))
+    QUERY_LOG_PARAMS = os.getenv('QUERY_LOG_PARAMS', '0') == '1'
+    QUERY_REPEAT_THRESHOLD = int(os.getenv('QUERY_REPEAT_THRESHOLD', '5'))
+    QUERY_BUDGET_ENFORCE = os.getenv('QUERY_BUDGET_ENFORCE', '0') == '1'
+    CEP_COORDINATES_FILE = os.getenv('CEP_COORDINATES_FILE')
+    NEARBY_MAX_RADIUS_KM = float(os.getenv('NEARBY_MAX_RADIUS_KM', '50'))
+    OPENING_HOURS_TIMEZONE = os.getenv('OPENING_HOURS_TIMEZONE', 'America/Sao_Paulo')
 
 class DevelopmentConfig(Config):
     """
     Configuração para ambiente de desenvolvimento.
     Habilita modo debug e desabilita modo de teste.
+    O servidor de desenvolvimento roda em um único processo com threads.
     """
     DEBUG = True
     TESTING = False
+    DB_WORKERS = 1
+    DB_WORKER_THREADS = 5
+    QUERY_LOG_PARAMS = os.getenv('QUERY_LOG_PARAMS', '1') == '1'
 
 class TestingConfig(Config):
     """
     Configuração para ambiente de testes.
     Usa banco de dados em memória para testes rápidos.
+    TEST_DATABASE_URL aponta os testes e benchmarks para outro banco.
+    Rotas acima do orçamento de consultas falham os testes.
     """
     DEBUG = True
     TESTING = True
-    SQLALCHEMY_DATABASE_URI = 'sqlite:///test.db'
+    SQLALCHEMY_DATABASE_URI = os.getenv('TEST_DATABASE_URL', 'sqlite:///test.db')
+    PASSWORD_HASH_ROUNDS = 4
+    DB_WORKERS = 1
+    DB_WORKER_THREADS = 2
+    DB_POOL_TIMEOUT = 5
+    QUERY_BUDGET_ENFORCE = os.getenv('QUERY_BUDGET_ENFORCE', '1') == '1'
+    QUERY_LOG_PARAMS = os.getenv('QUERY_LOG_PARAMS', '1') == '1'
 
 class ProductionConfig(Config):
     """
     Configuração para ambiente de produção.
     Desabilita modo debug e teste para melhor performance.
+    Testa as conexões antes do uso, pois firewalls e failovers derrubam
+    conexões ociosas.
     """
     DEBUG = False
     TESTING = False
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', '1') == '1'
+    # Workers reciclados (max_requests) reiniciam com frequência; o esquema
+    # é aplicado pelo `flask db upgrade` do deploy
+    FAST_BOOT = os.getenv('FAST_BOOT', '1') == '1'
 
 # Dicionário que mapeia os nomes dos ambientes para suas respectivas classes de configuração
 config = {
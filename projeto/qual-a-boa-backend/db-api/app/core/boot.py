@@ -0,0 +1,40 @@
+"""
+Medição do tempo de inicialização da aplicação, por etapa.
+"""
+
+import time
+from contextlib import contextmanager
+
+class BootTimer:
+    """
+    Acumula a duração de cada etapa de `create_app`.
+
+    Atributos:
+        timings: Duração de cada etapa, em milissegundos, na ordem de execução
+    """
+
+    def __init__(self):
+        self.timings = {}
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Mede o bloco como a etapa `name`.
+
+        Args:
+            name (str): Nome da etapa
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = round((time.perf_counter() - start) * 1000, 2)
+
+    def total(self):
+        """Tempo desde a criação do medidor, em milissegundos."""
+        return round((time.perf_counter() - self._started) * 1000, 2)
+
+    def summary(self):
+        """Resumo legível das etapas, para o log de inicialização."""
+        return ', '.join(f'{name} {elapsed:.1f} ms' for name, elapsed in self.timings.items())
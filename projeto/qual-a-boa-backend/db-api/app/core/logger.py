@@ -1,11 +1,57 @@
+import atexit
 import logging
-import sys
 import os
-from logging.handlers import TimedRotatingFileHandler
+import queue
+import random
+import sys
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler, WatchedFileHandler
+
+class LazyQueueHandler(QueueHandler):
+    """
+    QueueHandler que não formata a mensagem na thread da requisição.
+
+    O QueueHandler padrão chama `format()` antes de enfileirar; aqui o
+    registro segue intacto e a mensagem só é montada pela thread do
+    QueueListener. Por isso, objetos passados como argumentos do log não
+    devem ser alterados depois da chamada.
+    """
+
+    def prepare(self, record):
+        return record
+
+class DebugSampler(logging.Filter):
+    """
+    Filtro que deixa passar apenas uma fração dos registros DEBUG.
+
+    Atributos:
+        rate: Fração de registros DEBUG mantidos (1.0 mantém todos)
+    """
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        return record.levelno != logging.DEBUG or self.rate >= 1 or random.random() < self.rate
 
 class LoggerSingleton:
+    """
+    Logger da aplicação com pipeline não bloqueante.
+
+    As chamadas de log apenas enfileiram o registro (LazyQueueHandler); uma
+    thread QueueListener formata e grava no console e no arquivo. Variáveis
+    de ambiente:
+
+        LOG_LEVEL: Nível mínimo registrado (padrão DEBUG)
+        LOG_FORMAT: 'text' (padrão) ou 'json' (structlog)
+        LOG_FILE_MODE: 'rotating' (padrão, um único processo), 'watched'
+                       (vários processos no mesmo arquivo, rotação externa
+                       com logrotate) ou 'per-process' (um arquivo por PID)
+        LOG_DEBUG_SAMPLE_RATE: Fração dos registros DEBUG mantidos (padrão 1.0)
+    """
     _instance = None
     _logger = None
+    _listener = None
 
     LOG_FORMAT = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
     LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
@@ -25,26 +71,77 @@ class LoggerSingleton:
             os.makedirs(self.LOG_DIR)
 
         self._logger = logging.getLogger("QualABoaAppLogger")
-        self._logger.setLevel(logging.DEBUG) # Define o nível base para capturar tudo
+        self._logger.setLevel(os.getenv('LOG_LEVEL', 'DEBUG').upper())
 
-        formatter = logging.Formatter(self.LOG_FORMAT, datefmt=self.LOG_DATE_FORMAT)
+        # As chamadas de log apenas enfileiram; a formatação e a escrita
+        # ficam na thread do QueueListener
+        self._queue_handler = LazyQueueHandler(queue.SimpleQueue())
+        self._queue_handler.addFilter(DebugSampler(float(os.getenv('LOG_DEBUG_SAMPLE_RATE', '1.0'))))
+        self._logger.addHandler(self._queue_handler)
+        self._start_listener()
+
+        # As threads não sobrevivem ao fork (workers do Gunicorn com
+        # preload_app): o filho inicia seu próprio listener
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._start_listener)
+        atexit.register(self.stop)
+
+        self._logger.info("Logger inicializado com sucesso.")
+
+    def _create_formatter(self):
+        if os.getenv('LOG_FORMAT', 'text') == 'json':
+            import structlog
+
+            return structlog.stdlib.ProcessorFormatter(
+                processor=structlog.processors.JSONRenderer(),
+                foreign_pre_chain=[
+                    structlog.stdlib.add_log_level,
+                    structlog.stdlib.add_logger_name,
+                    structlog.processors.TimeStamper(fmt='iso'),
+                    structlog.processors.format_exc_info,
+                ],
+            )
+        return logging.Formatter(self.LOG_FORMAT, datefmt=self.LOG_DATE_FORMAT)
+
+    def _create_file_handler(self):
+        mode = os.getenv('LOG_FILE_MODE', 'rotating')
+        if mode == 'watched':
+            # Vários processos acrescentam ao mesmo arquivo; a rotação é externa
+            return WatchedFileHandler(self.LOG_FILE, encoding='utf-8')
+        path = self.LOG_FILE
+        if mode == 'per-process':
+            path = os.path.join(self.LOG_DIR, f'app.{os.getpid()}.log')
+        # Rotaciona os logs diariamente e mantém 7 arquivos de backup
+        return TimedRotatingFileHandler(path, when="midnight", interval=1, backupCount=7, encoding='utf-8')
+
+    def _start_listener(self):
+        # Uma fila nova a cada início: após o fork, a fila herdada pode ter
+        # ficado com o lock preso pela thread do processo pai
+        log_queue = queue.SimpleQueue()
+        self._queue_handler.queue = log_queue
+        formatter = self._create_formatter()
 
         # Handler para o Console
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(logging.INFO) # Loga mensagens INFO ou superiores no console
         console_handler.setFormatter(formatter)
-        self._logger.addHandler(console_handler)
 
         # Handler para Arquivo
-        # Rotaciona os logs diariamente e mantém 7 arquivos de backup
-        file_handler = TimedRotatingFileHandler(
-            self.LOG_FILE, when="midnight", interval=1, backupCount=7, encoding='utf-8'
-        )
+        file_handler = self._create_file_handler()
         file_handler.setLevel(logging.DEBUG) # Loga mensagens DEBUG ou superiores no arquivo
         file_handler.setFormatter(formatter)
-        self._logger.addHandler(file_handler)
 
-        self._logger.info("Logger inicializado com sucesso.")
+        self._listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+        self._listener.start()
+        self._listener_pid = os.getpid()
+
+    def stop(self):
+        """Processa os registros pendentes e encerra a thread do listener."""
+        if self._listener is not None and self._listener_pid == os.getpid():
+            self._listener.stop()
+            for handler in self._listener.handlers:
+                handler.close()
+            self._listener = None
 
     def get_logger(self):
         """Retorna a instância configurada do logger."""
@@ -61,4 +158,4 @@ if __name__ == '__main__':
     logger.info("Exemplo de mensagem informativa.")
     logger.warning("Exemplo de mensagem de aviso.")
     logger.error("Exemplo de mensagem de erro.")
-    logger.critical("Exemplo de mensagem crítica.")
\ No newline at end of file
+    logger.critical("Exemplo de mensagem crítica.")
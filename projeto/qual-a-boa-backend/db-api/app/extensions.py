@@ -4,7 +4,6 @@ Cada extensão é inicializada aqui e pode ser importada em outros módulos.
 """
 
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
 from flask_wtf.csrf import CSRFProtect
@@ -12,8 +11,10 @@ from flask_wtf.csrf import CSRFProtect
 # Instância do SQLAlchemy para gerenciamento do banco de dados
 db = SQLAlchemy()
 
-# Instância do Flask-Migrate para gerenciamento de migrações do banco de dados
-migrate = Migrate()
+# Instância do Flask-Migrate para gerenciamento de migrações do banco de dados.
+# É criada em init_migrate, pois importar o Alembic custa mais do que todas as
+# outras extensões juntas e ele só é usado pelos comandos `flask db`
+migrate = None
 
 # Instância do JWTManager para autenticação via tokens JWT
 jwt = JWTManager()
@@ -22,4 +23,17 @@ jwt = JWTManager()
 cors = CORS()
 
 # Instância do CSRFProtect para proteção contra ataques CSRF
-csrf = CSRFProtect() 
\ No newline at end of file
+csrf = CSRFProtect() 
+
+def init_migrate(app):
+    """
+    Importa o Flask-Migrate e o registra na aplicação.
+
+    Args:
+        app (Flask): Aplicação Flask
+    """
+    global migrate
+    if migrate is None:
+        from flask_migrate import Migrate
+        migrate = Migrate()
+    migrate.init_app(app, db)
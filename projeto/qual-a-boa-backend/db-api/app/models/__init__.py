@@ -1,2 +1,5 @@
 from app.models.restaurant import Restaurant
-from app.models.user import User 
\ No newline at end of file
+from app.models.restaurant_hours import RestaurantHours
+from app.models.user import User
+from app.models.catalog_version import CatalogVersion
+from app.models.users_generation import UsersGeneration
@@ -0,0 +1,27 @@
+"""
+Módulo que define o contador de versão do catálogo de restaurantes.
+O contador é incrementado na mesma transação de toda escrita em restaurantes
+e serve de base para as ETags das listagens.
+"""
+
+from sqlalchemy import DDL, event
+from app.extensions import db
+
+class CatalogVersion(db.Model):
+    """
+    Modelo com uma única linha (id = 1) que guarda a versão do catálogo.
+
+    Atributos:
+        id: Identificador fixo da linha (sempre 1)
+        version: Número incrementado a cada escrita em restaurantes
+    """
+    __tablename__ = 'catalog_version'
+
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+
+# Cria a linha única junto com a tabela
+event.listen(
+    CatalogVersion.__table__, 'after_create',
+    DDL('INSERT INTO catalog_version (id, version) VALUES (1, 0)')
+)
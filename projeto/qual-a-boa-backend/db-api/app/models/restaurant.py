@@ -3,7 +3,10 @@ Módulo que define o modelo de Restaurante para o banco de dados.
 Implementa a estrutura de dados e serialização de restaurantes.
 """
 
+from sqlalchemy import DDL, event
 from app.extensions import db
+from app.utils.geo import cep_coordinates, geo_cell
+from app.utils.text import normalize_text
 
 class Restaurant(db.Model):
     """
@@ -19,8 +22,38 @@ class Restaurant(db.Model):
         operating_hours: Horário de funcionamento
         postal_code: Código postal do endereço
         street_number: Número do endereço
+        name_search: Nome normalizado (sem acentos, minúsculo) usado na busca
+        city_search: Cidade normalizada usada na busca
+        type_search: Tipo normalizado usado na busca
+        latitude, longitude: Coordenadas obtidas do CEP (None se desconhecido)
+        geo_cell: Célula da grade espacial usada na busca por proximidade
+        version: Versão da linha, incrementada a cada atualização (ETag)
     """
     __tablename__ = 'restaurants'
+    # Campos expostos pela API, na ordem de serialização
+    PUBLIC_FIELDS = (
+        'id', 'cnpj', 'name', 'state', 'city', 'type',
+        'operating_hours', 'postal_code', 'street_number'
+    )
+    # Colunas normalizadas mantidas para a busca
+    SEARCH_COLUMNS = ('name_search', 'city_search', 'type_search')
+    # Colunas derivadas do CEP para a busca por proximidade
+    LOCATION_COLUMNS = ('latitude', 'longitude', 'geo_cell')
+    # Colunas calculadas a partir dos dados (gravadas também pelas escritas em massa)
+    DERIVED_COLUMNS = SEARCH_COLUMNS + LOCATION_COLUMNS
+    __table_args__ = (
+        # Índices usados pelos filtros e pelas contagens por faceta
+        db.Index('idx_restaurants_state', 'state'),
+        db.Index('idx_restaurants_city', 'city'),
+        db.Index('idx_restaurants_type', 'type'),
+        # Índices B-tree para buscas por prefixo (LIKE 'termo%')
+        db.Index('ix_restaurants_name_search_prefix', 'name_search',
+                 postgresql_ops={'name_search': 'varchar_pattern_ops'}),
+        db.Index('ix_restaurants_city_search_prefix', 'city_search',
+                 postgresql_ops={'city_search': 'varchar_pattern_ops'}),
+        # Grade espacial: uma busca por raio lê apenas as células próximas
+        db.Index('ix_restaurants_geo_cell', 'geo_cell'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     cnpj = db.Column(db.String(18), unique=True, nullable=False)
@@ -31,6 +64,69 @@ class Restaurant(db.Model):
     operating_hours = db.Column(db.String(200))
     postal_code = db.Column(db.String(9), nullable=False)
     street_number = db.Column(db.String(10), nullable=False)
+
+    # Colunas derivadas, mantidas pelos eventos before_insert/before_update
+    name_search = db.Column(db.String(100), nullable=False, default='')
+    city_search = db.Column(db.String(100), nullable=False, default='')
+    type_search = db.Column(db.String(50), nullable=False, default='')
+    latitude = db.Column(db.Float)
+    longitude = db.Column(db.Float)
+    geo_cell = db.Column(db.Integer)
+
+    # Versão da linha, gerenciada pelo SQLAlchemy (version_id_col)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    __mapper_args__ = {'version_id_col': version}
+
+    @staticmethod
+    def search_columns(data):
+        """
+        Calcula os valores das colunas de busca a partir dos dados brutos.
+
+        Args:
+            data (dict): Dados do restaurante com as chaves name, city e type
+
+        Returns:
+            dict: Valores de name_search, city_search e type_search
+        """
+        return {
+            'name_search': normalize_text(data.get('name')),
+            'city_search': normalize_text(data.get('city')),
+            'type_search': normalize_text(data.get('type')),
+        }
+
+    @staticmethod
+    def location_columns(data):
+        """
+        Calcula as coordenadas e a célula da grade a partir do CEP.
+
+        Args:
+            data (dict): Dados do restaurante com a chave postal_code
+
+        Returns:
+            dict: Valores de latitude, longitude e geo_cell (None se o CEP
+                  não estiver na tabela de coordenadas)
+        """
+        coordinates = cep_coordinates.lookup(data.get('postal_code'))
+        if coordinates is None:
+            return {'latitude': None, 'longitude': None, 'geo_cell': None}
+        lat, lon = coordinates
+        return {'latitude': lat, 'longitude': lon, 'geo_cell': geo_cell(lat, lon)}
+
+    @classmethod
+    def derived_columns(cls, data):
+        """Calcula todas as colunas de DERIVED_COLUMNS a partir dos dados brutos."""
+        return {**cls.search_columns(data), **cls.location_columns(data)}
+
+    def refresh_search_columns(self):
+        """Atualiza as colunas de busca a partir dos campos atuais."""
+        self.name_search = normalize_text(self.name)
+        self.city_search = normalize_text(self.city)
+        self.type_search = normalize_text(self.type)
+
+    def refresh_location(self):
+        """Atualiza as coordenadas e a célula da grade a partir do CEP atual."""
+        for column, value in self.location_columns({'postal_code': self.postal_code}).items():
+            setattr(self, column, value)
     
     def to_dict(self):
         """
@@ -39,14 +135,25 @@ class Restaurant(db.Model):
         Returns:
             dict: Representação do restaurante em formato dicionário
         """
-        return {
-            'id': self.id,
-            'cnpj': self.cnpj,
-            'name': self.name,
-            'state': self.state,
-            'city': self.city,
-            'type': self.type,
-            'operating_hours': self.operating_hours,
-            'postal_code': self.postal_code,
-            'street_number': self.street_number
-        } 
\ No newline at end of file
+        return {field: getattr(self, field) for field in self.PUBLIC_FIELDS}
+
+@event.listens_for(Restaurant, 'before_insert')
+@event.listens_for(Restaurant, 'before_update')
+def _refresh_derived_columns(mapper, connection, target):
+    target.refresh_search_columns()
+    target.refresh_location()
+
+# Índices de trigramas (pg_trgm) para buscas por substring no PostgreSQL.
+# Em outros bancos as colunas de busca usam apenas os índices B-tree acima.
+event.listen(
+    Restaurant.__table__, 'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql')
+)
+for _column in ('name_search', 'city_search', 'type_search'):
+    event.listen(
+        Restaurant.__table__, 'after_create',
+        DDL(
+            f'CREATE INDEX IF NOT EXISTS ix_restaurants_{_column}_trgm '
+            f'ON restaurants USING gin ({_column} gin_trgm_ops)'
+        ).execute_if(dialect='postgresql')
+    )
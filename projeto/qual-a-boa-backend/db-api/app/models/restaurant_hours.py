@@ -0,0 +1,96 @@
+"""
+Módulo que define os intervalos de funcionamento dos restaurantes.
+
+Cada linha é um intervalo [opens_at, closes_at) em minutos da semana,
+compilado de `Restaurant.operating_hours` por `parse_operating_hours`. Os
+intervalos nunca atravessam a meia-noite, então "aberto no minuto t" é um
+intervalo do índice (opens_at entre a meia-noite de t e t, closes_at > t).
+
+As escritas do ORM mantêm os intervalos pelos eventos abaixo; as escritas em
+massa (bulk, importação) chamam `insert_opening_hours`/`replace_opening_hours`.
+"""
+
+from sqlalchemy import delete, event, insert, inspect
+
+from app.extensions import db
+from app.models.restaurant import Restaurant
+from app.utils.opening_hours import OperatingHoursError, parse_operating_hours
+
+class RestaurantHours(db.Model):
+    """
+    Intervalo em que um restaurante está aberto.
+
+    Atributos:
+        restaurant_id: Restaurante do intervalo
+        opens_at: Início, em minutos desde segunda-feira 00:00
+        closes_at: Fim (exclusivo), no mesmo dia de opens_at
+    """
+    __tablename__ = 'restaurant_hours'
+    __table_args__ = (
+        # Intervalo de opens_at com closes_at e restaurant_id no próprio índice
+        db.Index('ix_restaurant_hours_window', 'opens_at', 'closes_at', 'restaurant_id'),
+    )
+
+    restaurant_id = db.Column(db.Integer, db.ForeignKey('restaurants.id', ondelete='CASCADE'), primary_key=True)
+    opens_at = db.Column(db.SmallInteger, primary_key=True)
+    closes_at = db.Column(db.SmallInteger, nullable=False)
+
+def compile_opening_hours(text):
+    """
+    Compila o horário de funcionamento, tratando texto não reconhecido como vazio.
+
+    Args:
+        text (str): Horário em texto livre
+
+    Returns:
+        list: Pares (opens_at, closes_at); vazia se o texto for vazio ou inválido
+    """
+    try:
+        return parse_operating_hours(text)
+    except OperatingHoursError:
+        return []
+
+def insert_opening_hours(connection, rows):
+    """
+    Grava os intervalos de funcionamento de restaurantes recém-criados.
+
+    Args:
+        connection: Conexão (ou sessão) da transação atual
+        rows: Pares (id do restaurante, operating_hours)
+    """
+    values = [
+        {'restaurant_id': restaurant_id, 'opens_at': opens_at, 'closes_at': closes_at}
+        for restaurant_id, text in rows
+        for opens_at, closes_at in compile_opening_hours(text)
+    ]
+    if values:
+        connection.execute(insert(RestaurantHours.__table__), values)
+
+def replace_opening_hours(connection, rows):
+    """
+    Regrava os intervalos de funcionamento de um conjunto de restaurantes.
+
+    Args:
+        connection: Conexão (ou sessão) da transação atual
+        rows: Pares (id do restaurante, operating_hours)
+    """
+    rows = list(rows)
+    if not rows:
+        return
+    table = RestaurantHours.__table__
+    connection.execute(delete(table).where(table.c.restaurant_id.in_([restaurant_id for restaurant_id, _ in rows])))
+    insert_opening_hours(connection, rows)
+
+@event.listens_for(Restaurant, 'after_insert')
+def _insert_opening_hours(mapper, connection, target):
+    insert_opening_hours(connection, [(target.id, target.operating_hours)])
+
+@event.listens_for(Restaurant, 'after_update')
+def _update_opening_hours(mapper, connection, target):
+    if inspect(target).attrs.operating_hours.history.has_changes():
+        replace_opening_hours(connection, [(target.id, target.operating_hours)])
+
+@event.listens_for(Restaurant, 'before_delete')
+def _delete_opening_hours(mapper, connection, target):
+    # Nem todo banco aplica o ON DELETE CASCADE (SQLite sem PRAGMA foreign_keys)
+    replace_opening_hours(connection, [(target.id, None)])
@@ -4,7 +4,7 @@ Implementa funcionalidades de autenticação e serialização.
 """
 
 from app.extensions import db
-import bcrypt
+from app.services.passwords import password_hasher
 
 class User(db.Model):
     """
@@ -15,6 +15,7 @@ class User(db.Model):
         username: Nome de usuário único
         email: Email único do usuário
         password_hash: Hash da senha do usuário (armazenado de forma segura)
+        version: Versão da linha, incrementada a cada atualização (cache de /me)
     """
     __tablename__ = 'users'
     
@@ -22,15 +23,23 @@ class User(db.Model):
     username = db.Column(db.String(50), unique=True, nullable=False)
     email = db.Column(db.String(100), unique=True, nullable=False)
     password_hash = db.Column(db.String(128), nullable=False)
+
+    # Versão da linha, gerenciada pelo SQLAlchemy (version_id_col)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    __mapper_args__ = {'version_id_col': version}
     
     def set_password(self, password):
         """
         Define a senha do usuário, gerando um hash seguro.
+        O hash é calculado no pool de hashing, com o custo configurado.
         
         Args:
             password (str): Senha em texto plano a ser hasheada
+
+        Raises:
+            PasswordPoolBusy: Se o pool de hashing estiver saturado
         """
-        self.password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        self.password_hash = password_hasher.hash(password)
     
     def check_password(self, password):
         """
@@ -41,8 +50,20 @@ class User(db.Model):
             
         Returns:
             bool: True se a senha estiver correta, False caso contrário
+
+        Raises:
+            PasswordPoolBusy: Se o pool de hashing estiver saturado
+        """
+        return password_hasher.verify(password, self.password_hash)
+
+    def password_needs_rehash(self):
+        """
+        Indica se o hash foi gerado com um custo diferente do configurado.
+
+        Returns:
+            bool: True se a senha deve ser rehasheada no próximo login
         """
-        return bcrypt.checkpw(password.encode('utf-8'), self.password_hash.encode('utf-8'))
+        return password_hasher.needs_rehash(self.password_hash)
     
     def to_dict(self):
         """
@@ -0,0 +1,27 @@
+"""
+Módulo que define o contador de geração dos usuários.
+O contador é incrementado na mesma transação de toda alteração ou remoção
+de usuários e avisa os demais processos que o cache de /me ficou antigo.
+"""
+
+from sqlalchemy import DDL, event
+from app.extensions import db
+
+class UsersGeneration(db.Model):
+    """
+    Modelo com uma única linha (id = 1) que guarda a geração dos usuários.
+
+    Atributos:
+        id: Identificador fixo da linha (sempre 1)
+        generation: Número incrementado a cada alteração ou remoção de usuários
+    """
+    __tablename__ = 'users_generation'
+
+    id = db.Column(db.Integer, primary_key=True)
+    generation = db.Column(db.BigInteger, nullable=False, default=0)
+
+# Cria a linha única junto com a tabela
+event.listen(
+    UsersGeneration.__table__, 'after_create',
+    DDL('INSERT INTO users_generation (id, generation) VALUES (1, 0)')
+)
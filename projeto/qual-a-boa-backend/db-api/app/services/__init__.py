@@ -0,0 +1,3 @@
+"""
+Serviços de domínio usados pelas rotas da API (busca, paginação, cache etc.).
+"""
@@ -0,0 +1,191 @@
+"""
+Módulo que implementa a criação e atualização de restaurantes em lote.
+
+O lote é validado em uma única passagem, os conflitos de CNPJ são
+verificados com uma consulta por conjunto (`cnpj IN (...)`) e as linhas são
+gravadas com INSERT de múltiplas linhas. No modo `upsert` o INSERT usa
+`ON CONFLICT (cnpj) DO UPDATE`, disponível no PostgreSQL e no SQLite.
+Cada lote de `batch_size` linhas é confirmado em uma transação própria.
+"""
+
+import json
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.extensions import db
+from app.models import Restaurant
+from app.models.restaurant_hours import replace_opening_hours
+from app.services.catalog_version import bump_catalog_version
+from app.services.suggest import track_bulk_suggestions
+from app.services.trigram_index import track_bulk_changes
+from app.utils.validators import load_payload
+
+# Modos de gravação aceitos
+BULK_MODES = ('insert', 'upsert')
+
+# Colunas gravadas a partir do payload (além das colunas de busca derivadas)
+DATA_FIELDS = tuple(field for field in Restaurant.PUBLIC_FIELDS if field != 'id')
+
+class BulkError(ValueError):
+    """Erro lançado quando o corpo de uma requisição em lote é inválido."""
+
+def parse_bulk_body(request):
+    """
+    Lê o corpo da requisição como lista JSON ou NDJSON.
+    Linhas NDJSON inválidas não interrompem o lote: viram erros por linha.
+
+    Args:
+        request: Requisição Flask atual
+
+    Returns:
+        list: Itens do lote (dicionários ou exceções de parsing)
+
+    Raises:
+        BulkError: Se o corpo não for uma lista JSON nem NDJSON
+    """
+    if request.mimetype == 'application/x-ndjson':
+        items = []
+        for line in request.get_data(as_text=True).splitlines():
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError as err:
+                items.append(BulkError(f'Invalid JSON: {err}'))
+        return items
+
+    data = request.get_json(silent=True)
+    if not isinstance(data, list):
+        raise BulkError('Request body must be a JSON array or NDJSON')
+    return data
+
+def validate_rows(items, model):
+    """
+    Valida todos os itens do lote em uma única passagem.
+
+    Args:
+        items (list): Itens retornados por `parse_bulk_body`
+        model: Modelo Pydantic usado na validação (ex.: RestaurantCreate)
+
+    Returns:
+        tuple: (lista de (índice, dados normalizados) válidos, dicionário índice -> erros)
+    """
+    errors = {}
+    valid = []
+    for index, item in enumerate(items):
+        if isinstance(item, Exception):
+            errors[index] = {'_schema': [str(item)]}
+            continue
+        instance, item_errors = load_payload(model, item)
+        if item_errors:
+            errors[index] = item_errors
+        else:
+            valid.append((index, instance.model_dump()))
+    return valid, errors
+
+def existing_cnpjs(cnpjs):
+    """Retorna {cnpj: id} dos CNPJs já cadastrados, com uma consulta por conjunto."""
+    if not cnpjs:
+        return {}
+    rows = db.session.execute(select(Restaurant.cnpj, Restaurant.id).where(Restaurant.cnpj.in_(cnpjs)))
+    return dict(rows.all())
+
+def _insert_statement(mode):
+    """Monta o INSERT de múltiplas linhas adequado ao dialeto e ao modo."""
+    # Usa a tabela (Core) e não a entidade ORM: evita o custo por linha do bulk ORM
+    table = Restaurant.__table__
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        statement = postgresql.insert(table)
+    elif dialect == 'sqlite':
+        statement = sqlite.insert(table)
+    elif mode == 'upsert':
+        raise BulkError(f'Upsert is not supported on {dialect}')
+    else:
+        return insert(table).returning(table.c.id, sort_by_parameter_order=True)
+
+    if mode == 'upsert':
+        columns = DATA_FIELDS + Restaurant.DERIVED_COLUMNS
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.cnpj],
+            set_={
+                **{column: statement.excluded[column] for column in columns},
+                'version': table.c.version + 1,
+            }
+        )
+    return statement.returning(table.c.id, sort_by_parameter_order=True)
+
+def bulk_write(items, model, mode='insert', batch_size=1000):
+    """
+    Valida e grava um lote de restaurantes.
+
+    Args:
+        items (list): Itens retornados por `parse_bulk_body`
+        model: Modelo Pydantic usado na validação
+        mode (str): 'insert' (CNPJ existente é erro) ou 'upsert'
+        batch_size (int): Quantidade de linhas por INSERT/transação
+
+    Returns:
+        dict: Totais e resultado por linha (índice, status, id ou erros)
+    """
+    if mode not in BULK_MODES:
+        raise BulkError(f"mode must be one of: {', '.join(BULK_MODES)}")
+
+    valid, errors = validate_rows(items, model)
+    results = {index: {'index': index, 'status': 'error', 'errors': err} for index, err in errors.items()}
+
+    # Um CNPJ repetido no próprio lote só é gravado na primeira ocorrência
+    seen = set()
+    unique = []
+    for index, data in valid:
+        if data['cnpj'] in seen:
+            results[index] = {'index': index, 'status': 'error', 'errors': {'cnpj': ['Duplicated in request']}}
+        else:
+            seen.add(data['cnpj'])
+            unique.append((index, data))
+
+    statement = _insert_statement(mode)
+    for start in range(0, len(unique), batch_size):
+        batch = unique[start:start + batch_size]
+        existing = existing_cnpjs([data['cnpj'] for _, data in batch])
+
+        to_write = []
+        for index, data in batch:
+            if data['cnpj'] in existing and mode == 'insert':
+                results[index] = {
+                    'index': index, 'status': 'error',
+                    'errors': {'cnpj': ['Restaurant with this CNPJ already exists']}
+                }
+            else:
+                to_write.append((index, {**data, **Restaurant.derived_columns(data)}))
+        if not to_write:
+            continue
+
+        rows = [data for _, data in to_write]
+        try:
+            ids = db.session.execute(statement, rows).scalars().all()
+        except IntegrityError as err:
+            # Conflito com uma escrita concorrente: o lote inteiro é desfeito
+            db.session.rollback()
+            for index, _ in to_write:
+                results[index] = {'index': index, 'status': 'error', 'errors': {'_schema': [str(err.orig)]}}
+            continue
+        replace_opening_hours(db.session, [(restaurant_id, row['operating_hours']) for restaurant_id, row in zip(ids, rows)])
+        track_bulk_changes(db.session, zip(ids, rows))
+        track_bulk_suggestions(db.session, zip(ids, rows))
+        bump_catalog_version(db.session)
+        db.session.commit()
+
+        for (index, data), restaurant_id in zip(to_write, ids):
+            status = 'updated' if data['cnpj'] in existing else 'created'
+            results[index] = {'index': index, 'status': status, 'id': restaurant_id}
+
+    ordered = [results[index] for index in sorted(results)]
+    return {
+        'created': sum(1 for r in ordered if r['status'] == 'created'),
+        'updated': sum(1 for r in ordered if r['status'] == 'updated'),
+        'failed': sum(1 for r in ordered if r['status'] == 'error'),
+        'results': ordered,
+    }
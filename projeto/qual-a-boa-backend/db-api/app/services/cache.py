@@ -0,0 +1,276 @@
+"""
+Módulo que implementa o cache de respostas das rotas de leitura de
+restaurantes (listagem, detalhe e busca).
+
+Backends (CACHE_BACKEND):
+    - 'local': LRU com TTL em memória, por processo (padrão)
+    - 'redis': compartilhado entre os workers, via `redis` (CACHE_REDIS_URL)
+    - 'none': desativa o cache
+
+A chave combina a rota, os parâmetros normalizados (ordenados, sem valores
+vazios, codificados com urlencode) e a ETag calculada por `conditional_get`, que já
+embute a versão do catálogo ou da linha. Assim uma entrada nunca é servida
+depois que o dado mudou, mesmo quando a escrita ocorreu em outro worker.
+
+Além disso, todo commit que altera restaurantes invalida o cache do próprio
+processo (e o Redis) no evento `after_commit`, liberando as entradas antigas.
+Sem ETag, a defasagem máxima é limitada por CACHE_TTL segundos.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from urllib.parse import urlencode
+
+import redis
+from flask import Response, g, make_response, request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.services.catalog_version import CATALOG_CHANGED_KEY
+from app.services.streaming import stream_format
+
+# Cabeçalhos da resposta preservados no cache
+CACHED_HEADERS = ('X-Next-Cursor', 'Link')
+
+class CacheStats:
+    """
+    Contadores de uso do cache do processo.
+
+    Atributos:
+        hits: Leituras encontradas no cache
+        misses: Leituras não encontradas
+        sets: Respostas gravadas
+        evictions: Entradas descartadas por LRU ou TTL
+        invalidations: Limpezas causadas por escritas
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def to_dict(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'sets': self.sets,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+class LocalCache:
+    """
+    Cache LRU com TTL em memória, seguro para uso com threads.
+
+    Atributos:
+        max_entries: Quantidade máxima de entradas
+        ttl: Tempo de vida de cada entrada, em segundos
+    """
+    name = 'local'
+
+    def __init__(self, max_entries=1024, ttl=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.stats.evictions += 1
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            self.stats.sets += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+            self.stats.invalidations += 1
+
+    def info(self):
+        return {'backend': self.name, 'entries': len(self._entries), **self.stats.to_dict()}
+
+class RedisCache:
+    """
+    Cache compartilhado no Redis. As chaves gravadas são registradas em um
+    conjunto para que a invalidação não precise varrer o keyspace.
+
+    Atributos:
+        client: Cliente Redis (ou compatível, como fakeredis nos testes)
+        ttl: Tempo de vida de cada entrada, em segundos
+        prefix: Prefixo das chaves no Redis
+    """
+    name = 'redis'
+
+    def __init__(self, client, ttl=60, prefix='qualaboa:cache:'):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self.stats = CacheStats()
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        if value is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return value
+
+    def set(self, key, value):
+        pipeline = self.client.pipeline()
+        pipeline.setex(self.prefix + key, self.ttl, value)
+        pipeline.sadd(self.prefix + 'keys', self.prefix + key)
+        pipeline.expire(self.prefix + 'keys', self.ttl)
+        pipeline.execute()
+        self.stats.sets += 1
+
+    def invalidate(self):
+        keys = self.client.smembers(self.prefix + 'keys')
+        self.client.delete(self.prefix + 'keys', *keys)
+        self.stats.invalidations += 1
+
+    def info(self):
+        info = {'backend': self.name, **self.stats.to_dict()}
+        # Despejos por falta de memória são contados pelo próprio Redis
+        try:
+            info['evictions'] = self.client.info('stats').get('evicted_keys', 0)
+        except redis.ResponseError:
+            pass  # Servidor (ou substituto, como o fakeredis) sem o comando INFO
+        return info
+
+class ResponseCache:
+    """
+    Fachada do cache de respostas, configurada por `init_app`.
+
+    Atributos:
+        backend: Backend ativo (LocalCache, RedisCache) ou None se desativado
+    """
+
+    def __init__(self):
+        self.backend = None
+
+    def init_app(self, app):
+        """
+        Cria o backend conforme CACHE_BACKEND, CACHE_TTL e CACHE_MAX_ENTRIES.
+
+        Args:
+            app (Flask): Aplicação Flask
+        """
+        name = app.config.get('CACHE_BACKEND', 'local')
+        ttl = app.config.get('CACHE_TTL', 60)
+        if name == 'redis':
+            self.backend = RedisCache(redis.Redis.from_url(app.config['CACHE_REDIS_URL']), ttl=ttl)
+        elif name == 'local':
+            self.backend = LocalCache(max_entries=app.config.get('CACHE_MAX_ENTRIES', 1024), ttl=ttl)
+        else:
+            self.backend = None
+
+    def invalidate(self):
+        if self.backend is not None:
+            self.backend.invalidate()
+
+    def info(self):
+        return self.backend.info() if self.backend is not None else {'backend': 'none'}
+
+    def cached(self, namespace):
+        """
+        Decorator que guarda as respostas 200 da rota. Requisições em
+        streaming não passam pelo cache.
+
+        Args:
+            namespace (str): Nome da rota usado como prefixo da chave
+
+        Returns:
+            function: Decorator da rota
+        """
+        def decorator(f):
+            @wraps(f)
+            def decorated_function(*args, **kwargs):
+                backend = self.backend
+                if backend is None or stream_format(request):
+                    return f(*args, **kwargs)
+
+                key = cache_key(namespace)
+                value = backend.get(key)
+                if value is not None:
+                    return _response_from_cache(value, 'HIT')
+
+                response = make_response(f(*args, **kwargs))
+                if response.status_code == 200 and not response.is_streamed:
+                    backend.set(key, _cache_value(response))
+                response.headers['X-Cache'] = 'MISS'
+                return response
+            return decorated_function
+        return decorator
+
+def cache_key(namespace):
+    """
+    Monta a chave de cache da requisição atual.
+
+    Args:
+        namespace (str): Nome da rota
+
+    Returns:
+        str: Chave com parâmetros normalizados e ETag
+    """
+    params = sorted(
+        (name, value.strip()) for name, value in request.args.items(multi=True) if value.strip()
+    )
+    # urlencode escapa '&', '=' e ':' nos valores: parâmetros distintos nunca
+    # produzem a mesma chave
+    query = urlencode(params)
+    path = urlencode(sorted(request.view_args.items()))
+    return f"{namespace}:{path}:{query}:{g.get('etag', '')}"
+
+def _cache_value(response):
+    headers = {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers}
+    return json.dumps({
+        'body': response.get_data(as_text=True),
+        'mimetype': response.mimetype,
+        'headers': headers,
+    })
+
+def _response_from_cache(value, status):
+    data = json.loads(value)
+    response = Response(data['body'], mimetype=data['mimetype'])
+    response.headers.update(data['headers'])
+    response.headers['X-Cache'] = status
+    return response
+
+# Instância única do cache, configurada em create_app
+response_cache = ResponseCache()
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_on_commit(session):
+    """Invalida o cache quando a transação confirmada alterou restaurantes."""
+    if session.info.pop(CATALOG_CHANGED_KEY, False):
+        response_cache.invalidate()
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_on_rollback(session):
+    session.info.pop(CATALOG_CHANGED_KEY, None)
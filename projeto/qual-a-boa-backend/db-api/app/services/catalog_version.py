@@ -0,0 +1,190 @@
+"""
+Módulo que implementa as ETags e o GET condicional das rotas de restaurantes.
+
+- Listagem e busca: ETag fraca derivada do contador `catalog_version`,
+  incrementado na mesma transação de toda escrita em restaurantes.
+- Detalhe (`GET /<id>`): ETag fraca derivada da coluna `version` da linha.
+
+Com `If-None-Match` igual à ETag atual, a resposta é 304 sem consultar nem
+serializar os restaurantes: apenas a versão é lida (uma linha, pela chave).
+
+A mesma versão sincroniza as estruturas em memória de cada worker (índice de
+trigramas e sugestões, via `CatalogSync`): cada uma guarda a versão que
+reflete e a compara com o banco a cada INDEX_SYNC_INTERVAL segundos,
+reconstruindo-se quando outro processo alterou o catálogo. Nos bancos com
+UPDATE ... RETURNING, o incremento registra na sessão as versões anterior e
+nova da transação, de modo que os commits do próprio processo avançam a
+versão da estrutura sem reconstruí-la.
+"""
+
+import time
+from functools import wraps
+
+from flask import Response, g, make_response, request
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from app.models import CatalogVersion, Restaurant
+
+_catalog_table = CatalogVersion.__table__
+
+# Marca, em session.info, que a transação alterou restaurantes
+CATALOG_CHANGED_KEY = 'catalog_changed'
+
+# Versões (anterior, nova) do catálogo na transação, em session.info
+CATALOG_VERSIONS_KEY = 'catalog_versions'
+
+def current_catalog_version():
+    """
+    Lê a versão atual do catálogo.
+
+    Returns:
+        int: Versão do catálogo (0 se a linha ainda não existir)
+    """
+    return db.session.execute(select(_catalog_table.c.version).where(_catalog_table.c.id == 1)).scalar() or 0
+
+def bump_catalog_version(session):
+    """
+    Incrementa a versão do catálogo na transação atual da sessão.
+    Deve ser chamada pelas escritas que não passam pelo flush do ORM.
+
+    Args:
+        session: Sessão SQLAlchemy da transação
+    """
+    statement = update(_catalog_table).where(_catalog_table.c.id == 1).values(version=_catalog_table.c.version + 1)
+    connection = session.connection()
+    if connection.dialect.update_returning:
+        # A linha fica travada até o commit: as versões da transação são contíguas
+        version = connection.execute(statement.returning(_catalog_table.c.version)).scalar()
+        previous = session.info.get(CATALOG_VERSIONS_KEY, (version - 1, None))[0]
+        session.info[CATALOG_VERSIONS_KEY] = (previous, version)
+    else:
+        connection.execute(statement)
+    session.info[CATALOG_CHANGED_KEY] = True
+
+class CatalogSync:
+    """
+    Versão do catálogo refletida por uma estrutura em memória do worker.
+
+    Atributos:
+        interval: Intervalo (s) entre leituras da versão no banco (None não consulta)
+        version: Versão do catálogo refletida pela estrutura (None se desconhecida)
+    """
+
+    def __init__(self, interval=None):
+        self.interval = interval
+        self.version = None
+        self._checked_at = None
+
+    def reset(self):
+        self.version = None
+        self._checked_at = None
+
+    def built(self, version):
+        """
+        Registra a versão lida antes de uma reconstrução.
+
+        Args:
+            version (int): Versão do catálogo lida antes dos dados
+        """
+        self.version = version
+        self._checked_at = time.monotonic()
+
+    def changed_version(self):
+        """
+        Lê a versão no banco, no máximo uma vez por intervalo.
+
+        Returns:
+            int: Versão atual, se ela mudou por escritas que a estrutura não
+                 recebeu; None se nada mudou ou se ainda não é hora de ler
+        """
+        if self.interval is None:
+            return None
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.interval:
+            return None
+        self._checked_at = now
+        version = current_catalog_version()
+        return version if version != self.version else None
+
+    def committed(self, session):
+        """
+        Avança a versão com um commit do próprio processo, depois que as
+        alterações dele foram aplicadas à estrutura. Se outra escrita ocorreu
+        no meio, a versão não avança e a próxima leitura reconstrói.
+
+        Args:
+            session: Sessão SQLAlchemy da transação confirmada
+        """
+        versions = session.info.get(CATALOG_VERSIONS_KEY)
+        if versions is not None and versions[0] == self.version:
+            self.version = versions[1]
+
+@event.listens_for(Session, 'before_flush')
+def _bump_on_restaurant_changes(session, flush_context, instances):
+    """Incrementa a versão do catálogo quando o flush altera restaurantes."""
+    changed = any(isinstance(obj, Restaurant) for obj in session.new) \
+        or any(isinstance(obj, Restaurant) for obj in session.deleted) \
+        or any(isinstance(obj, Restaurant) and session.is_modified(obj) for obj in session.dirty)
+    if changed:
+        bump_catalog_version(session)
+
+@event.listens_for(Session, 'after_transaction_end')
+def _forget_versions(session, transaction):
+    """Descarta as versões registradas ao fim da transação principal."""
+    if transaction.parent is None:
+        session.info.pop(CATALOG_VERSIONS_KEY, None)
+
+def catalog_etag(*args, **kwargs):
+    """ETag das listagens, derivada da versão do catálogo."""
+    return f'catalog-{current_catalog_version()}'
+
+def restaurant_etag(id):
+    """
+    ETag de um restaurante, derivada da versão da linha.
+
+    Args:
+        id (int): ID do restaurante
+
+    Returns:
+        str: ETag ou None se o restaurante não existir
+    """
+    version = db.session.execute(select(Restaurant.version).where(Restaurant.id == id)).scalar()
+    return None if version is None else f'restaurant-{id}-{version}'
+
+def conditional_get(etag_func):
+    """
+    Decorator que adiciona ETag fraca à resposta e responde 304 quando o
+    cliente já possui a versão atual (If-None-Match).
+
+    A ETag é calculada antes da consulta: se uma escrita acontecer no meio,
+    a ETag fica mais antiga que o conteúdo e a próxima requisição apenas
+    recebe o conteúdo de novo (nunca o contrário).
+
+    Args:
+        etag_func: Função que recebe os argumentos da rota e retorna a ETag
+                   (ou None para seguir sem ETag)
+
+    Returns:
+        function: Decorator da rota
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            etag = g.etag = etag_func(*args, **kwargs)
+            if etag is None:
+                return f(*args, **kwargs)
+
+            if request.if_none_match.contains_weak(etag):
+                response = Response(status=304)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag, weak=True)
+            response.headers['Cache-Control'] = 'no-cache'
+            response.vary.add('Accept')
+            return response
+        return decorated_function
+    return decorator
@@ -0,0 +1,186 @@
+"""
+Módulo que configura e instrumenta o pool de conexões do SQLAlchemy.
+
+O tamanho do pool é derivado da quantidade de processos que compartilham o
+banco: cada worker do Gunicorn tem seu próprio pool, então o total de
+conexões abertas pode chegar a DB_WORKERS * (pool_size + max_overflow). Sem
+valores explícitos, o orçamento de conexões do servidor
+(DB_MAX_CONNECTIONS - DB_RESERVED_CONNECTIONS) é dividido entre os workers,
+e cada um recebe no máximo uma conexão fixa e uma extra por thread.
+
+Com DB_POOL_MODE = 'pgbouncer' a aplicação não mantém conexões abertas
+(NullPool): cada checkout abre uma conexão com o PgBouncer, que faz o pool
+(inclusive em modo transaction).
+
+Os pools são instrumentados para medir o tempo de espera por uma conexão e
+os timeouts; `database_pool.stats()` combina esses contadores com o estado
+atual do pool (conexões em uso, ociosas e de overflow).
+"""
+
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import NullPool, QueuePool
+
+from app.extensions import db
+from app.services.metrics import count_pool_timeout, observe_pool_wait
+
+class _TimedPool:
+    """Mede o tempo de cada checkout e conta os timeouts do pool."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            database_pool.record_timeout()
+            raise
+        finally:
+            database_pool.record_wait(time.perf_counter() - start)
+
+class TimedQueuePool(_TimedPool, QueuePool):
+    """QueuePool com medição do tempo de espera."""
+
+class TimedNullPool(_TimedPool, NullPool):
+    """NullPool com medição do tempo de conexão (modo PgBouncer)."""
+
+def pool_sizes(config):
+    """
+    Calcula pool_size e max_overflow de cada processo.
+
+    Args:
+        config: Configuração da aplicação (app.config)
+
+    Returns:
+        tuple: (pool_size, max_overflow)
+    """
+    workers = max(1, config.get('DB_WORKERS', 1))
+    threads = max(1, config.get('DB_WORKER_THREADS', 1))
+    budget = config.get('DB_MAX_CONNECTIONS', 100) - config.get('DB_RESERVED_CONNECTIONS', 0)
+    share = max(1, budget // workers)
+
+    pool_size = config.get('DB_POOL_SIZE')
+    if pool_size is None:
+        pool_size = min(threads, share)
+    max_overflow = config.get('DB_MAX_OVERFLOW')
+    if max_overflow is None:
+        max_overflow = max(0, min(threads, share - pool_size))
+    return pool_size, max_overflow
+
+def engine_options(config):
+    """
+    Monta as opções de pool para o create_engine a partir de DB_*.
+
+    Args:
+        config: Configuração da aplicação (app.config)
+
+    Returns:
+        dict: Opções para SQLALCHEMY_ENGINE_OPTIONS
+    """
+    url = make_url(config['SQLALCHEMY_DATABASE_URI'])
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        # O Flask-SQLAlchemy usa StaticPool para SQLite em memória
+        return {}
+
+    options = {}
+    if url.get_backend_name() == 'postgresql' and config.get('DB_CONNECT_TIMEOUT'):
+        options['connect_args'] = {'connect_timeout': config['DB_CONNECT_TIMEOUT']}
+
+    if config.get('DB_POOL_MODE', 'queue') == 'pgbouncer':
+        options['poolclass'] = TimedNullPool
+        return options
+
+    pool_size, max_overflow = pool_sizes(config)
+    options.update(
+        poolclass=TimedQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=config.get('DB_POOL_TIMEOUT', 30),
+        pool_recycle=config.get('DB_POOL_RECYCLE', -1),
+        pool_pre_ping=config.get('DB_POOL_PRE_PING', False),
+    )
+    return options
+
+class DatabasePool:
+    """
+    Configuração e contadores do pool de conexões do processo.
+
+    Atributos:
+        checkouts: Conexões entregues pelo pool
+        timeouts: Checkouts que excederam DB_POOL_TIMEOUT
+        wait_total: Soma dos tempos de espera, em segundos
+        wait_max: Maior tempo de espera, em segundos
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.mode = 'queue'
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+
+    def init_app(self, app):
+        """
+        Aplica as opções do pool à configuração (antes de `db.init_app`).
+
+        Opções definidas diretamente em SQLALCHEMY_ENGINE_OPTIONS têm
+        precedência sobre as derivadas de DB_*.
+
+        Args:
+            app (Flask): Aplicação Flask
+        """
+        self.mode = app.config.get('DB_POOL_MODE', 'queue')
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+            **engine_options(app.config),
+            **app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}),
+        }
+        self.reset()
+
+    def record_wait(self, seconds):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+        observe_pool_wait(seconds)
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+        count_pool_timeout()
+
+    def stats(self):
+        """
+        Retorna o estado do pool da aplicação atual e os contadores.
+
+        Returns:
+            dict: Modo, tamanho, conexões em uso, ociosas e de overflow,
+                  checkouts, timeouts e tempos de espera (ms)
+        """
+        pool = db.engine.pool
+        with self._lock:
+            stats = {
+                'mode': self.mode,
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'wait_avg_ms': round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                'wait_max_ms': round(self.wait_max * 1000, 3),
+            }
+        if isinstance(pool, QueuePool):
+            stats.update(
+                size=pool.size(),
+                max_overflow=pool._max_overflow,
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=max(0, pool.overflow()),
+            )
+        return stats
+
+# Instância única, configurada em create_app
+database_pool = DatabasePool()
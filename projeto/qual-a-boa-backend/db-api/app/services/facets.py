@@ -0,0 +1,82 @@
+"""
+Módulo que implementa as contagens por faceta (estado, tipo e cidade) usadas
+pelos filtros do frontend.
+
+Cada faceta é uma consulta agregada `SELECT coluna, count(*) ... GROUP BY
+coluna`, servida pelos índices `idx_restaurants_state`, `idx_restaurants_city`
+e `idx_restaurants_type`. As contagens podem ser restringidas pelos mesmos
+critérios aceitos pela rota /search; nesse caso todas as facetas (e o total)
+refletem apenas os restaurantes que atendem aos critérios.
+"""
+
+from sqlalchemy import func, select
+
+from app.extensions import db
+from app.models import Restaurant
+from app.services.search import apply_search_filters
+
+# Quantidade padrão e máxima de cidades retornadas (as mais frequentes)
+DEFAULT_CITY_LIMIT = 20
+MAX_CITY_LIMIT = 200
+
+class FacetError(ValueError):
+    """Erro lançado quando os parâmetros das facetas são inválidos."""
+
+def parse_city_limit(args):
+    """
+    Lê o parâmetro `city_limit` (quantidade de cidades retornadas).
+
+    Args:
+        args: Parâmetros da query string (request.args)
+
+    Returns:
+        int: Quantidade de cidades, limitada a MAX_CITY_LIMIT
+
+    Raises:
+        FacetError: Se o valor não for um inteiro positivo
+    """
+    try:
+        limit = int(args.get('city_limit', DEFAULT_CITY_LIMIT))
+    except ValueError:
+        raise FacetError('city_limit must be an integer')
+    if limit < 1:
+        raise FacetError('city_limit must be greater than zero')
+    return min(limit, MAX_CITY_LIMIT)
+
+def facet_counts(column, criteria, limit=None):
+    """
+    Conta os restaurantes agrupados por uma coluna.
+
+    Args:
+        column: Coluna de Restaurant usada no agrupamento
+        criteria (dict): Critérios retornados por `parse_search_criteria`
+        limit (int): Quantidade máxima de valores (os mais frequentes)
+
+    Returns:
+        list: Dicionários {'value', 'count'}, do mais para o menos frequente
+    """
+    count = func.count().label('count')
+    statement = apply_search_filters(select(column, count), criteria, aggregate=True) \
+        .group_by(column).order_by(count.desc(), column)
+    if limit is not None:
+        statement = statement.limit(limit)
+    return [{'value': value, 'count': total} for value, total in db.session.execute(statement)]
+
+def restaurant_facets(criteria, city_limit=DEFAULT_CITY_LIMIT):
+    """
+    Calcula o total e as facetas de estado, tipo e cidade.
+
+    Args:
+        criteria (dict): Critérios retornados por `parse_search_criteria`
+        city_limit (int): Quantidade de cidades retornadas
+
+    Returns:
+        dict: Total de restaurantes e contagens por faceta
+    """
+    total = db.session.execute(apply_search_filters(select(func.count(Restaurant.id)), criteria, aggregate=True)).scalar()
+    return {
+        'total': total,
+        'state': facet_counts(Restaurant.state, criteria),
+        'type': facet_counts(Restaurant.type, criteria),
+        'city': facet_counts(Restaurant.city, criteria, limit=city_limit),
+    }
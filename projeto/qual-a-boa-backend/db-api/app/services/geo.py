@@ -0,0 +1,178 @@
+"""
+Módulo que implementa a busca de restaurantes por proximidade.
+
+A consulta usa a grade espacial de app/utils/geo.py em duas etapas:
+
+1. No banco, apenas as células que cobrem o círculo são lidas (intervalos de
+   `geo_cell`, pelo índice ix_restaurants_geo_cell). Dentro delas, a
+   distância aproximada (projeção equirretangular em torno do centro) filtra
+   o raio e ordena os candidatos, e só os mais próximos são retornados.
+2. Na aplicação, a distância exata (haversine) refina o raio e a ordem.
+
+Em regiões densas, ordenar todos os restaurantes de um raio grande custa
+caro; por isso a busca começa por frações do raio (RADIUS_STEPS) e só amplia
+quando não encontrou `limit` restaurantes. Os encontrados em um raio menor
+são necessariamente os mais próximos.
+
+Restaurantes cujo CEP não está na tabela de coordenadas não têm `geo_cell`
+e não aparecem na busca. A distância aproximada não trata círculos que
+cruzam o antimeridiano (irrelevante para CEPs brasileiros).
+"""
+
+import math
+from collections import namedtuple
+
+from flask import current_app
+from sqlalchemy import bindparam, or_, select, update
+
+from app.extensions import db
+from app.models import Restaurant
+from app.services.catalog_version import bump_catalog_version
+from app.utils.geo import KM_PER_DEGREE, cell_ranges, haversine_km
+
+# Raio padrão e quantidade padrão de resultados
+DEFAULT_RADIUS_KM = 5.0
+DEFAULT_NEARBY_LIMIT = 20
+
+# Folga da etapa aproximada: candidatos extras e tolerância no raio, para que
+# a diferença entre a distância aproximada e a exata não descarte resultados
+CANDIDATE_MARGIN = 1.01
+EXTRA_CANDIDATES = 10
+
+# Frações do raio tentadas em sequência e menor raio intermediário (km)
+RADIUS_STEPS = (1 / 16, 1 / 4, 1)
+MIN_STEP_KM = 0.5
+
+# Parâmetros da busca já validados
+NearbyQuery = namedtuple('NearbyQuery', ['lat', 'lon', 'radius_km', 'limit'])
+
+class NearbyError(ValueError):
+    """Erro lançado quando os parâmetros da busca por proximidade são inválidos."""
+
+def parse_nearby_args(args):
+    """
+    Lê e valida os parâmetros `lat`, `lon`, `radius_km` e `limit`.
+
+    Args:
+        args: Parâmetros da query string (request.args)
+
+    Returns:
+        NearbyQuery: Parâmetros da busca
+
+    Raises:
+        NearbyError: Se algum parâmetro estiver ausente ou for inválido
+    """
+    max_radius = current_app.config['NEARBY_MAX_RADIUS_KM']
+    try:
+        lat = float(args['lat'])
+        lon = float(args['lon'])
+        radius_km = float(args.get('radius_km', DEFAULT_RADIUS_KM))
+        limit = int(args.get('limit', DEFAULT_NEARBY_LIMIT))
+    except KeyError:
+        raise NearbyError('lat and lon are required')
+    except ValueError:
+        raise NearbyError('lat, lon and radius_km must be numbers and limit an integer')
+    if not (math.isfinite(lat) and -90 <= lat <= 90 and math.isfinite(lon) and -180 <= lon <= 180):
+        raise NearbyError('lat must be between -90 and 90 and lon between -180 and 180')
+    if not 0 < radius_km <= max_radius:
+        raise NearbyError(f'radius_km must be greater than 0 and at most {max_radius}')
+    if limit < 1:
+        raise NearbyError('limit must be greater than zero')
+    return NearbyQuery(lat, lon, radius_km, min(limit, current_app.config['PAGINATION_MAX_LIMIT']))
+
+def nearby_statement(query):
+    """
+    Monta o SELECT dos candidatos mais próximos, restrito às células do raio.
+
+    Args:
+        query (NearbyQuery): Parâmetros da busca
+
+    Returns:
+        Select: Consulta com os campos públicos e as coordenadas
+    """
+    # Distância aproximada em graus de latitude (equirretangular)
+    scale = math.cos(math.radians(query.lat))
+    dlat = Restaurant.latitude - query.lat
+    dlon = (Restaurant.longitude - query.lon) * scale
+    approx = dlat * dlat + dlon * dlon
+    max_degrees = query.radius_km / KM_PER_DEGREE * CANDIDATE_MARGIN
+
+    cells = [Restaurant.geo_cell.between(first, last) for first, last in cell_ranges(query.lat, query.lon, query.radius_km)]
+    columns = [getattr(Restaurant, field) for field in Restaurant.PUBLIC_FIELDS]
+    return (
+        select(*columns, Restaurant.latitude, Restaurant.longitude)
+        .where(or_(*cells))
+        .where(approx <= max_degrees * max_degrees)
+        .order_by(approx, Restaurant.id)
+        .limit(query.limit + EXTRA_CANDIDATES)
+    )
+
+def _search_radius(query):
+    results = []
+    for row in db.session.execute(nearby_statement(query)):
+        distance = haversine_km(query.lat, query.lon, row.latitude, row.longitude)
+        if distance <= query.radius_km:
+            item = row._asdict()
+            item['distance_km'] = round(distance, 3)
+            results.append((distance, row.id, item))
+    results.sort(key=lambda result: result[:2])
+    return [item for _, _, item in results[:query.limit]]
+
+def nearby_restaurants(query):
+    """
+    Busca os restaurantes mais próximos dentro do raio.
+
+    Args:
+        query (NearbyQuery): Parâmetros da busca
+
+    Returns:
+        list: Dicionários com os campos públicos, latitude, longitude e
+              distance_km, do mais próximo ao mais distante
+    """
+    for fraction in RADIUS_STEPS[:-1]:
+        radius_km = query.radius_km * fraction
+        if radius_km < MIN_STEP_KM:
+            continue
+        items = _search_radius(query._replace(radius_km=radius_km))
+        if len(items) == query.limit:
+            return items
+    return _search_radius(query)
+
+def backfill_location_columns(batch_size=1000, progress=None):
+    """
+    Recalcula as coordenadas e a célula da grade de todos os restaurantes em
+    lotes, a partir da tabela de CEPs.
+
+    Args:
+        batch_size (int): Quantidade de linhas por lote
+        progress (callable): Função opcional chamada com o total processado
+
+    Returns:
+        tuple: (linhas atualizadas, linhas cujo CEP não está na tabela)
+    """
+    # UPDATE direto na tabela: as colunas derivadas não alteram a versão da linha
+    table = Restaurant.__table__
+    statement = update(table).where(table.c.id == bindparam('row_id')).values(
+        {column: bindparam(column) for column in Restaurant.LOCATION_COLUMNS}
+    )
+    last_id = 0
+    total = 0
+    unresolved = 0
+    while True:
+        rows = db.session.execute(
+            select(Restaurant.id, Restaurant.postal_code)
+            .where(Restaurant.id > last_id).order_by(Restaurant.id).limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        values = [{'row_id': row.id, **Restaurant.location_columns(row._asdict())} for row in rows]
+        unresolved += sum(1 for value in values if value['geo_cell'] is None)
+        db.session.execute(statement, values)
+        # Muda a ETag das listagens e libera as respostas em cache
+        bump_catalog_version(db.session)
+        db.session.commit()
+        last_id = rows[-1].id
+        total += len(rows)
+        if progress:
+            progress(total)
+    return total, unresolved
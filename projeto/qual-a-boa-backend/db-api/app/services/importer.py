@@ -0,0 +1,267 @@
+"""
+Módulo que implementa a importação de restaurantes a partir de arquivos
+CSV ou NDJSON.
+
+O arquivo é lido em streaming (nunca inteiro em memória), cada registro é
+validado com as regras de `RestaurantCreate` e os registros válidos são
+gravados em lotes, cada um em sua própria transação:
+
+- PostgreSQL: `COPY restaurants (...) FROM STDIN` pela conexão do driver.
+- Demais bancos (SQLite): `executemany` de um INSERT.
+
+Após cada commit a posição (quantidade de registros lidos) é gravada em um
+arquivo de checkpoint, de modo que uma importação interrompida retoma a
+partir do último lote confirmado. Se a falha ocorrer entre o commit e o
+checkpoint, os registros do lote repetido são detectados pela verificação
+de CNPJ e enviados ao arquivo de rejeitados, sem duplicar dados. Um CNPJ
+gravado por uma escrita concorrente entre a verificação e o INSERT viola a
+restrição única: o lote é desfeito e seus registros vão para os rejeitados
+com o erro do banco, e a importação continua.
+"""
+
+import csv
+import io
+import json
+import os
+import time
+
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.models import Restaurant
+from app.models.restaurant_hours import insert_opening_hours
+from app.schemas.restaurant import RestaurantCreate
+from app.services.bulk import DATA_FIELDS, existing_cnpjs
+from app.services.catalog_version import bump_catalog_version
+from app.utils.validators import load_payload
+
+# Colunas gravadas pela importação, na ordem usada pelo COPY
+IMPORT_COLUMNS = DATA_FIELDS + Restaurant.DERIVED_COLUMNS
+
+def detect_format(path):
+    """
+    Identifica o formato do arquivo pela extensão.
+
+    Args:
+        path (str): Caminho do arquivo
+
+    Returns:
+        str: 'csv' ou 'ndjson'
+    """
+    extension = os.path.splitext(path)[1].lower()
+    return 'ndjson' if extension in ('.ndjson', '.jsonl') else 'csv'
+
+def read_records(stream, fmt):
+    """
+    Lê os registros do arquivo um a um.
+
+    Args:
+        stream: Arquivo aberto em modo texto
+        fmt (str): 'csv' ou 'ndjson'
+
+    Yields:
+        dict ou Exception: Registro lido ou erro de parsing da linha
+    """
+    if fmt == 'csv':
+        yield from csv.DictReader(stream)
+        return
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as err:
+            yield ValueError(f'Invalid JSON: {err}')
+
+def validate_record(record):
+    """
+    Valida um registro com as regras de RestaurantCreate.
+
+    Args:
+        record (dict): Registro lido do arquivo
+
+    Returns:
+        tuple: (dados normalizados ou None, lista de erros)
+    """
+    if isinstance(record, Exception):
+        return None, [str(record)]
+    if not isinstance(record, dict):
+        return None, ['Invalid input type.']
+    instance, errors = load_payload(RestaurantCreate, record)
+    if errors:
+        return None, [f'{field}: {message}' for field, messages in errors.items() for message in messages]
+    data = instance.model_dump()
+    data.update(Restaurant.derived_columns(data))
+    return data, []
+
+def _copy_rows(rows):
+    """Grava as linhas com COPY FROM STDIN (psycopg2 ou psycopg 3)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(row[column] for column in IMPORT_COLUMNS)
+    buffer.seek(0)
+
+    sql = f"COPY restaurants ({', '.join(IMPORT_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+    cursor = db.session.connection().connection.cursor()
+    if hasattr(cursor, 'copy_expert'):
+        cursor.copy_expert(sql, buffer)
+    else:
+        with cursor.copy(sql) as copy:
+            copy.write(buffer.getvalue())
+
+def write_batch(rows):
+    """
+    Grava um lote de linhas válidas e confirma a transação. Os intervalos de
+    funcionamento são gravados na mesma transação, com os ids buscados por CNPJ.
+
+    Args:
+        rows (list): Dicionários com as colunas de IMPORT_COLUMNS
+
+    Raises:
+        IntegrityError: Se algum CNPJ já tiver sido gravado por outra escrita
+    """
+    dialect = db.session.get_bind().dialect
+    if dialect.name == 'postgresql':
+        try:
+            _copy_rows(rows)
+        except dialect.dbapi.IntegrityError as err:
+            # O COPY usa o cursor do driver: o erro chega sem o invólucro do SQLAlchemy
+            raise IntegrityError('COPY restaurants', None, err) from err
+    else:
+        db.session.execute(insert(Restaurant.__table__), rows)
+    ids = existing_cnpjs([row['cnpj'] for row in rows])
+    insert_opening_hours(db.session, [(ids[row['cnpj']], row['operating_hours']) for row in rows])
+    bump_catalog_version(db.session)
+    db.session.commit()
+
+class RestaurantImport:
+    """
+    Importação retomável de um arquivo de restaurantes.
+
+    Atributos:
+        path: Caminho do arquivo de entrada
+        fmt: Formato do arquivo ('csv' ou 'ndjson')
+        batch_size: Registros por lote/transação
+        checkpoint_path: Arquivo com a posição do último lote confirmado
+        rejects_path: Arquivo NDJSON com os registros rejeitados
+    """
+
+    def __init__(self, path, fmt=None, batch_size=5000):
+        self.path = path
+        self.fmt = fmt or detect_format(path)
+        self.batch_size = batch_size
+        self.checkpoint_path = f'{path}.checkpoint'
+        self.rejects_path = f'{path}.rejects.ndjson'
+        self.position = 0
+        self.inserted = 0
+        self.rejected = 0
+
+    def load_checkpoint(self):
+        """Restaura a posição e os totais do último lote confirmado, se houver."""
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, encoding='utf-8') as f:
+                state = json.load(f)
+            self.position = state['position']
+            self.inserted = state['inserted']
+            self.rejected = state['rejected']
+
+    def save_checkpoint(self):
+        """Grava o checkpoint de forma atômica (arquivo temporário + rename)."""
+        state = {'position': self.position, 'inserted': self.inserted, 'rejected': self.rejected}
+        tmp_path = f'{self.checkpoint_path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def reset(self):
+        """Descarta o checkpoint e os rejeitados de uma execução anterior."""
+        for path in (self.checkpoint_path, self.rejects_path):
+            if os.path.exists(path):
+                os.remove(path)
+        self.position = self.inserted = self.rejected = 0
+
+    def run(self, progress=None):
+        """
+        Executa a importação a partir do último checkpoint.
+
+        Args:
+            progress (callable): Função opcional chamada após cada lote com
+                                 (registros lidos, inseridos, rejeitados, registros/s)
+
+        Returns:
+            dict: Totais da importação
+        """
+        self.load_checkpoint()
+        start_position = self.position
+        started = time.perf_counter()
+
+        with open(self.path, newline='', encoding='utf-8') as source, \
+                open(self.rejects_path, 'a', encoding='utf-8') as rejects:
+            records = read_records(source, self.fmt)
+            # Pula os registros já confirmados em uma execução anterior
+            for _ in zip(range(start_position), records):
+                pass
+
+            batch = []
+            for record in records:
+                batch.append((self.position + len(batch) + 1, record))
+                if len(batch) == self.batch_size:
+                    self._process(batch, rejects)
+                    batch = []
+                    if progress:
+                        elapsed = time.perf_counter() - started
+                        progress(self.position, self.inserted, self.rejected,
+                                 (self.position - start_position) / elapsed if elapsed else 0)
+            if batch:
+                self._process(batch, rejects)
+
+        elapsed = time.perf_counter() - started
+        return {
+            'position': self.position,
+            'inserted': self.inserted,
+            'rejected': self.rejected,
+            'elapsed': elapsed,
+            'rate': (self.position - start_position) / elapsed if elapsed else 0,
+        }
+
+    def _process(self, batch, rejects):
+        valid = []
+        failed = []
+        seen = set()
+        for number, record in batch:
+            data, errors = validate_record(record)
+            if errors:
+                failed.append((number, record, errors))
+            elif data['cnpj'] in seen:
+                failed.append((number, record, ['cnpj: Duplicated in file']))
+            else:
+                seen.add(data['cnpj'])
+                valid.append((number, record, data))
+
+        existing = existing_cnpjs([data['cnpj'] for _, _, data in valid])
+        rows = []
+        for number, record, data in valid:
+            if data['cnpj'] in existing:
+                failed.append((number, record, ['cnpj: Restaurant with this CNPJ already exists']))
+            else:
+                rows.append((number, record, data))
+
+        if rows:
+            try:
+                write_batch([data for _, _, data in rows])
+            except IntegrityError as err:
+                # Conflito com uma escrita concorrente: o lote inteiro é desfeito
+                db.session.rollback()
+                failed.extend((number, record, [str(err.orig)]) for number, record, _ in rows)
+                rows = []
+        for number, record, errors in sorted(failed, key=lambda item: item[0]):
+            data = None if isinstance(record, Exception) else record
+            rejects.write(json.dumps({'record': number, 'data': data, 'errors': errors}, ensure_ascii=False) + '\n')
+        rejects.flush()
+
+        self.position = batch[-1][0]
+        self.inserted += len(rows)
+        self.rejected += len(failed)
+        self.save_checkpoint()
@@ -0,0 +1,146 @@
+"""
+Módulo que coleta as métricas da aplicação e as expõe em /metrics, no formato
+texto do Prometheus.
+
+Métricas:
+    - qualaboa_http_request_duration_seconds: histograma da latência por
+      blueprint, rota e método
+    - qualaboa_http_requests_total: requisições por rota e status
+    - qualaboa_http_requests_in_progress: requisições em andamento
+    - qualaboa_db_queries_total / qualaboa_db_query_seconds_total: consultas
+      SQL e tempo gasto nelas, por rota (divididos pelas requisições dão a
+      média por requisição), contadas por app.services.query_monitor
+    - qualaboa_db_pool_checked_out, qualaboa_db_pool_wait_seconds e
+      qualaboa_db_pool_timeouts_total: uso do pool de conexões
+    - qualaboa_cache_lookups_total: consultas ao cache de respostas por rota
+      e resultado (hit/miss)
+
+Com PROMETHEUS_MULTIPROC_DIR definido (deploy/gunicorn_config.py), cada
+worker grava as métricas em arquivos nesse diretório e /metrics agrega
+todos os processos. A variável precisa existir antes da importação deste
+módulo.
+
+O custo por requisição se resume a leituras do relógio e a poucos
+incrementos; os objetos de cada combinação de rótulos são guardados em cache.
+"""
+
+import os
+import time
+from functools import lru_cache
+
+from flask import Response, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.pool import Pool
+
+REQUEST_BUCKETS = (.0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10)
+POOL_WAIT_BUCKETS = (.0001, .0005, .001, .005, .01, .05, .1, .5, 1, 5, 30)
+
+REQUEST_LATENCY = Histogram(
+    'qualaboa_http_request_duration_seconds', 'Latência das requisições HTTP',
+    ['blueprint', 'endpoint', 'method'], buckets=REQUEST_BUCKETS,
+)
+REQUESTS = Counter(
+    'qualaboa_http_requests', 'Requisições HTTP por status',
+    ['blueprint', 'endpoint', 'method', 'status'],
+)
+IN_PROGRESS = Gauge(
+    'qualaboa_http_requests_in_progress', 'Requisições HTTP em andamento', multiprocess_mode='livesum',
+)
+DB_QUERIES = Counter('qualaboa_db_queries', 'Consultas SQL executadas pelas requisições', ['endpoint'])
+DB_QUERY_SECONDS = Counter('qualaboa_db_query_seconds', 'Tempo gasto em consultas SQL', ['endpoint'])
+DB_POOL_CHECKED_OUT = Gauge(
+    'qualaboa_db_pool_checked_out', 'Conexões do pool em uso', multiprocess_mode='livesum',
+)
+DB_POOL_WAIT = Histogram(
+    'qualaboa_db_pool_wait_seconds', 'Espera por uma conexão do pool', buckets=POOL_WAIT_BUCKETS,
+)
+DB_POOL_TIMEOUTS = Counter('qualaboa_db_pool_timeouts', 'Checkouts que excederam DB_POOL_TIMEOUT')
+CACHE_LOOKUPS = Counter(
+    'qualaboa_cache_lookups', 'Consultas ao cache de respostas', ['endpoint', 'result'],
+)
+
+@lru_cache(maxsize=4096)
+def _child(metric, *labels):
+    """Objeto da métrica para os rótulos (labels() custa mais que o incremento)."""
+    return metric.labels(*labels)
+
+def _before_request():
+    if request.endpoint == 'metrics':
+        return
+    IN_PROGRESS.inc()
+    g.metrics_started = time.perf_counter()
+
+def _after_request(response):
+    # Os proxies do Flask custam uma busca de contexto por acesso: resolve uma vez
+    state = g._get_current_object()
+    started = state.pop('metrics_started', None)
+    if started is None:
+        return response
+    elapsed = time.perf_counter() - started
+    IN_PROGRESS.dec()
+
+    req = request._get_current_object()
+    endpoint = req.endpoint or 'none'
+    blueprint = req.blueprint or ''
+    method = req.method
+    _child(REQUEST_LATENCY, blueprint, endpoint, method).observe(elapsed)
+    _child(REQUESTS, blueprint, endpoint, method, response.status_code).inc()
+    queries = getattr(state, 'db_query_count', 0)
+    if queries:
+        _child(DB_QUERIES, endpoint).inc(queries)
+        _child(DB_QUERY_SECONDS, endpoint).inc(state.db_query_seconds)
+    cache = response.headers.get('X-Cache')
+    if cache is not None:
+        _child(CACHE_LOOKUPS, endpoint, cache.lower()).inc()
+    return response
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    DB_POOL_CHECKED_OUT.inc()
+
+def _on_checkin(dbapi_connection, connection_record):
+    DB_POOL_CHECKED_OUT.dec()
+
+def observe_pool_wait(seconds):
+    """
+    Registra a espera por uma conexão do pool (chamado por app.services.db_pool).
+
+    Args:
+        seconds (float): Tempo de espera, em segundos
+    """
+    DB_POOL_WAIT.observe(seconds)
+
+def count_pool_timeout():
+    DB_POOL_TIMEOUTS.inc()
+
+def metrics_registry():
+    """Registro a exportar: agregado dos workers em modo multiprocesso."""
+    if 'PROMETHEUS_MULTIPROC_DIR' not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+def metrics_view():
+    return Response(generate_latest(metrics_registry()), content_type=CONTENT_TYPE_LATEST)
+
+def init_app(app):
+    """
+    Registra os hooks de requisição, os eventos do pool e a rota /metrics.
+
+    Não faz nada com METRICS_ENABLED = False.
+
+    Args:
+        app (Flask): Aplicação Flask
+    """
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.add_url_rule('/metrics', 'metrics', metrics_view)
+
+    for name, listener in (('checkout', _on_checkout), ('checkin', _on_checkin)):
+        if not event.contains(Pool, name, listener):
+            event.listen(Pool, name, listener)
@@ -0,0 +1,142 @@
+"""
+Módulo que implementa o filtro "aberto agora" da busca.
+
+O horário de funcionamento é compilado na escrita em intervalos de minutos
+da semana (tabela restaurant_hours, ver app/models/restaurant_hours.py).
+Na leitura, `open_at` vira um intervalo de índice:
+
+    opens_at BETWEEN <meia-noite do dia> AND t AND closes_at > t
+
+Nas páginas o filtro é um EXISTS correlacionado (busca pela chave primária
+restaurant_id, opens_at para cada restaurante na ordem do id, parando no
+`limit`); nas contagens é um IN sobre ix_restaurant_hours_window, que lê
+apenas os intervalos abertos. No SQLite, com 1 milhão de restaurantes, a
+página cai de centenas de ms (IN) para menos de 1 ms, e as contagens ficam
+de 1,5 a 7 vezes mais rápidas com IN.
+
+`open_now=1` usa o horário atual no fuso OPENING_HOURS_TIMEZONE. Como essa
+resposta muda com o relógio, a ETag das rotas que aceitam o filtro inclui o
+minuto consultado (`open_hours_etag`).
+"""
+
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from flask import current_app, request
+from sqlalchemy import exists, select
+
+from app.extensions import db
+from app.models import Restaurant, RestaurantHours
+from app.models.restaurant_hours import replace_opening_hours
+from app.services.catalog_version import bump_catalog_version, catalog_etag
+from app.utils.opening_hours import (
+    MINUTES_PER_DAY, OperatingHoursError, minute_of_week, parse_operating_hours, parse_weekday_time,
+)
+
+class OpenAtError(ValueError):
+    """Erro lançado quando os parâmetros open_at/open_now são inválidos."""
+
+def _open_now(args):
+    return args.get('open_now', '').strip().lower() in ('1', 'true') and not args.get('open_at', '').strip()
+
+def current_minute():
+    """
+    Minuto da semana atual no fuso dos restaurantes.
+
+    Returns:
+        int: Minuto da semana (segunda-feira 00:00 = 0)
+    """
+    zone = ZoneInfo(current_app.config['OPENING_HOURS_TIMEZONE'])
+    return minute_of_week(datetime.now(zone))
+
+def parse_open_at(args):
+    """
+    Lê os parâmetros `open_at` e `open_now`.
+
+    `open_at` aceita data e hora ISO 8601 (sem fuso, no horário local dos
+    restaurantes; com fuso, convertida) ou '<dia> HH:MM' (ex.: 'sab 20:30').
+
+    Args:
+        args: Parâmetros da query string (request.args)
+
+    Returns:
+        int: Minuto da semana consultado, ou None se nenhum filtro foi pedido
+
+    Raises:
+        OpenAtError: Se o valor de open_at não estiver em um formato aceito
+    """
+    value = args.get('open_at', '').strip()
+    if not value:
+        return current_minute() if _open_now(args) else None
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        try:
+            return parse_weekday_time(value)
+        except OperatingHoursError:
+            raise OpenAtError("open_at must be an ISO 8601 date and time or '<weekday> HH:MM'")
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(ZoneInfo(current_app.config['OPENING_HOURS_TIMEZONE']))
+    return minute_of_week(moment)
+
+def open_at_filter(minute, aggregate=False):
+    """
+    Monta o predicado "aberto no minuto da semana".
+
+    Args:
+        minute (int): Minuto da semana
+        aggregate (bool): True para contagens (IN pelo índice dos intervalos),
+                          False para páginas (EXISTS pela chave primária)
+
+    Returns:
+        ColumnElement: Condição sobre Restaurant
+    """
+    day_start = minute - minute % MINUTES_PER_DAY
+    window = (RestaurantHours.opens_at.between(day_start, minute), RestaurantHours.closes_at > minute)
+    if aggregate:
+        return Restaurant.id.in_(select(RestaurantHours.restaurant_id).where(*window))
+    return exists().where(RestaurantHours.restaurant_id == Restaurant.id, *window)
+
+def open_hours_etag(*args, **kwargs):
+    """ETag do catálogo, acrescida do minuto consultado quando open_now é usado."""
+    etag = catalog_etag()
+    if _open_now(request.args):
+        etag = f'{etag}-open-{current_minute()}'
+    return etag
+
+def backfill_opening_hours(batch_size=1000, progress=None):
+    """
+    Recompila os intervalos de funcionamento de todos os restaurantes em lotes.
+
+    Args:
+        batch_size (int): Quantidade de linhas por lote
+        progress (callable): Função opcional chamada com o total processado
+
+    Returns:
+        tuple: (linhas processadas, lista de (id, operating_hours, erro) das
+                linhas cujo horário não pôde ser interpretado)
+    """
+    last_id = 0
+    total = 0
+    unparsed = []
+    while True:
+        rows = db.session.execute(
+            select(Restaurant.id, Restaurant.operating_hours)
+            .where(Restaurant.id > last_id).order_by(Restaurant.id).limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        for row in rows:
+            try:
+                parse_operating_hours(row.operating_hours)
+            except OperatingHoursError as err:
+                unparsed.append((row.id, row.operating_hours, str(err)))
+        replace_opening_hours(db.session, [(row.id, row.operating_hours) for row in rows])
+        # Muda a ETag das listagens e libera as respostas em cache
+        bump_catalog_version(db.session)
+        db.session.commit()
+        last_id = rows[-1].id
+        total += len(rows)
+        if progress:
+            progress(total)
+    return total, unparsed
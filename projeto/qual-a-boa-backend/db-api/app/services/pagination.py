@@ -0,0 +1,141 @@
+"""
+Módulo que implementa a paginação por cursor (keyset) e a projeção de campos
+das listagens de restaurantes.
+
+As páginas são ordenadas por `id` e o cursor é o `id` do último item
+retornado: a próxima página é obtida com `WHERE id > :after LIMIT :limit`,
+cujo custo não cresce com a profundidade da página (ao contrário de OFFSET).
+
+O corpo da resposta continua sendo uma lista JSON; o cursor da próxima
+página é enviado nos cabeçalhos `X-Next-Cursor` e `Link` (rel="next") e
+fica ausente na última página.
+"""
+
+from collections import namedtuple
+
+from flask import current_app, request, url_for
+from sqlalchemy import select
+
+from app.extensions import db
+from app.models import Restaurant
+from app.services.serialization import json_response
+
+# Parâmetros de paginação já validados
+Page = namedtuple('Page', ['limit', 'after', 'fields'])
+
+class PaginationError(ValueError):
+    """Erro lançado quando os parâmetros de paginação são inválidos."""
+
+def parse_page_args(args):
+    """
+    Lê e valida os parâmetros `limit`, `after` e `fields` da requisição.
+
+    Args:
+        args: Parâmetros da query string (request.args)
+
+    Returns:
+        Page: Parâmetros de paginação
+
+    Raises:
+        PaginationError: Se algum parâmetro for inválido
+    """
+    default_limit = current_app.config['PAGINATION_DEFAULT_LIMIT']
+    max_limit = current_app.config['PAGINATION_MAX_LIMIT']
+
+    try:
+        limit = int(args.get('limit', default_limit))
+        after = int(args.get('after', 0))
+    except ValueError:
+        raise PaginationError('limit and after must be integers')
+    if limit < 1:
+        raise PaginationError('limit must be greater than zero')
+    if after < 0:
+        raise PaginationError('after must not be negative')
+
+    return Page(min(limit, max_limit), after, parse_fields(args.get('fields')))
+
+def parse_fields(value):
+    """
+    Converte o parâmetro `fields` (lista separada por vírgulas) em campos.
+    O `id` é sempre incluído, pois é a chave do cursor.
+
+    Args:
+        value (str): Valor do parâmetro `fields` ou None
+
+    Returns:
+        tuple: Campos selecionados, na ordem de Restaurant.PUBLIC_FIELDS
+
+    Raises:
+        PaginationError: Se algum campo não existir
+    """
+    if not value:
+        return Restaurant.PUBLIC_FIELDS
+    requested = {field.strip() for field in value.split(',') if field.strip()}
+    unknown = requested.difference(Restaurant.PUBLIC_FIELDS)
+    if unknown:
+        raise PaginationError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    requested.add('id')
+    return tuple(field for field in Restaurant.PUBLIC_FIELDS if field in requested)
+
+def select_fields(fields):
+    """
+    Monta um SELECT apenas com as colunas solicitadas, sem carregar objetos ORM.
+
+    Args:
+        fields (tuple): Campos retornados por `parse_fields`
+
+    Returns:
+        Select: Instrução SELECT sobre as colunas de Restaurant
+    """
+    return select(*(getattr(Restaurant, field) for field in fields))
+
+def fetch_page(statement, page):
+    """
+    Executa um SELECT aplicando o keyset da página.
+
+    Args:
+        statement (Select): SELECT sobre restaurantes, já filtrado
+        page (Page): Parâmetros de paginação
+
+    Returns:
+        tuple: (lista de linhas, cursor da próxima página ou None)
+    """
+    statement = statement.where(Restaurant.id > page.after).order_by(Restaurant.id).limit(page.limit + 1)
+    rows = db.session.execute(statement).all()
+    return split_page(rows, page.limit)
+
+def split_page(rows, limit):
+    """
+    Separa os itens da página e calcula o próximo cursor.
+    Espera receber até `limit + 1` linhas: a linha extra indica que há mais.
+
+    Args:
+        rows (list): Linhas (Row) ordenadas por id
+        limit (int): Tamanho da página
+
+    Returns:
+        tuple: (itens da página, cursor da próxima página ou None)
+    """
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, rows[-1].id
+    return rows, None
+
+def page_response(items, next_cursor):
+    """
+    Monta a resposta JSON de uma página com os cabeçalhos do cursor.
+
+    Args:
+        items (list): Linhas da página
+        next_cursor (int): Cursor da próxima página ou None
+
+    Returns:
+        tuple: (JSON response, status code)
+    """
+    response, status = json_response(items)
+    if next_cursor is not None:
+        args = request.args.to_dict()
+        args['after'] = next_cursor
+        response.headers['X-Next-Cursor'] = str(next_cursor)
+        response.headers['Link'] = f'<{url_for(request.endpoint, **request.view_args, **args)}>; rel="next"'
+    return response, status
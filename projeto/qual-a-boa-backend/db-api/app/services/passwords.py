@@ -0,0 +1,263 @@
+"""
+Módulo que executa o hashing e a verificação de senhas (bcrypt) com um
+limite de operações simultâneas.
+
+No máximo PASSWORD_POOL_WORKERS operações calculam ao mesmo tempo e outras
+PASSWORD_POOL_MAX_PENDING aguardam uma vaga; acima disso `PasswordPoolBusy`
+é lançada imediatamente, e a rota responde 503 em vez de enfileirar mais
+trabalho atrás de um pico de logins. O limite vale:
+
+- com PASSWORD_LOCK_DIR (definido pelo deploy/gunicorn_config.py), para o
+  host inteiro: cada vaga é um arquivo do diretório travado com flock, e
+  todos os workers do Gunicorn disputam os mesmos arquivos. A operação roda
+  na thread da requisição, que no worker sync é a única do processo. Uma
+  trava é liberada pelo sistema quando o processo termina, mesmo sem liberar;
+- sem ele, por processo: um pool de threads calcula os hashes (o bcrypt
+  libera o GIL) e a requisição aguarda o resultado. Serve ao servidor de
+  desenvolvimento e a workers com threads, mas não limita os processos.
+
+Com PASSWORD_POOL_WORKERS = 0 as operações rodam na própria thread da
+requisição, sem limite (comportamento anterior).
+
+O pool é criado sob demanda e recriado quando o PID muda, pois as threads
+não sobrevivem ao fork dos workers do Gunicorn (preload_app).
+"""
+
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+import bcrypt
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem vagas compartilhadas entre processos
+    fcntl = None
+
+from app.core.logger import logger
+
+class PasswordPoolBusy(Exception):
+    """Erro lançado quando o pool de hashing está saturado."""
+
+class HostSlots:
+    """
+    Vagas compartilhadas pelos processos do mesmo host. Cada vaga é um
+    arquivo travado com flock; a trava pertence ao descritor aberto, então
+    threads do mesmo processo também disputam as vagas.
+
+    Atributos:
+        paths: Arquivos das vagas
+    """
+    # Espera entre tentativas quando todas as vagas estão ocupadas
+    POLL_INTERVAL = 0.005
+
+    def __init__(self, directory, name, count):
+        os.makedirs(directory, exist_ok=True)
+        self.paths = [os.path.join(directory, f'{name}-{index}.lock') for index in range(count)]
+
+    def try_acquire(self):
+        """
+        Trava uma vaga livre, sem esperar.
+
+        Returns:
+            int: Descritor da vaga travada ou None se todas estiverem ocupadas
+        """
+        # Começa de uma vaga sorteada para espalhar a disputa
+        start = random.randrange(len(self.paths)) if self.paths else 0
+        for path in self.paths[start:] + self.paths[:start]:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                continue
+            return fd
+        return None
+
+    def acquire(self, timeout):
+        """
+        Trava uma vaga, esperando no máximo `timeout` segundos.
+
+        Args:
+            timeout (float): Tempo máximo de espera
+
+        Returns:
+            int: Descritor da vaga travada ou None se o tempo acabou
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            fd = self.try_acquire()
+            if fd is not None or time.monotonic() >= deadline:
+                return fd
+            time.sleep(self.POLL_INTERVAL)
+
+    @staticmethod
+    def release(fd):
+        # Fechar o descritor libera a trava
+        os.close(fd)
+
+class PasswordHasher:
+    """
+    Hashing e verificação de senhas com custo configurável.
+
+    Atributos:
+        rounds: Custo do bcrypt (log2 das iterações)
+        workers: Operações calculando ao mesmo tempo (0 executa na thread atual, sem limite)
+        max_pending: Operações aguardando uma vaga além das em execução
+        timeout: Tempo máximo de espera pelo resultado, em segundos
+        lock_dir: Diretório das vagas compartilhadas pelo host (None limita por processo)
+    """
+
+    def __init__(self, rounds=12, workers=2, max_pending=16, timeout=10, lock_dir=None):
+        self.configure(rounds, workers, max_pending, timeout, lock_dir)
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def configure(self, rounds, workers, max_pending, timeout, lock_dir=None):
+        self.rounds = rounds
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.lock_dir = lock_dir
+        self._slots = threading.BoundedSemaphore(workers + max_pending) if workers else None
+        self._tickets = self._running = None
+        if workers and lock_dir:
+            self._tickets = HostSlots(lock_dir, 'pending', workers + max_pending)
+            self._running = HostSlots(lock_dir, 'running', workers)
+
+    def init_app(self, app):
+        """
+        Lê PASSWORD_HASH_ROUNDS, PASSWORD_POOL_* e PASSWORD_LOCK_DIR da configuração.
+
+        Args:
+            app (Flask): Aplicação Flask
+        """
+        lock_dir = app.config.get('PASSWORD_LOCK_DIR')
+        if lock_dir and fcntl is None:
+            logger.warning("flock indisponível: limite do hashing de senhas aplicado por processo")
+            lock_dir = None
+        self.shutdown()
+        self.configure(
+            app.config.get('PASSWORD_HASH_ROUNDS', 12),
+            app.config.get('PASSWORD_POOL_WORKERS', 2),
+            app.config.get('PASSWORD_POOL_MAX_PENDING', 16),
+            app.config.get('PASSWORD_POOL_TIMEOUT', 10),
+            lock_dir,
+        )
+
+    def shutdown(self):
+        """Encerra o pool atual (um novo é criado no próximo uso)."""
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='password-hasher')
+                self._pid = os.getpid()
+            return self._executor
+
+    def run(self, function, *args):
+        """
+        Executa uma função no pool, respeitando o limite de operações.
+
+        Args:
+            function: Função a executar
+            *args: Argumentos da função
+
+        Returns:
+            Resultado da função
+
+        Raises:
+            PasswordPoolBusy: Se o pool e a fila estiverem cheios ou o
+                              resultado não ficar pronto dentro de `timeout`
+        """
+        if not self.workers:
+            return function(*args)
+        if self._running is not None:
+            return self._run_shared(function, args)
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            raise PasswordPoolBusy('Password hashing pool is saturated')
+
+        def task():
+            # Libera a vaga antes de publicar o resultado
+            try:
+                return function(*args)
+            finally:
+                slots.release()
+
+        try:
+            future = self._get_executor().submit(task)
+        except BaseException:
+            slots.release()
+            raise
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            raise PasswordPoolBusy('Password hashing timed out')
+
+    def _run_shared(self, function, args):
+        """Executa na thread atual, ocupando uma das vagas do host."""
+        ticket = self._tickets.try_acquire()
+        if ticket is None:
+            raise PasswordPoolBusy('Password hashing pool is saturated')
+        try:
+            slot = self._running.acquire(self.timeout)
+            if slot is None:
+                raise PasswordPoolBusy('Password hashing timed out')
+            try:
+                return function(*args)
+            finally:
+                HostSlots.release(slot)
+        finally:
+            HostSlots.release(ticket)
+
+    def hash(self, password):
+        """
+        Gera o hash de uma senha com o custo atual.
+
+        Args:
+            password (str): Senha em texto plano
+
+        Returns:
+            str: Hash bcrypt
+        """
+        salt = bcrypt.gensalt(rounds=self.rounds)
+        return self.run(bcrypt.hashpw, password.encode('utf-8'), salt).decode('utf-8')
+
+    def verify(self, password, password_hash):
+        """
+        Verifica uma senha contra um hash bcrypt.
+
+        Args:
+            password (str): Senha em texto plano
+            password_hash (str): Hash armazenado
+
+        Returns:
+            bool: True se a senha estiver correta
+        """
+        return self.run(bcrypt.checkpw, password.encode('utf-8'), password_hash.encode('utf-8'))
+
+    def needs_rehash(self, password_hash):
+        """
+        Indica se o hash foi gerado com um custo diferente do atual.
+
+        Args:
+            password_hash (str): Hash armazenado ($2b$<custo>$...)
+
+        Returns:
+            bool: True se o hash deve ser recalculado
+        """
+        try:
+            return int(password_hash.split('$')[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+# Instância única do hasher, configurada em create_app
+password_hasher = PasswordHasher()
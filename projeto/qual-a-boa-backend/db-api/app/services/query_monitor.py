@@ -0,0 +1,198 @@
+"""
+Módulo que acompanha as consultas SQL de cada requisição.
+
+Os eventos before/after_cursor_execute do SQLAlchemy contam e medem as
+consultas da requisição atual em `g.db_query_count` e `g.db_query_seconds`
+(também usados pelas métricas) e:
+
+    - registram as consultas mais lentas que QUERY_SLOW_MS, com os
+      parâmetros (QUERY_LOG_PARAMS, ativo só em desenvolvimento e testes) e
+      a rota. Consultas que envolvem colunas sensíveis (SENSITIVE_COLUMNS)
+      têm os parâmetros omitidos;
+    - apontam possíveis N+1: o mesmo SELECT executado QUERY_REPEAT_THRESHOLD
+      vezes ou mais na mesma requisição;
+    - verificam o orçamento de consultas declarado pelas rotas com
+      `@query_monitor.budget(n)`. Rotas acima do orçamento geram um aviso no
+      log e, com QUERY_BUDGET_ENFORCE (ativo nos testes), falham com
+      `QueryBudgetExceeded`, para que a regressão apareça na suíte de testes.
+
+O decorador deve ficar logo abaixo de `route`, para contar também as
+consultas feitas pelos outros decoradores (ETag, cache, JWT).
+"""
+
+import time
+from functools import wraps
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.logger import logger
+
+# Tamanho máximo da representação dos parâmetros no log de consultas lentas
+MAX_PARAMS_LENGTH = 500
+
+# Colunas cujos valores nunca vão para o log de consultas lentas
+SENSITIVE_COLUMNS = ('password_hash', 'email')
+REDACTED = '<redacted>'
+
+class QueryBudgetExceeded(Exception):
+    """Erro lançado quando uma rota excede o orçamento de consultas (QUERY_BUDGET_ENFORCE)."""
+
+def _redact_parameters(statement, parameters):
+    """
+    Omite os parâmetros que podem conter valores de colunas sensíveis.
+
+    Parâmetros nomeados (dict) são omitidos pelo nome; posicionais, por não
+    terem nome, são todos omitidos quando a consulta cita uma coluna sensível.
+
+    Args:
+        statement (str): SQL executado
+        parameters: Parâmetros da consulta
+
+    Returns:
+        Parâmetros com os valores sensíveis substituídos por REDACTED
+    """
+    lowered = statement.lower()
+    if not any(column in lowered for column in SENSITIVE_COLUMNS):
+        return parameters
+    if isinstance(parameters, dict):
+        return {
+            key: REDACTED if any(column in str(key).lower() for column in SENSITIVE_COLUMNS) else value
+            for key, value in parameters.items()
+        }
+    return REDACTED
+
+def _format_parameters(statement, parameters):
+    text = repr(_redact_parameters(statement, parameters))
+    if len(text) > MAX_PARAMS_LENGTH:
+        return text[:MAX_PARAMS_LENGTH] + '...'
+    return text
+
+class QueryMonitor:
+    """
+    Contagem, log de consultas lentas e orçamento de consultas por requisição.
+
+    Atributos:
+        slow_seconds: Duração a partir da qual a consulta é registrada (None desativa)
+        log_params: Inclui os parâmetros no log de consultas lentas
+        repeat_threshold: Execuções do mesmo SELECT que indicam um N+1 (0 desativa)
+        enforce: Falha as requisições acima do orçamento em vez de só avisar
+    """
+
+    def __init__(self):
+        self.slow_seconds = None
+        self.log_params = True
+        self.repeat_threshold = 0
+        self.enforce = False
+
+    def init_app(self, app):
+        """
+        Lê QUERY_* da configuração e registra os hooks e os eventos do SQLAlchemy.
+
+        Args:
+            app (Flask): Aplicação Flask
+        """
+        slow_ms = app.config.get('QUERY_SLOW_MS', 0)
+        self.slow_seconds = slow_ms / 1000 if slow_ms > 0 else None
+        self.log_params = app.config.get('QUERY_LOG_PARAMS', True)
+        self.repeat_threshold = app.config.get('QUERY_REPEAT_THRESHOLD', 0)
+        self.enforce = app.config.get('QUERY_BUDGET_ENFORCE', False)
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        for name, listener in (
+            ('before_cursor_execute', _before_cursor_execute),
+            ('after_cursor_execute', _after_cursor_execute),
+        ):
+            if not event.contains(Engine, name, listener):
+                event.listen(Engine, name, listener)
+
+    def _before_request(self):
+        state = g._get_current_object()
+        state.db_query_count = 0
+        state.db_query_seconds = 0.0
+        state.db_statements = {}
+
+    def _after_request(self, response):
+        statements = g.get('db_statements')
+        if not statements or not self.repeat_threshold:
+            return response
+        for statement, count in statements.items():
+            if count >= self.repeat_threshold and statement.lstrip().upper().startswith('SELECT'):
+                logger.warning(
+                    "Possible N+1 on %s: statement executed %s times: %s",
+                    request.endpoint, count, statement,
+                )
+        return response
+
+    def record(self, statement, parameters, elapsed):
+        """
+        Contabiliza uma consulta (chamado pelo evento after_cursor_execute).
+
+        Args:
+            statement (str): SQL executado
+            parameters: Parâmetros da consulta
+            elapsed (float): Duração, em segundos
+        """
+        endpoint = '-'
+        if has_request_context():
+            state = g._get_current_object()
+            if 'db_query_count' in state:
+                state.db_query_count += 1
+                state.db_query_seconds += elapsed
+                state.db_statements[statement] = state.db_statements.get(statement, 0) + 1
+            endpoint = request.endpoint
+
+        if self.slow_seconds is not None and elapsed >= self.slow_seconds:
+            if self.log_params:
+                logger.warning(
+                    "Slow query (%.1f ms) on %s: %s | parameters: %s",
+                    elapsed * 1000, endpoint, statement, _format_parameters(statement, parameters),
+                )
+            else:
+                logger.warning("Slow query (%.1f ms) on %s: %s", elapsed * 1000, endpoint, statement)
+
+    def budget(self, max_queries):
+        """
+        Decorador que declara o máximo de consultas SQL de uma rota.
+
+        Args:
+            max_queries (int): Consultas permitidas por requisição
+
+        Returns:
+            function: Decorador da rota
+        """
+        def decorator(f):
+            @wraps(f)
+            def decorated_function(*args, **kwargs):
+                start = g.get('db_query_count', 0)
+                response = f(*args, **kwargs)
+                used = g.get('db_query_count', 0) - start
+                if used > max_queries:
+                    self._over_budget(used, max_queries)
+                return response
+            decorated_function.query_budget = max_queries
+            return decorated_function
+        return decorator
+
+    def _over_budget(self, used, max_queries):
+        logger.warning("Query budget exceeded on %s: %s queries (budget %s).", request.endpoint, used, max_queries)
+        if self.enforce:
+            statements = '\n'.join(
+                f'  {count}x {statement}' for statement, count in g.get('db_statements', {}).items()
+            )
+            raise QueryBudgetExceeded(
+                f'{request.endpoint} executed {used} queries (budget {max_queries}):\n{statements}'
+            )
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context.query_started = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, 'query_started', None)
+    if started is not None:
+        query_monitor.record(statement, parameters, time.perf_counter() - started)
+
+# Instância única, configurada em create_app
+query_monitor = QueryMonitor()
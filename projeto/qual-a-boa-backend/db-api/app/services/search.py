@@ -0,0 +1,272 @@
+"""
+Módulo que implementa a busca de restaurantes diretamente no banco de dados.
+
+Os filtros de nome, cidade, estado e tipo são traduzidos em predicados SQL
+que reproduzem a semântica de `normalize_text` (sem acentos, sem distinção
+entre maiúsculas e minúsculas, busca por substring).
+
+Nome, cidade e tipo são comparados com as colunas persistidas
+`name_search`, `city_search` e `type_search`, já normalizadas na escrita e
+indexadas com pg_trgm no PostgreSQL. O estado (UF de duas letras) continua
+usando a expressão `normalized`:
+
+- PostgreSQL: `lower(unaccent(coluna))`, usando a extensão instalada pela
+  migração `add_unaccent_extension`.
+- SQLite: a própria `normalize_text` é registrada como função SQL em cada
+  conexão, de modo que os testes locais usam exatamente a mesma regra.
+
+O critério `open_at` (ou `open_now`) filtra os restaurantes abertos em um
+minuto da semana pelos intervalos compilados do horário de funcionamento
+(`app.services.opening_hours`).
+
+Com SEARCH_BACKEND = 'memory', os critérios de nome, cidade e tipo são
+resolvidos pelo índice de trigramas em memória (`app.services.trigram_index`)
+e apenas os ids encontrados são carregados do banco.
+
+Com fuzzy=1, nome, cidade e tipo toleram erros de digitação e o resultado é
+uma única página com os `limit` restaurantes mais parecidos, do mais para o
+menos parecido (sem cursor). No PostgreSQL a semelhança é a
+`word_similarity` do pg_trgm, filtrada pelo operador `<%`, que usa os
+índices GIN das colunas de busca; nos demais bancos (e com SEARCH_BACKEND =
+'memory') é a distância de edição calculada pelo índice de trigramas em
+memória (`TrigramIndex.fuzzy_search`).
+"""
+
+import sqlite3
+from bisect import bisect_right
+
+from sqlalchemy import String, bindparam, event, func, literal, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+from app.extensions import db
+from app.models import Restaurant
+from app.services.opening_hours import open_at_filter, parse_open_at
+from app.services.catalog_version import bump_catalog_version
+from app.services.pagination import fetch_page, select_fields, split_page
+from app.services.suggest import track_bulk_suggestions
+from app.services.trigram_index import restaurant_index, track_bulk_changes
+from app.utils.text import normalize_text
+
+# Parâmetros de busca aceitos pela rota /search
+SEARCH_FIELDS = ('name', 'city', 'state', 'type')
+
+# Rodadas da busca aproximada em memória: quando os critérios aplicados no
+# banco descartam candidatos, a rodada seguinte pede quatro vezes mais
+FUZZY_ROUNDS = 3
+
+class normalized(FunctionElement):
+    """
+    Expressão SQL equivalente a `normalize_text(coluna)`.
+    A compilação varia conforme o dialeto do banco de dados.
+    """
+    type = String()
+    name = 'normalized'
+    inherit_cache = True
+
+@compiles(normalized)
+def _compile_normalized_default(element, compiler, **kw):
+    return 'lower(%s)' % compiler.process(element.clauses, **kw)
+
+@compiles(normalized, 'postgresql')
+def _compile_normalized_postgresql(element, compiler, **kw):
+    return 'lower(unaccent(%s))' % compiler.process(element.clauses, **kw)
+
+@compiles(normalized, 'sqlite')
+def _compile_normalized_sqlite(element, compiler, **kw):
+    return 'normalize_text(%s)' % compiler.process(element.clauses, **kw)
+
+@event.listens_for(Engine, 'connect')
+def _register_sqlite_functions(dbapi_connection, connection_record):
+    """Registra `normalize_text` como função SQL em conexões SQLite."""
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        dbapi_connection.create_function('normalize_text', 1, normalize_text, deterministic=True)
+
+def parse_search_criteria(args):
+    """
+    Extrai os critérios de busca dos parâmetros da requisição.
+
+    Args:
+        args: Parâmetros da query string (request.args)
+
+    Returns:
+        dict: Critérios preenchidos, indexados pelo nome do campo, e
+              `open_at` (minuto da semana) se open_at ou open_now foi pedido
+
+    Raises:
+        OpenAtError: Se open_at for inválido
+    """
+    criteria = {}
+    for field in SEARCH_FIELDS:
+        value = args.get(field, '').strip()
+        if value:
+            criteria[field] = value
+    minute = parse_open_at(args)
+    if minute is not None:
+        criteria['open_at'] = minute
+    return criteria
+
+def wants_fuzzy(args):
+    """
+    Indica se a busca aproximada (fuzzy=1) foi pedida.
+
+    Args:
+        args: Parâmetros da query string (request.args)
+
+    Returns:
+        bool: True se nome, cidade e tipo devem tolerar erros de digitação
+    """
+    return args.get('fuzzy', '').strip().lower() in ('1', 'true')
+
+def apply_search_filters(query, criteria, aggregate=False):
+    """
+    Aplica os critérios de busca a uma query de restaurantes.
+
+    Args:
+        query: Query ou Select SQLAlchemy sobre Restaurant
+        criteria (dict): Critérios retornados por `parse_search_criteria`
+        aggregate (bool): True em contagens, que leem todas as linhas (muda
+                          apenas a forma do filtro open_at)
+
+    Returns:
+        Query: Query filtrada no banco de dados
+    """
+    for field, value in criteria.items():
+        if field == 'open_at':
+            query = query.filter(open_at_filter(value, aggregate))
+            continue
+        term = normalize_text(value)
+        query = query.filter(search_column(field).contains(term, autoescape=True))
+    return query
+
+def search_page(criteria, page, fuzzy=False):
+    """
+    Executa a busca usando o backend configurado e retorna uma página.
+
+    Args:
+        criteria (dict): Critérios retornados por `parse_search_criteria`
+        page (Page): Parâmetros de paginação
+        fuzzy (bool): Ordena por semelhança, tolerando erros de digitação
+
+    Returns:
+        tuple: (lista de linhas, cursor da próxima página ou None)
+    """
+    if fuzzy and restaurant_index.can_search(criteria):
+        return fuzzy_search_page(criteria, page)
+    statement = select_fields(page.fields)
+    if not (restaurant_index.enabled and restaurant_index.can_search(criteria)):
+        return fetch_page(apply_search_filters(statement, criteria), page)
+
+    # Backend em memória: o índice resolve nome/cidade/tipo e o banco aplica
+    # os critérios restantes apenas sobre os ids da página
+    ids = restaurant_index.search(criteria)
+    remaining = {field: value for field, value in criteria.items() if field not in restaurant_index.FIELDS}
+    start = bisect_right(ids, page.after)
+    rows = []
+    while start < len(ids) and len(rows) <= page.limit:
+        chunk = ids[start:start + page.limit + 1]
+        start += len(chunk)
+        chunk_statement = apply_search_filters(statement.where(Restaurant.id.in_(chunk)), remaining)
+        rows.extend(db.session.execute(chunk_statement.order_by(Restaurant.id)).all())
+    return split_page(rows, page.limit)
+
+def fuzzy_search_page(criteria, page):
+    """
+    Busca aproximada: os `page.limit` restaurantes mais parecidos com os
+    critérios de nome, cidade e tipo. Estado e open_at continuam exatos.
+
+    Args:
+        criteria (dict): Critérios retornados por `parse_search_criteria`
+        page (Page): Parâmetros de paginação (`after` é ignorado)
+
+    Returns:
+        tuple: (linhas da mais para a menos parecida, None)
+    """
+    statement = select_fields(page.fields)
+    fuzzy = {
+        field: normalize_text(value) for field, value in criteria.items()
+        if field in restaurant_index.FIELDS and len(normalize_text(value)) >= 3
+    }
+    remaining = {field: value for field, value in criteria.items() if field not in fuzzy}
+
+    if db.session.get_bind().dialect.name == 'postgresql' and not restaurant_index.enabled:
+        scores = []
+        for field, term in fuzzy.items():
+            column = search_column(field)
+            statement = statement.where(literal(term).op('<%')(column))
+            scores.append(func.word_similarity(term, column))
+        statement = apply_search_filters(statement, remaining)
+        # A soma ordena como a média das semelhanças
+        rank = sum(scores[1:], scores[0])
+        rows = db.session.execute(statement.order_by(rank.desc(), Restaurant.id).limit(page.limit)).all()
+        return rows, None
+
+    # Índice em memória: o banco carrega os mais parecidos e aplica os
+    # critérios restantes; se eles descartarem candidatos, pede mais
+    remaining = {field: value for field, value in remaining.items() if field not in restaurant_index.FIELDS}
+    wanted = page.limit
+    for _ in range(FUZZY_ROUNDS):
+        ids = restaurant_index.fuzzy_search(criteria, wanted)
+        rows = db.session.execute(apply_search_filters(statement.where(Restaurant.id.in_(ids)), remaining)).all()
+        if len(rows) >= page.limit or len(ids) < wanted:
+            break
+        wanted *= 4
+    position = {restaurant_id: rank for rank, restaurant_id in enumerate(ids)}
+    rows.sort(key=lambda row: position[row.id])
+    return rows[:page.limit], None
+
+def search_column(field):
+    """
+    Retorna a expressão SQL, já normalizada, usada para buscar um campo.
+
+    Args:
+        field (str): Um dos campos de SEARCH_FIELDS
+
+    Returns:
+        ColumnElement: Coluna persistida de busca ou expressão normalizada
+    """
+    if field == 'state':
+        return normalized(Restaurant.state)
+    return getattr(Restaurant, f'{field}_search')
+
+def backfill_search_columns(batch_size=1000, progress=None):
+    """
+    Recalcula as colunas de busca de todos os restaurantes em lotes.
+    Percorre a tabela por chave (id) e confirma cada lote separadamente,
+    evitando transações longas em tabelas grandes. Cada lote incrementa a
+    versão do catálogo e atualiza os índices em memória do processo.
+
+    Args:
+        batch_size (int): Quantidade de linhas por lote
+        progress (callable): Função opcional chamada com o total processado
+
+    Returns:
+        int: Quantidade de linhas atualizadas
+    """
+    columns = (Restaurant.id, Restaurant.name, Restaurant.city, Restaurant.type)
+    # UPDATE direto na tabela: as colunas derivadas não alteram a versão da linha
+    table = Restaurant.__table__
+    statement = update(table).where(table.c.id == bindparam('row_id')).values(
+        {column: bindparam(column) for column in Restaurant.SEARCH_COLUMNS}
+    )
+    last_id = 0
+    total = 0
+    while True:
+        rows = db.session.execute(
+            select(*columns).where(Restaurant.id > last_id).order_by(Restaurant.id).limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        derived = [Restaurant.search_columns(row._asdict()) for row in rows]
+        db.session.execute(statement, [{'row_id': row.id, **values} for row, values in zip(rows, derived)])
+        indexed = [(row.id, {**row._asdict(), **values}) for row, values in zip(rows, derived)]
+        track_bulk_changes(db.session, indexed)
+        track_bulk_suggestions(db.session, indexed)
+        bump_catalog_version(db.session)
+        db.session.commit()
+        last_id = rows[-1].id
+        total += len(rows)
+        if progress:
+            progress(total)
+    return total
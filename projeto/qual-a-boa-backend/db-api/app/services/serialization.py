@@ -0,0 +1,132 @@
+"""
+Módulo que implementa a serialização rápida das respostas de restaurantes.
+
+As rotas de leitura consultam tuplas de colunas (sem objetos ORM nem
+dicionários intermediários) e as convertem em JSON com um codificador de
+linha pré-compilado para cada conjunto de campos: uma função gerada que
+concatena as chaves já codificadas com os valores de cada coluna.
+
+A saída é idêntica à de `jsonify` com o provedor padrão do Flask (chaves
+ordenadas, `ensure_ascii`, separadores compactos e quebra de linha final).
+Quando o provedor está configurado para saída indentada (modo debug) ou foi
+substituído, a serialização volta a usar `current_app.json`.
+
+Com JSON_BACKEND = 'orjson' e o pacote instalado, as listas são serializadas
+pelo orjson. O JSON é equivalente, mas caracteres não ASCII são escritos em
+UTF-8 em vez de sequências `\\uXXXX`.
+"""
+
+from functools import lru_cache
+from json.encoder import encode_basestring_ascii
+
+from flask import current_app
+from flask.json.provider import DefaultJSONProvider
+
+from app.models import Restaurant
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependência opcional
+    orjson = None
+
+def _encode_string(value):
+    return 'null' if value is None else encode_basestring_ascii(value)
+
+def _encode_integer(value):
+    return 'null' if value is None else int.__repr__(value)
+
+@lru_cache(maxsize=None)
+def row_encoder(fields, separators=(',', ':')):
+    """
+    Gera o codificador JSON de linhas com os campos informados.
+
+    Args:
+        fields (tuple): Nomes das colunas, na ordem da tupla da linha
+        separators (tuple): Separadores de itens e de chaves, como em json.dumps
+
+    Returns:
+        function: Função que recebe a linha (tupla) e retorna o objeto JSON
+    """
+    item_separator, key_separator = separators
+    columns = Restaurant.__table__.c
+    namespace = {}
+    parts = []
+    # As chaves seguem a ordem alfabética, como no sort_keys do Flask
+    for field in sorted(fields):
+        encoder = _encode_integer if columns[field].type.python_type is int else _encode_string
+        namespace[f'_encode_{field}'] = encoder
+        key = encode_basestring_ascii(field) + key_separator
+        parts.append(f'{key!r} + _encode_{field}(row[{fields.index(field)}])')
+    source = f"def encode(row):\n    return '{{' + {f' + {item_separator!r} + '.join(parts)} + '}}'\n"
+    exec(source, namespace)
+    return namespace['encode']
+
+def _default_provider():
+    """Indica se o provedor JSON é o padrão, com chaves ordenadas e ASCII."""
+    provider = current_app.json
+    return type(provider) is DefaultJSONProvider and provider.sort_keys and provider.ensure_ascii
+
+def fast_path_enabled():
+    """Indica se a saída de `jsonify` pode ser reproduzida pelo codificador de linhas."""
+    provider = current_app.json
+    indented = (provider.compact is None and current_app.debug) or provider.compact is False
+    return _default_provider() and not indented
+
+def use_orjson():
+    """Indica se o orjson está instalado e habilitado em JSON_BACKEND."""
+    return orjson is not None and current_app.config.get('JSON_BACKEND') == 'orjson'
+
+def row_serializer(fields, separators=(',', ':')):
+    """
+    Escolhe a função que serializa cada linha como objeto JSON.
+
+    Args:
+        fields (tuple): Nomes das colunas, na ordem da tupla da linha
+        separators (tuple): Separadores de itens e de chaves, como em json.dumps
+
+    Returns:
+        function: Função que recebe a linha e retorna uma string JSON
+    """
+    if use_orjson():
+        return lambda row: orjson.dumps(dict(zip(fields, row)), option=orjson.OPT_SORT_KEYS).decode()
+    if _default_provider():
+        return row_encoder(fields, separators)
+    dumps = current_app.json.dumps
+    return lambda row: dumps(dict(zip(fields, row)), separators=separators)
+
+def encode_rows(rows):
+    """
+    Serializa linhas de um SELECT como lista JSON, no formato de `jsonify`.
+
+    Args:
+        rows (list): Linhas (Row) com campos de Restaurant
+
+    Returns:
+        str ou bytes: Lista JSON, sem a quebra de linha final
+    """
+    if not rows:
+        return '[]'
+    fields = rows[0]._fields
+    if use_orjson():
+        return orjson.dumps([dict(zip(fields, row)) for row in rows], option=orjson.OPT_SORT_KEYS)
+    return '[' + ','.join(map(row_encoder(fields), rows)) + ']'
+
+def json_response(data, status=200):
+    """
+    Monta a resposta JSON de uma lista de linhas ou de uma única linha.
+
+    Args:
+        data: Lista de linhas (Row) ou uma linha
+        status (int): Código de status HTTP
+
+    Returns:
+        tuple: (Response com o corpo já serializado, status code)
+    """
+    many = isinstance(data, list)
+    if not (use_orjson() or fast_path_enabled()):
+        obj = [row._asdict() for row in data] if many else data._asdict()
+        return current_app.json.response(obj), status
+
+    body = encode_rows(data) if many else row_serializer(data._fields)(data)
+    body += b'\n' if isinstance(body, bytes) else '\n'
+    return current_app.response_class(body, mimetype=current_app.json.mimetype), status
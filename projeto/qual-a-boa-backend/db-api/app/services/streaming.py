@@ -0,0 +1,78 @@
+"""
+Módulo que implementa o modo de resposta em streaming das listagens.
+
+Usado por clientes que precisam do catálogo completo (cache offline do
+frontend, sincronização noturna). As linhas são lidas com um cursor do lado
+do servidor (`yield_per`) e enviadas ao socket em blocos assim que são
+produzidas, de modo que o consumo de memória por requisição não depende do
+tamanho da tabela.
+
+Formatos:
+    - `Accept: application/x-ndjson`: um objeto JSON por linha (NDJSON)
+    - `?stream=1`: uma lista JSON enviada em blocos (chunked)
+    - `?stream=ndjson`: NDJSON, para clientes que não controlam o Accept
+"""
+
+from flask import Response, current_app, stream_with_context
+
+from app.extensions import db
+from app.models import Restaurant
+from app.services.serialization import row_serializer
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+# Separadores padrão do json.dumps, mantidos no formato das linhas em streaming
+STREAM_SEPARATORS = (', ', ': ')
+
+def stream_format(request):
+    """
+    Identifica se a requisição pediu o modo streaming e em qual formato.
+
+    Args:
+        request: Requisição Flask atual
+
+    Returns:
+        str: 'ndjson', 'json' ou None se a resposta não deve ser em streaming
+    """
+    # Verifica o tipo exato, pois `*/*` também "aceita" NDJSON
+    if any(mimetype == NDJSON_MIMETYPE and quality > 0 for mimetype, quality in request.accept_mimetypes):
+        return 'ndjson'
+    stream = request.args.get('stream', '').lower()
+    if stream == 'ndjson':
+        return 'ndjson'
+    if stream in ('1', 'true'):
+        return 'json'
+    return None
+
+def stream_response(statement, fmt):
+    """
+    Cria uma resposta que envia as linhas de um SELECT em streaming.
+
+    Args:
+        statement (Select): SELECT sobre as colunas de Restaurant
+        fmt (str): 'ndjson' ou 'json'
+
+    Returns:
+        Response: Resposta Flask com corpo gerado sob demanda
+    """
+    batch_size = current_app.config['STREAM_BATCH_SIZE']
+    statement = statement.order_by(Restaurant.id).execution_options(yield_per=batch_size)
+
+    def generate():
+        result = db.session.execute(statement)
+        encode = row_serializer(tuple(result.keys()), STREAM_SEPARATORS)
+        partitions = result.partitions()
+        if fmt == 'ndjson':
+            for rows in partitions:
+                yield ''.join(encode(row) + '\n' for row in rows)
+            return
+
+        yield '['
+        separator = ''
+        for rows in partitions:
+            yield separator + ','.join(map(encode, rows))
+            separator = ','
+        yield ']'
+
+    mimetype = NDJSON_MIMETYPE if fmt == 'ndjson' else 'application/json'
+    return Response(stream_with_context(generate()), mimetype=mimetype)
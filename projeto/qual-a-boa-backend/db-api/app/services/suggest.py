@@ -0,0 +1,369 @@
+"""
+Módulo que implementa as sugestões por prefixo (autocomplete) de nomes e
+cidades de restaurantes.
+
+Cada worker mantém, por campo, a lista ordenada dos valores normalizados
+distintos (`normalize_text`) e a quantidade de restaurantes de cada valor.
+Os valores que começam com um prefixo formam um trecho contíguo da lista,
+encontrado com `bisect`; as sugestões são os valores mais frequentes do
+trecho. Para prefixos curtos, cujo trecho é grande, os mais frequentes são
+memorizados, e cada escrita apenas reposiciona o valor alterado nas listas
+memorizadas dos seus prefixos.
+
+Como o índice de trigramas, a estrutura é construída no primeiro uso e
+depois mantida pelos eventos de sessão do SQLAlchemy (alterações aplicadas
+após o commit), sem consultar o banco a cada requisição. Escritas feitas por
+outros processos são detectadas pela versão do catálogo, lida no máximo uma
+vez a cada INDEX_SYNC_INTERVAL segundos (`CatalogSync`), e causam uma
+reconstrução.
+"""
+
+import heapq
+import threading
+from bisect import bisect_left, insort
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from app.models import Restaurant
+from app.services.catalog_version import CatalogSync, current_catalog_version
+from app.utils.text import normalize_text
+
+# Quantidade padrão e máxima de sugestões
+DEFAULT_SUGGEST_LIMIT = 10
+MAX_SUGGEST_LIMIT = 50
+
+# Trechos maiores que isso têm os mais frequentes memorizados por prefixo
+SCAN_LIMIT = 256
+
+# Acima dessa quantidade de valores novos, a lista é reordenada de uma vez
+# em vez de inserir um a um
+RESORT_THRESHOLD = 64
+
+# Chave usada em session.info para acumular as alterações até o commit
+_PENDING_KEY = 'suggest_index_changes'
+
+class SuggestError(ValueError):
+    """Erro lançado quando os parâmetros das sugestões são inválidos."""
+
+def parse_suggest_args(args):
+    """
+    Lê e valida os parâmetros `q`, `field` e `limit`.
+
+    Args:
+        args: Parâmetros da query string (request.args)
+
+    Returns:
+        tuple: (campo, prefixo normalizado, limite)
+
+    Raises:
+        SuggestError: Se algum parâmetro estiver ausente ou for inválido
+    """
+    field = args.get('field', 'name')
+    if field not in SuggestIndex.FIELDS:
+        raise SuggestError(f"field must be one of: {', '.join(SuggestIndex.FIELDS)}")
+    prefix = normalize_text(args.get('q', '')).strip()
+    if not prefix:
+        raise SuggestError('q is required')
+    try:
+        limit = int(args.get('limit', DEFAULT_SUGGEST_LIMIT))
+    except ValueError:
+        raise SuggestError('limit must be an integer')
+    if limit < 1:
+        raise SuggestError('limit must be greater than zero')
+    return field, prefix, min(limit, MAX_SUGGEST_LIMIT)
+
+class SuggestIndex:
+    """
+    Valores distintos de nome e cidade ordenados para busca por prefixo.
+
+    Atributos:
+        FIELDS: Campos atendidos e as colunas (original, normalizada) de cada um
+        catalog: Versão do catálogo refletida pela estrutura
+    """
+    FIELDS = {
+        'name': ('name', 'name_search'),
+        'city': ('city', 'city_search'),
+    }
+
+    def __init__(self):
+        self.catalog = CatalogSync()
+        self._built = False
+        self._lock = threading.RLock()
+        self._clear()
+
+    def _clear(self):
+        # Por campo: id -> (valor normalizado, valor original) e, por valor
+        # normalizado, a contagem e as grafias originais
+        self._entries = {field: {} for field in self.FIELDS}
+        self._counts = {field: {} for field in self.FIELDS}
+        self._labels = {field: {} for field in self.FIELDS}
+        self._keys = {field: [] for field in self.FIELDS}
+        self._top = {field: {} for field in self.FIELDS}
+
+    def init_app(self, app):
+        """
+        Lê o intervalo de sincronização com o banco (INDEX_SYNC_INTERVAL).
+
+        Args:
+            app (Flask): Aplicação Flask
+        """
+        self.catalog.interval = app.config.get('INDEX_SYNC_INTERVAL', 2)
+
+    def reset(self):
+        """
+        Descarta a estrutura; ela é reconstruída no próximo uso.
+        Chamado em cada worker após o fork (ver app/services/workers.py).
+        """
+        self._lock = threading.RLock()
+        self._built = False
+        self.catalog.reset()
+        self._clear()
+
+    def ensure_built(self):
+        """
+        Constrói a estrutura a partir do banco na primeira utilização e a
+        reconstrói quando outro processo alterou o catálogo.
+        """
+        version = self.catalog.changed_version() if self._built else None
+        if version is not None or not self._built:
+            with self._lock:
+                if version is not None or not self._built:
+                    self.rebuild(version=version)
+
+    def rebuild(self, batch_size=10000, version=None):
+        """
+        Reconstrói a estrutura inteira a partir do banco de dados.
+
+        Args:
+            batch_size (int): Quantidade de linhas lidas por vez do cursor
+            version (int): Versão do catálogo já lida (None para ler agora)
+
+        Returns:
+            int: Quantidade de restaurantes lidos
+        """
+        columns = [Restaurant.id] + [getattr(Restaurant, column) for pair in self.FIELDS.values() for column in pair]
+        with self._lock:
+            # Lida antes dos dados: uma escrita no meio só causa outra reconstrução
+            if version is None:
+                version = current_catalog_version()
+            self._clear()
+            total = 0
+            result = db.session.execute(select(*columns).execution_options(yield_per=batch_size))
+            for row in result:
+                self._add(row[0], self._row_values(row[1:]))
+                total += 1
+            for field in self.FIELDS:
+                self._keys[field] = sorted(self._counts[field])
+            self.catalog.built(version)
+            self._built = True
+        return total
+
+    def _row_values(self, row):
+        values = {}
+        for index, field in enumerate(self.FIELDS):
+            label, normalized = row[2 * index], row[2 * index + 1]
+            values[field] = (normalized or normalize_text(label), label)
+        return values
+
+    def _add(self, restaurant_id, values):
+        for field, (normalized, label) in values.items():
+            if not normalized:
+                continue
+            self._entries[field][restaurant_id] = (normalized, label)
+            counts = self._counts[field]
+            counts[normalized] = counts.get(normalized, 0) + 1
+            labels = self._labels[field].setdefault(normalized, {})
+            labels[label] = labels.get(label, 0) + 1
+            self._update_top(field, normalized, increased=True)
+
+    def _remove(self, restaurant_id):
+        for field in self.FIELDS:
+            entry = self._entries[field].pop(restaurant_id, None)
+            if entry is None:
+                continue
+            normalized, label = entry
+            counts = self._counts[field]
+            counts[normalized] -= 1
+            labels = self._labels[field][normalized]
+            labels[label] -= 1
+            if not labels[label]:
+                del labels[label]
+            if not counts[normalized]:
+                del counts[normalized], self._labels[field][normalized]
+                keys = self._keys[field]
+                position = bisect_left(keys, normalized)
+                if position < len(keys) and keys[position] == normalized:
+                    del keys[position]
+            self._update_top(field, normalized, increased=False)
+
+    def _insert_keys(self, field, new_keys):
+        keys = self._keys[field]
+        if len(new_keys) > RESORT_THRESHOLD:
+            # Timsort aproveita os trechos já ordenados: O(n) na prática
+            keys.extend(new_keys)
+            keys.sort()
+        else:
+            for key in new_keys:
+                insort(keys, key)
+
+    def _rank(self, field, key):
+        # Mais frequentes primeiro; empate em ordem alfabética
+        return (-self._counts[field].get(key, 0), key)
+
+    def _update_top(self, field, key, increased):
+        """
+        Ajusta os mais frequentes memorizados dos prefixos de um valor cuja
+        contagem mudou, sem percorrer o trecho de novo. Uma lista com menos
+        de MAX_SUGGEST_LIMIT valores contém o trecho inteiro.
+        """
+        top = self._top[field]
+        if not top:
+            return
+        rank = self._rank(field, key)
+        for length in range(1, len(key) + 1):
+            prefix = key[:length]
+            best = top.get(prefix)
+            if best is None:
+                continue
+            full = len(best) >= MAX_SUGGEST_LIMIT
+            if key in best:
+                best.remove(key)
+                dropped = rank[0] == 0 or (not increased and best and rank >= self._rank(field, best[-1]))
+                if dropped and full:
+                    # O valor saiu do topo: outro valor do trecho pode ter entrado
+                    del top[prefix]
+                    continue
+                if rank[0] == 0:
+                    continue
+            elif rank[0] == 0:
+                continue
+            elif full:
+                if rank >= self._rank(field, best[-1]):
+                    continue
+                best.pop()
+            ranks = [self._rank(field, other) for other in best]
+            best.insert(bisect_left(ranks, rank), key)
+
+    def apply(self, changes):
+        """
+        Aplica alterações confirmadas (id -> valores ou None para remoção).
+
+        Args:
+            changes (dict): Valores (normalizado, original) por campo e restaurante
+        """
+        with self._lock:
+            new_keys = {field: [] for field in self.FIELDS}
+            for restaurant_id, values in changes.items():
+                self._remove(restaurant_id)
+                if values is None:
+                    continue
+                for field, (normalized, _) in values.items():
+                    if normalized and normalized not in self._counts[field]:
+                        new_keys[field].append(normalized)
+                self._add(restaurant_id, values)
+            for field, keys in new_keys.items():
+                if keys:
+                    self._insert_keys(field, keys)
+
+    def suggest(self, field, prefix, limit=DEFAULT_SUGGEST_LIMIT):
+        """
+        Retorna os valores mais frequentes que começam com o prefixo.
+
+        Args:
+            field (str): 'name' ou 'city'
+            prefix (str): Prefixo já normalizado
+            limit (int): Quantidade máxima de sugestões (até MAX_SUGGEST_LIMIT)
+
+        Returns:
+            list: Dicionários {'value', 'count'}, do mais para o menos frequente
+        """
+        self.ensure_built()
+        with self._lock:
+            top = self._top[field].get(prefix)
+            if top is None:
+                keys = self._keys[field]
+                start = bisect_left(keys, prefix)
+                end = bisect_left(keys, prefix + '\uffff', start)
+                counts = self._counts[field]
+                top = heapq.nsmallest(
+                    MAX_SUGGEST_LIMIT, (keys[i] for i in range(start, end)),
+                    key=lambda key: (-counts[key], key),
+                )
+                if end - start > SCAN_LIMIT:
+                    self._top[field][prefix] = top
+            counts = self._counts[field]
+            labels = self._labels[field]
+            return [
+                {'value': max(labels[key], key=labels[key].get), 'count': counts[key]}
+                for key in top[:limit]
+            ]
+
+    def memory_usage(self):
+        """
+        Resume o tamanho da estrutura.
+
+        Returns:
+            dict: Valores distintos e prefixos memorizados por campo
+        """
+        with self._lock:
+            return {
+                field: {'values': len(self._keys[field]), 'cached_prefixes': len(self._top[field])}
+                for field in self.FIELDS
+            }
+
+# Instância única, compartilhada pelas rotas do processo
+suggest_index = SuggestIndex()
+
+def _index_values(restaurant):
+    return {
+        field: (getattr(restaurant, normalized) or normalize_text(getattr(restaurant, label)), getattr(restaurant, label))
+        for field, (label, normalized) in SuggestIndex.FIELDS.items()
+    }
+
+def track_bulk_suggestions(session, rows):
+    """
+    Registra as linhas gravadas por INSERT/UPDATE em lote, que não passam
+    pelos eventos de flush. Aplicadas somente após o commit.
+
+    Args:
+        session: Sessão SQLAlchemy da transação
+        rows: Pares (id, dados) com os campos originais e normalizados
+    """
+    if not suggest_index._built:
+        return
+    pending = session.info.setdefault(_PENDING_KEY, {})
+    for restaurant_id, data in rows:
+        pending[restaurant_id] = {
+            field: (data[normalized], data[label]) for field, (label, normalized) in SuggestIndex.FIELDS.items()
+        }
+
+@event.listens_for(Session, 'after_flush')
+def _collect_changes(session, flush_context):
+    """Guarda as alterações de restaurantes até o commit da transação."""
+    if not suggest_index._built:
+        return
+    pending = session.info.setdefault(_PENDING_KEY, {})
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Restaurant):
+            pending[obj.id] = _index_values(obj)
+    for obj in session.deleted:
+        if isinstance(obj, Restaurant):
+            pending[obj.id] = None
+
+@event.listens_for(Session, 'after_commit')
+def _apply_changes(session):
+    """Aplica as alterações confirmadas e avança a versão da estrutura."""
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not suggest_index._built:
+        return
+    with suggest_index._lock:
+        if pending:
+            suggest_index.apply(pending)
+        suggest_index.catalog.committed(session)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_changes(session):
+    """Descarta as alterações de uma transação desfeita."""
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,441 @@
+"""
+Módulo que implementa um índice invertido de trigramas em memória para a
+busca de restaurantes.
+
+O índice é opcional (SEARCH_BACKEND = 'memory') e serve para ambientes onde
+não é possível contar com extensões do PostgreSQL. Ele guarda, por processo,
+os valores normalizados de nome, cidade e tipo e, para cada trigrama, o
+conjunto de ids que o contém. Uma busca por substring intersecta as listas
+de ids dos trigramas do termo e confirma os candidatos com `in`.
+
+A busca aproximada (`fuzzy_search`, parâmetro fuzzy=1 da rota /search) usa
+as mesmas listas como filtro de candidatos: conta quantos trigramas do termo
+cada restaurante tem e só calcula a distância de edição (`text_similarity`)
+dos que têm ao menos um terço deles, dos que têm mais para os que têm menos.
+Os `limit` mais parecidos ficam em um heap, e a avaliação para assim que a
+semelhança máxima possível com menos trigramas em comum não supera o pior
+deles. Fora do PostgreSQL, o índice é usado por essa busca mesmo com
+SEARCH_BACKEND = 'database', sendo construído na primeira busca aproximada.
+
+O índice é construído no primeiro uso e depois mantido de forma incremental
+pelos eventos de sessão do SQLAlchemy: as alterações de cada flush são
+guardadas na sessão e aplicadas somente após o commit.
+
+Cada worker mantém o seu próprio índice. Escritas feitas por outros
+processos (outro worker, `/restaurants/bulk`, `manage_restaurants.py
+import`) são detectadas pela versão do catálogo, lida no máximo uma vez a
+cada INDEX_SYNC_INTERVAL segundos (`CatalogSync`): quando ela mudou sem
+passar por este processo, o índice é reconstruído.
+"""
+
+import heapq
+import math
+import sys
+import threading
+from collections import Counter
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from app.models import Restaurant
+from app.services.catalog_version import CatalogSync, current_catalog_version
+from app.utils.text import normalize_text, text_similarity
+
+# Chave usada em session.info para acumular as alterações até o commit
+_PENDING_KEY = 'trigram_index_changes'
+
+# Semelhança mínima da busca aproximada (o mesmo padrão de
+# pg_trgm.word_similarity_threshold no PostgreSQL)
+FUZZY_MIN_SIMILARITY = 0.6
+
+# Fração mínima dos trigramas do termo que um candidato deve conter
+FUZZY_MIN_SHARED = 1 / 3
+
+def trigrams(text):
+    """
+    Gera o conjunto de trigramas de um texto já normalizado.
+
+    Args:
+        text (str): Texto normalizado
+
+    Returns:
+        set: Trigramas do texto
+    """
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class TrigramIndex:
+    """
+    Índice invertido de trigramas sobre os campos normalizados de Restaurant.
+
+    Atributos:
+        FIELDS: Campos indexados e as colunas normalizadas correspondentes
+        enabled: Indica se o índice está ativo para a aplicação
+        catalog: Versão do catálogo refletida pelo índice
+    """
+    FIELDS = {
+        'name': 'name_search',
+        'city': 'city_search',
+        'type': 'type_search',
+    }
+
+    def __init__(self):
+        self.enabled = False
+        self.catalog = CatalogSync()
+        self._built = False
+        self._lock = threading.RLock()
+        self._clear()
+
+    def _clear(self):
+        self._values = {field: {} for field in self.FIELDS}
+        self._postings = {field: {} for field in self.FIELDS}
+
+    def init_app(self, app):
+        """
+        Ativa o índice conforme a configuração SEARCH_BACKEND da aplicação e
+        lê o intervalo de sincronização com o banco (INDEX_SYNC_INTERVAL).
+
+        Args:
+            app (Flask): Aplicação Flask
+        """
+        self.enabled = app.config.get('SEARCH_BACKEND') == 'memory'
+        self.catalog.interval = app.config.get('INDEX_SYNC_INTERVAL', 2)
+
+    def reset(self):
+        """
+        Descarta o índice; ele é reconstruído no próximo uso.
+
+        Chamado em cada worker após o fork: o índice herdado do processo
+        mestre pode estar desatualizado (workers reciclados por max_requests
+        nascem de uma cópia antiga), e a trava pode ter sido copiada presa.
+        """
+        self._lock = threading.RLock()
+        self._built = False
+        self.catalog.reset()
+        self._clear()
+
+    def ensure_built(self):
+        """
+        Constrói o índice a partir do banco na primeira utilização e o
+        reconstrói quando outro processo alterou o catálogo.
+        """
+        version = self.catalog.changed_version() if self._built else None
+        if version is not None or not self._built:
+            with self._lock:
+                if version is not None or not self._built:
+                    self.rebuild(version=version)
+
+    def rebuild(self, batch_size=10000, version=None):
+        """
+        Reconstrói o índice inteiro a partir do banco de dados.
+
+        Args:
+            batch_size (int): Quantidade de linhas lidas por vez do cursor
+            version (int): Versão do catálogo já lida (None para ler agora)
+
+        Returns:
+            int: Quantidade de restaurantes indexados
+        """
+        columns = [Restaurant.id] + [getattr(Restaurant, c) for c in self.FIELDS.values()]
+        with self._lock:
+            # Lida antes dos dados: uma escrita no meio só causa outra reconstrução
+            if version is None:
+                version = current_catalog_version()
+            self._clear()
+            total = 0
+            result = db.session.execute(select(*columns).execution_options(yield_per=batch_size))
+            for row in result:
+                self._add(row[0], dict(zip(self.FIELDS, row[1:])))
+                total += 1
+            self.catalog.built(version)
+            self._built = True
+        return total
+
+    def _add(self, restaurant_id, values):
+        for field, value in values.items():
+            self._values[field][restaurant_id] = value
+            postings = self._postings[field]
+            for trigram in trigrams(value):
+                ids = postings.get(trigram)
+                if ids is None:
+                    postings[trigram] = {restaurant_id}
+                else:
+                    ids.add(restaurant_id)
+
+    def _remove(self, restaurant_id):
+        for field in self.FIELDS:
+            value = self._values[field].pop(restaurant_id, None)
+            if value is None:
+                continue
+            postings = self._postings[field]
+            for trigram in trigrams(value):
+                ids = postings.get(trigram)
+                if ids is not None:
+                    ids.discard(restaurant_id)
+                    if not ids:
+                        del postings[trigram]
+
+    def upsert(self, restaurant_id, values):
+        """
+        Insere ou atualiza um restaurante no índice.
+
+        Args:
+            restaurant_id (int): ID do restaurante
+            values (dict): Valores normalizados indexados pelo nome do campo
+        """
+        with self._lock:
+            self._remove(restaurant_id)
+            self._add(restaurant_id, values)
+
+    def remove(self, restaurant_id):
+        """
+        Remove um restaurante do índice.
+
+        Args:
+            restaurant_id (int): ID do restaurante
+        """
+        with self._lock:
+            self._remove(restaurant_id)
+
+    def can_search(self, criteria):
+        """
+        Indica se o índice consegue responder a algum dos critérios.
+        Termos com menos de três caracteres não geram trigramas.
+
+        Args:
+            criteria (dict): Critérios de busca
+
+        Returns:
+            bool: True se ao menos um critério pode ser resolvido pelo índice
+        """
+        return any(
+            field in self.FIELDS and len(normalize_text(value)) >= 3
+            for field, value in criteria.items()
+        )
+
+    def search(self, criteria):
+        """
+        Busca os ids que atendem aos critérios indexáveis.
+        Critérios não indexados (como o estado) devem ser aplicados depois.
+
+        Args:
+            criteria (dict): Critérios de busca
+
+        Returns:
+            list: IDs encontrados, em ordem crescente
+        """
+        self.ensure_built()
+        terms = [
+            (field, normalize_text(value)) for field, value in criteria.items()
+            if field in self.FIELDS
+        ]
+        with self._lock:
+            # O termo mais seletivo gera os candidatos; os demais apenas os confirmam
+            terms.sort(key=lambda term: self._estimate(*term))
+            result = None
+            for field, term in terms:
+                values = self._values[field]
+                if result is None:
+                    candidates = self._candidates(field, term) if len(term) >= 3 else values.keys()
+                else:
+                    candidates = result
+                result = {rid for rid in candidates if term in values.get(rid, '')}
+                if not result:
+                    return []
+        return sorted(result) if result else []
+
+    def fuzzy_search(self, criteria, limit):
+        """
+        Busca aproximada: os restaurantes mais parecidos com os critérios
+        indexáveis, tolerando erros de digitação. Termos com menos de três
+        caracteres não geram trigramas e continuam exigindo a substring.
+
+        Args:
+            criteria (dict): Critérios de busca
+            limit (int): Quantidade máxima de ids retornados
+
+        Returns:
+            list: IDs da maior para a menor semelhança média (empate: menor id)
+        """
+        self.ensure_built()
+        terms = [
+            (field, normalize_text(value)) for field, value in criteria.items()
+            if field in self.FIELDS
+        ]
+        fuzzy = [(field, term) for field, term in terms if len(term) >= 3]
+        exact = [(field, term) for field, term in terms if len(term) < 3]
+        if not fuzzy:
+            return self.search(criteria)[:limit]
+        with self._lock:
+            # O termo com menos ocorrências de trigramas gera os candidatos
+            fuzzy.sort(key=lambda term: sum(
+                len(self._postings[term[0]].get(trigram, ())) for trigram in trigrams(term[1])
+            ))
+            field, term = fuzzy[0]
+            grams = trigrams(term)
+            shared = Counter()
+            for trigram in grams:
+                shared.update(self._postings[field].get(trigram, ()))
+            minimum = math.ceil(len(grams) * FUZZY_MIN_SHARED)
+            buckets = {}
+            for restaurant_id, count in shared.items():
+                if count >= minimum:
+                    buckets.setdefault(count, []).append(restaurant_id)
+
+            ordered = [(count, buckets[count]) for count in sorted(buckets, reverse=True)]
+            # Espaços a mais ou a menos só são considerados se a comparação
+            # com a mesma quantidade de palavras não completar o resultado
+            heap = self._fuzzy_rank(ordered, grams, fuzzy, exact, limit, spacing=False)
+            if len(heap) < limit:
+                heap = self._fuzzy_rank(ordered, grams, fuzzy, exact, limit, spacing=True)
+        return [-restaurant_id for _, restaurant_id in sorted(heap, reverse=True)]
+
+    def _fuzzy_rank(self, ordered, grams, fuzzy, exact, limit, spacing):
+        """Avalia os candidatos agrupados por trigramas em comum e mantém os melhores em um heap."""
+        term = fuzzy[0][1]
+        # Semelhanças já calculadas por combinação de valores e, em cada
+        # campo, por trecho de palavras. Os limites só crescem durante a
+        # busca: um 0.0 guardado continua valendo
+        scores = {}
+        windows = {field: {} for field, _ in fuzzy}
+        columns = [self._values[field] for field, _ in fuzzy + exact]
+        heap = []
+        for count, ids in ordered:
+            # Cada edição desfaz no máximo três trigramas do termo: com
+            # `count` em comum, a distância é ao menos ceil(faltantes / 3)
+            distance = math.ceil((len(grams) - count) / 3)
+            bound = (len(term) / (len(term) + distance) + len(fuzzy) - 1) / len(fuzzy)
+            if len(heap) == limit and bound < heap[0][0]:
+                break
+            # Em ordem de id: quando nem a semelhança máxima com este id
+            # entra no heap, os ids seguintes também não entram. Ordenado só
+            # quando alcançado (na segunda passada já está em ordem)
+            ids.sort()
+            for restaurant_id in ids:
+                if len(heap) == limit and (bound, -restaurant_id) < heap[0]:
+                    break
+                values = tuple(column.get(restaurant_id, '') for column in columns)
+                score = scores.get(values)
+                if score is None:
+                    # Com o heap cheio, só interessa quem alcança o pior dele: a
+                    # semelhança mínima maior encurta o cálculo da distância
+                    worst = heap[0][0] if len(heap) == limit else 0.0
+                    threshold = max(FUZZY_MIN_SIMILARITY, len(fuzzy) * worst - len(fuzzy) + 1)
+                    score = scores[values] = self._fuzzy_score(values, fuzzy, exact, windows, threshold, spacing)
+                if not score:
+                    continue
+                item = (score, -restaurant_id)
+                if len(heap) < limit:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+        return heap
+
+    @staticmethod
+    def _fuzzy_score(values, fuzzy, exact, windows, threshold, spacing):
+        for (field, term), value in zip(exact, values[len(fuzzy):]):
+            if term not in value:
+                return 0.0
+        total = 0.0
+        for (field, term), value in zip(fuzzy, values):
+            score = text_similarity(term, value, threshold, windows[field], spacing)
+            if not score:
+                return 0.0
+            total += score
+        return total / len(fuzzy)
+
+    def _estimate(self, field, term):
+        if len(term) < 3:
+            return float('inf')
+        postings = self._postings[field]
+        return min(len(postings.get(trigram, ())) for trigram in trigrams(term))
+
+    def _candidates(self, field, term):
+        postings = self._postings[field]
+        lists = []
+        for trigram in trigrams(term):
+            ids = postings.get(trigram)
+            if not ids:
+                return set()
+            lists.append(ids)
+        lists.sort(key=len)
+        return lists[0].intersection(*lists[1:])
+
+    def memory_usage(self):
+        """
+        Estima o consumo de memória do índice com sys.getsizeof.
+
+        Returns:
+            dict: Estatísticas por campo e total aproximado em bytes
+        """
+        with self._lock:
+            report = {'fields': {}, 'total_bytes': 0}
+            for field in self.FIELDS:
+                values = self._values[field]
+                postings = self._postings[field]
+                values_bytes = sys.getsizeof(values) + sum(sys.getsizeof(v) for v in values.values())
+                postings_bytes = sys.getsizeof(postings) + sum(
+                    sys.getsizeof(trigram) + sys.getsizeof(ids) for trigram, ids in postings.items()
+                )
+                report['fields'][field] = {
+                    'documents': len(values),
+                    'trigrams': len(postings),
+                    'postings': sum(len(ids) for ids in postings.values()),
+                    'values_bytes': values_bytes,
+                    'postings_bytes': postings_bytes,
+                }
+                report['total_bytes'] += values_bytes + postings_bytes
+            return report
+
+# Instância única do índice, compartilhada pelas rotas do processo
+restaurant_index = TrigramIndex()
+
+def _index_values(restaurant):
+    return {field: getattr(restaurant, column) or '' for field, column in TrigramIndex.FIELDS.items()}
+
+def track_bulk_changes(session, rows):
+    """
+    Registra no índice as linhas gravadas por INSERT/UPDATE em lote, que não
+    passam pelos eventos de flush. Aplicadas somente após o commit.
+
+    Args:
+        session: Sessão SQLAlchemy da transação
+        rows: Pares (id, dados) com as colunas normalizadas de busca
+    """
+    if not (restaurant_index.enabled or restaurant_index._built):
+        return
+    pending = session.info.setdefault(_PENDING_KEY, {})
+    for restaurant_id, data in rows:
+        pending[restaurant_id] = {field: data[column] for field, column in TrigramIndex.FIELDS.items()}
+
+@event.listens_for(Session, 'after_flush')
+def _collect_changes(session, flush_context):
+    """Guarda as alterações de restaurantes até o commit da transação."""
+    if not (restaurant_index.enabled or restaurant_index._built):
+        return
+    pending = session.info.setdefault(_PENDING_KEY, {})
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Restaurant):
+            pending[obj.id] = _index_values(obj)
+    for obj in session.deleted:
+        if isinstance(obj, Restaurant):
+            pending[obj.id] = None
+
+@event.listens_for(Session, 'after_commit')
+def _apply_changes(session):
+    """Aplica ao índice as alterações confirmadas e avança a sua versão."""
+    pending = session.info.pop(_PENDING_KEY, None) or {}
+    if not restaurant_index._built:
+        return
+    with restaurant_index._lock:
+        for restaurant_id, values in pending.items():
+            if values is None:
+                restaurant_index.remove(restaurant_id)
+            else:
+                restaurant_index.upsert(restaurant_id, values)
+        restaurant_index.catalog.committed(session)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_changes(session):
+    """Descarta as alterações de uma transação desfeita."""
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,157 @@
+"""
+Módulo que implementa o cache de usuários usado pela rota /api/auth/me.
+
+O token de acesso carrega o perfil público do usuário e a versão da linha
+(`users.version`). A rota responde a partir do token quando o cache do
+processo confirma que essa versão ainda é a atual; assim, em regime, /me
+não consulta o banco de dados.
+
+O cache guarda apenas {id: versão}, com validade de USER_CACHE_TTL segundos.
+Todo commit que altera ou remove usuários invalida as entradas afetadas no
+evento `after_commit` e incrementa, na mesma transação, o contador
+`users_generation`. Escritas feitas em outro processo (por exemplo,
+`manage_users.py delete`) chegam aos workers de duas formas:
+
+- com CACHE_BACKEND = 'redis', cada invalidação incrementa um contador de
+  geração no Redis, e os workers descartam o cache quando ele muda;
+- com o cache local, cada worker lê `users_generation` no máximo uma vez a
+  cada USER_CACHE_SYNC_INTERVAL segundos e descarta o cache quando ela muda.
+"""
+
+import threading
+import time
+
+import redis
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from app.models import User, UsersGeneration
+
+_generation_table = UsersGeneration.__table__
+
+# Usuários alterados na transação, guardados em session.info até o commit
+_CHANGED_USERS_KEY = 'changed_users'
+
+class UserCache:
+    """
+    Cache por processo das versões de usuários confirmadas no banco.
+
+    Atributos:
+        ttl: Validade das entradas, em segundos (0 desativa o cache)
+        client: Cliente Redis usado para a geração compartilhada (opcional)
+        sync_interval: Intervalo (s) entre leituras da geração no banco, sem
+                       Redis (None não consulta o banco)
+    """
+    GENERATION_KEY = 'qualaboa:users:generation'
+
+    def __init__(self, ttl=300, client=None, sync_interval=None):
+        self.ttl = ttl
+        self.client = client
+        self.sync_interval = sync_interval
+        self._entries = {}
+        self._generation = None
+        self._synced_at = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """
+        Lê USER_CACHE_TTL e, com CACHE_BACKEND = 'redis', conecta ao Redis;
+        sem Redis, a geração é lida do banco a cada USER_CACHE_SYNC_INTERVAL.
+
+        Args:
+            app (Flask): Aplicação Flask
+        """
+        self.ttl = app.config.get('USER_CACHE_TTL', 300)
+        self.client = None
+        self.sync_interval = app.config.get('USER_CACHE_SYNC_INTERVAL', 2)
+        if app.config.get('CACHE_BACKEND') == 'redis':
+            self.client = redis.Redis.from_url(app.config['CACHE_REDIS_URL'])
+        self._generation = self._synced_at = None
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _sync_generation(self):
+        """Descarta o cache quando outro processo invalidou usuários."""
+        if self.client is not None:
+            generation = self.client.get(self.GENERATION_KEY)
+        elif self.sync_interval is not None:
+            now = time.monotonic()
+            if self._synced_at is not None and now - self._synced_at < self.sync_interval:
+                return
+            generation = db.session.execute(
+                select(_generation_table.c.generation).where(_generation_table.c.id == 1)
+            ).scalar()
+            self._synced_at = now
+        else:
+            return
+        if generation != self._generation:
+            self.clear()
+            self._generation = generation
+
+    def get(self, user_id):
+        """
+        Retorna a versão conhecida de um usuário.
+
+        Args:
+            user_id (int): ID do usuário
+
+        Returns:
+            int: Versão confirmada ou None se ausente/expirada
+        """
+        if not self.ttl:
+            return None
+        self._sync_generation()
+        entry = self._entries.get(user_id)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    def set(self, user_id, version):
+        if self.ttl:
+            with self._lock:
+                self._entries[user_id] = (time.monotonic() + self.ttl, version)
+
+    def invalidate(self, user_ids):
+        """
+        Remove usuários do cache e avisa os demais processos (Redis).
+
+        Args:
+            user_ids: IDs dos usuários alterados ou removidos
+        """
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+        if self.client is not None:
+            self.client.incr(self.GENERATION_KEY)
+
+# Instância única do cache, configurada em create_app
+user_cache = UserCache()
+
+@event.listens_for(Session, 'before_flush')
+def _collect_changed_users(session, flush_context, instances):
+    """
+    Guarda os ids dos usuários alterados ou removidos na transação e
+    incrementa a geração dos usuários, confirmada junto com a alteração.
+    """
+    changed = {obj.id for obj in session.deleted if isinstance(obj, User)}
+    changed.update(obj.id for obj in session.dirty if isinstance(obj, User) and session.is_modified(obj))
+    if changed:
+        session.info.setdefault(_CHANGED_USERS_KEY, set()).update(changed)
+        session.connection().execute(
+            update(_generation_table).where(_generation_table.c.id == 1)
+            .values(generation=_generation_table.c.generation + 1)
+        )
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_on_commit(session):
+    changed = session.info.pop(_CHANGED_USERS_KEY, None)
+    if changed:
+        user_cache.invalidate(changed)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_on_rollback(session):
+    session.info.pop(_CHANGED_USERS_KEY, None)
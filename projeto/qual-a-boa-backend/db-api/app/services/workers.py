@@ -0,0 +1,43 @@
+"""
+Módulo que prepara o estado de cada worker do Gunicorn após o fork.
+
+Com preload_app, `create_app` roda uma única vez no processo mestre (inclusive
+`db.create_all()`, que abre conexões) e os workers herdam uma cópia da
+memória. Conexões, travas e caches não podem ser compartilhados entre
+processos, então `init_worker` é chamado pelo hook `post_fork` de
+`deploy/gunicorn_config.py` para:
+
+- descartar o pool de conexões herdado sem fechar os sockets do mestre
+  (`dispose(close=False)`), de modo que o worker abra as suas próprias;
+- recriar o cache de respostas, o cache de usuários e o pool de hashing;
+- descartar o índice de trigramas e as sugestões por prefixo, reconstruídos
+  a partir do banco no primeiro uso, e zerar os contadores do pool de conexões.
+
+O logger reinicia a sua thread sozinho (`os.register_at_fork`).
+"""
+
+from app.extensions import db
+from app.services.cache import response_cache
+from app.services.db_pool import database_pool
+from app.services.passwords import password_hasher
+from app.services.suggest import suggest_index
+from app.services.trigram_index import restaurant_index
+from app.services.user_cache import user_cache
+from app.core.logger import logger
+
+def init_worker(app):
+    """
+    Reinicializa o estado do processo atual a partir da configuração da aplicação.
+
+    Args:
+        app (Flask): Aplicação criada pelo processo mestre
+    """
+    with app.app_context():
+        db.engine.dispose(close=False)
+    database_pool.reset()
+    response_cache.init_app(app)
+    user_cache.init_app(app)
+    password_hasher.init_app(app)
+    restaurant_index.reset()
+    suggest_index.reset()
+    logger.debug("Estado do worker reinicializado após o fork.")
@@ -0,0 +1,172 @@
+"""
+Módulo com a tabela offline de coordenadas por CEP e a grade espacial usada
+na busca por proximidade.
+
+A tabela é um CSV local (`cep,latitude,longitude`, linhas iniciadas por `#`
+são comentários) em que `cep` pode ser o CEP completo ou um prefixo: a busca
+usa o prefixo mais longo presente no arquivo. O arquivo é lido no primeiro
+uso, nunca pela rede. O arquivo incluído no projeto (data/cep_coordinates.csv)
+traz apenas prefixos das capitais; para precisão de rua, substitua-o (ou
+aponte CEP_COORDINATES_FILE) por uma base completa de CEPs.
+
+A grade divide o globo em células de CELL_DEGREES graus. Cada restaurante
+guarda o número da sua célula (`geo_cell`, indexado), e uma busca por raio
+consulta apenas os intervalos de células que cobrem o círculo: as células
+de uma mesma faixa de latitude são consecutivas, então o raio vira um
+intervalo de `geo_cell` por faixa.
+"""
+
+import csv
+import math
+import os
+import re
+import threading
+
+# Arquivo incluído no projeto, usado quando CEP_COORDINATES_FILE não é definido
+DEFAULT_CEP_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'data', 'cep_coordinates.csv',
+)
+
+# Tamanho da célula da grade (0,05° ≈ 5,5 km de latitude). Alterar o valor
+# exige recalcular geo_cell (manage_restaurants.py backfill-location)
+CELL_DEGREES = 0.05
+LAT_CELLS = round(180 / CELL_DEGREES)
+LON_CELLS = round(360 / CELL_DEGREES)
+
+KM_PER_DEGREE = 111.32
+EARTH_RADIUS_KM = 6371.0088
+
+def _lat_row(lat):
+    return min(int((lat + 90) / CELL_DEGREES), LAT_CELLS - 1)
+
+def geo_cell(lat, lon):
+    """
+    Calcula a célula da grade de uma coordenada.
+
+    Args:
+        lat (float): Latitude em graus
+        lon (float): Longitude em graus
+
+    Returns:
+        int: Número da célula (faixa de latitude * LON_CELLS + coluna)
+    """
+    return _lat_row(lat) * LON_CELLS + int((lon + 180) / CELL_DEGREES) % LON_CELLS
+
+def cell_ranges(lat, lon, radius_km):
+    """
+    Calcula os intervalos de células que cobrem um círculo.
+
+    Args:
+        lat (float): Latitude do centro
+        lon (float): Longitude do centro
+        radius_km (float): Raio em quilômetros
+
+    Returns:
+        list: Intervalos (primeira, última) de geo_cell, inclusivos
+    """
+    dlat = radius_km / KM_PER_DEGREE
+    lat_min, lat_max = max(-90.0, lat - dlat), min(90.0, lat + dlat)
+
+    # A faixa mais próxima do polo é a mais estreita em km: usa a sua largura
+    cos_lat = math.cos(math.radians(max(abs(lat_min), abs(lat_max))))
+    dlon = radius_km / (KM_PER_DEGREE * cos_lat) if cos_lat > 1e-9 else 360.0
+    first = math.floor((lon - dlon + 180) / CELL_DEGREES)
+    last = math.floor((lon + dlon + 180) / CELL_DEGREES)
+    if last - first + 1 >= LON_CELLS:
+        columns = [(0, LON_CELLS - 1)]
+    elif first < 0:
+        # O círculo atravessa o antimeridiano
+        columns = [(0, last), (first % LON_CELLS, LON_CELLS - 1)]
+    elif last >= LON_CELLS:
+        columns = [(0, last % LON_CELLS), (first, LON_CELLS - 1)]
+    else:
+        columns = [(first, last)]
+
+    return [
+        (row * LON_CELLS + start, row * LON_CELLS + end)
+        for row in range(_lat_row(lat_min), _lat_row(lat_max) + 1)
+        for start, end in columns
+    ]
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """
+    Distância entre duas coordenadas sobre a esfera, em quilômetros.
+
+    Returns:
+        float: Distância em km
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = math.sin((phi2 - phi1) / 2) ** 2 \
+        + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+class CepCoordinates:
+    """
+    Tabela CEP (ou prefixo de CEP) → coordenadas, carregada de um arquivo local.
+
+    Atributos:
+        path: Caminho do CSV
+    """
+
+    def __init__(self, path=None):
+        self.path = path or DEFAULT_CEP_FILE
+        self._table = None
+        self._lengths = ()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """
+        Lê CEP_COORDINATES_FILE da configuração. O arquivo é carregado no primeiro uso.
+
+        Args:
+            app (Flask): Aplicação Flask
+        """
+        path = app.config.get('CEP_COORDINATES_FILE') or DEFAULT_CEP_FILE
+        if path != self.path:
+            with self._lock:
+                self.path = path
+                self._table = None
+
+    def load(self):
+        """
+        Lê o arquivo de coordenadas.
+
+        Returns:
+            int: Quantidade de CEPs/prefixos carregados
+        """
+        table = {}
+        if os.path.exists(self.path):
+            with open(self.path, newline='', encoding='utf-8') as stream:
+                rows = csv.DictReader(line for line in stream if not line.startswith('#'))
+                for row in rows:
+                    cep = re.sub(r'\D', '', row['cep'])
+                    table[cep] = (float(row['latitude']), float(row['longitude']))
+        self._lengths = tuple(sorted({len(cep) for cep in table}, reverse=True))
+        self._table = table
+        return len(table)
+
+    def lookup(self, postal_code):
+        """
+        Busca as coordenadas de um CEP pelo prefixo mais longo da tabela.
+
+        Args:
+            postal_code (str): CEP, com ou sem máscara
+
+        Returns:
+            tuple: (latitude, longitude) ou None se o CEP não estiver na tabela
+        """
+        if self._table is None:
+            with self._lock:
+                if self._table is None:
+                    self.load()
+        digits = re.sub(r'\D', '', postal_code or '')
+        for length in self._lengths:
+            if length <= len(digits):
+                coordinates = self._table.get(digits[:length])
+                if coordinates is not None:
+                    return coordinates
+        return None
+
+# Instância única, configurada em create_app
+cep_coordinates = CepCoordinates()
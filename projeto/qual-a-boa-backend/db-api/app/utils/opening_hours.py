@@ -0,0 +1,190 @@
+"""
+Módulo com o parser do horário de funcionamento (`operating_hours`).
+
+O texto livre é compilado em intervalos de minutos da semana, contados a
+partir de segunda-feira 00:00 (0 a 10080). Cada intervalo fica dentro de um
+único dia: horários que passam da meia-noite são divididos em dois. Assim,
+"aberto no minuto t" só precisa olhar os intervalos que começam entre a
+meia-noite do dia de t e t.
+
+Formatos aceitos (dias em português ou inglês, com ou sem acento):
+
+    Mon-Fri: 11:00-22:00, Sat-Sun: 12:00-23:00
+    Seg-Sex: 11:00-15:00, 18:00-23:00, Sáb e Dom: 12:00-00:00
+    Segunda a sexta 11h às 23h; Domingo: fechado
+    11:00-23:00 (todos os dias)      24h
+
+Um trecho sem dias vale para os mesmos dias do trecho anterior (ou para a
+semana inteira, se for o primeiro). Um fim menor ou igual ao início, ou
+00:00, significa que o horário termina no dia seguinte.
+"""
+
+import re
+
+from app.utils.text import normalize_text
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+# Dias pelas três primeiras letras do nome (normalizado), segunda = 0
+DAY_NUMBERS = {
+    'mon': 0, 'tue': 1, 'wed': 2, 'thu': 3, 'fri': 4, 'sat': 5, 'sun': 6,
+    'seg': 0, 'ter': 1, 'qua': 2, 'qui': 3, 'sex': 4, 'sab': 5, 'dom': 6,
+}
+ALL_DAYS = tuple(range(7))
+EVERY_DAY_WORDS = ('todos os dias', 'diariamente', 'diario', 'daily', 'every day')
+CLOSED_WORDS = ('fechado', 'closed')
+FULL_DAY_WORDS = ('24 horas', '24 hours', '24h')
+
+_TIME = r'(\d{1,2})(?:[:h](\d{2})?)?'
+_TIME_RANGE = re.compile(_TIME + r'\s*(?:-|a|as|ate|to)\s*' + _TIME)
+_DAY_RANGE = re.compile(r'\s*(?:-|\ba\b|\bate\b|\bto\b)\s*')
+_DAY_LIST = re.compile(r'\s*(?:/|&|\be\b|\band\b)\s*')
+_TIME_SEPARATORS = re.compile(r'(?:[\s/&+]|\be\b|\band\b)*')
+
+class OperatingHoursError(ValueError):
+    """Erro lançado quando o horário de funcionamento não pode ser interpretado."""
+
+def parse_operating_hours(text):
+    """
+    Compila o horário de funcionamento em intervalos de minutos da semana.
+
+    Args:
+        text (str): Horário em texto livre (ex.: 'Mon-Fri: 11:00-22:00')
+
+    Returns:
+        list: Pares (início, fim) em minutos da semana, ordenados, cada um
+              dentro de um único dia. Vazia se o texto estiver vazio.
+
+    Raises:
+        OperatingHoursError: Se algum trecho não puder ser interpretado
+    """
+    normalized = normalize_text(text).strip()
+    for word in EVERY_DAY_WORDS:
+        normalized = normalized.replace(word, '')
+    normalized = re.sub(r'[()]', ' ', normalized).replace('-feira', '').replace('–', '-')
+    if not normalized.strip():
+        return []
+
+    intervals = []
+    days = None
+    for part in re.split(r'[,;\n]', normalized):
+        part = part.strip()
+        if not part:
+            continue
+        part_days, times = _split_part(part)
+        days = part_days or days or ALL_DAYS
+        ranges = _parse_times(times, part)
+        if not ranges:
+            # 'fechado' desfaz horários dados antes para os mesmos dias
+            intervals = [interval for interval in intervals if interval[0] not in days]
+        intervals.extend((day, start, end) for start, end in ranges for day in days)
+
+    pieces = set()
+    for day, start, end in intervals:
+        # Divide na meia-noite (e na virada da semana)
+        start += day * MINUTES_PER_DAY
+        end += day * MINUTES_PER_DAY
+        while start < end:
+            piece_end = min(end, (start // MINUTES_PER_DAY + 1) * MINUTES_PER_DAY)
+            pieces.add((start % MINUTES_PER_WEEK, (piece_end - 1) % MINUTES_PER_WEEK + 1))
+            start = piece_end
+    return _merge(pieces)
+
+def _split_part(part):
+    """Separa um trecho em (dias, horários); dias é None se o trecho não os tiver."""
+    match = re.search(r'\d', part)
+    keyword = next((word for word in CLOSED_WORDS + FULL_DAY_WORDS if word in part), None)
+    position = match.start() if match else len(part)
+    if keyword and part.index(keyword) < position:
+        position = part.index(keyword)
+    day_text = part[:position].strip().rstrip(':').strip()
+    if not day_text:
+        return None, part
+    return _parse_days(day_text, part), part[position:]
+
+def _parse_days(text, part):
+    days = []
+    for item in _DAY_LIST.split(text):
+        bounds = [_day_number(name, part) for name in _DAY_RANGE.split(item.strip())]
+        if len(bounds) == 1:
+            days.append(bounds[0])
+        elif len(bounds) == 2:
+            first, last = bounds
+            days.extend((first + offset) % 7 for offset in range((last - first) % 7 + 1))
+        else:
+            raise OperatingHoursError(f"Invalid day range in '{part}'")
+    return tuple(dict.fromkeys(days))
+
+def _day_number(name, part):
+    day = DAY_NUMBERS.get(name.strip()[:3])
+    if day is None:
+        raise OperatingHoursError(f"Unknown day '{name.strip()}' in '{part}'")
+    return day
+
+def _parse_times(text, part):
+    text = text.strip()
+    if any(word in text for word in CLOSED_WORDS):
+        return []
+    if text in FULL_DAY_WORDS or text.startswith(FULL_DAY_WORDS):
+        return [(0, MINUTES_PER_DAY)]
+
+    ranges = []
+    for match in _TIME_RANGE.finditer(text):
+        start = _minutes(match.group(1), match.group(2), part)
+        end = _minutes(match.group(3), match.group(4), part)
+        if end <= start:
+            end += MINUTES_PER_DAY
+        ranges.append((start, end))
+    if not ranges or not _TIME_SEPARATORS.fullmatch(_TIME_RANGE.sub('', text)):
+        raise OperatingHoursError(f"Invalid time range in '{part}'")
+    return ranges
+
+def _minutes(hours, minutes, part):
+    hours, minutes = int(hours), int(minutes or 0)
+    if hours > 24 or minutes > 59 or (hours == 24 and minutes):
+        raise OperatingHoursError(f"Invalid time in '{part}'")
+    return hours * 60 + minutes
+
+def _merge(intervals):
+    merged = []
+    for start, end in sorted(intervals):
+        # Só junta intervalos do mesmo dia: nenhum atravessa a meia-noite
+        if merged and start <= merged[-1][1] and start // MINUTES_PER_DAY == merged[-1][0] // MINUTES_PER_DAY:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+def minute_of_week(moment):
+    """
+    Converte uma data/hora no minuto da semana (segunda-feira 00:00 = 0).
+
+    Args:
+        moment (datetime): Data e hora no fuso dos restaurantes
+
+    Returns:
+        int: Minuto da semana
+    """
+    return moment.weekday() * MINUTES_PER_DAY + moment.hour * 60 + moment.minute
+
+def parse_weekday_time(text):
+    """
+    Lê um instante da semana no formato '<dia> HH:MM' (ex.: 'sab 20:30').
+
+    Args:
+        text (str): Dia da semana e horário
+
+    Returns:
+        int: Minuto da semana
+
+    Raises:
+        OperatingHoursError: Se o texto não estiver no formato esperado
+    """
+    match = re.fullmatch(r'([a-z]+)[\s,-]+' + _TIME, normalize_text(text).strip())
+    if not match:
+        raise OperatingHoursError(f"Invalid weekday and time '{text}'")
+    minutes = _minutes(match.group(2), match.group(3), text)
+    if minutes >= MINUTES_PER_DAY:
+        raise OperatingHoursError(f"Invalid time in '{text}'")
+    return _day_number(match.group(1), text) * MINUTES_PER_DAY + minutes
@@ -0,0 +1,121 @@
+"""
+Módulo com funções utilitárias para tratamento de texto.
+"""
+
+import unicodedata
+
+def normalize_text(text):
+    """
+    Normaliza texto removendo acentos e convertendo para minúsculas.
+
+    Args:
+        text (str): Texto a ser normalizado
+
+    Returns:
+        str: Texto normalizado
+    """
+    if not text:
+        return ''
+    # Remove acentos
+    normalized = unicodedata.normalize('NFKD', text).encode('ASCII', 'ignore').decode('ASCII')
+    return normalized.lower()
+
+def edit_distance(a, b, max_distance=None):
+    """
+    Calcula a distância de Levenshtein (inserções, remoções e substituições)
+    entre dois textos. Com um limite, apenas as células a até `max_distance`
+    da diagonal são calculadas e o cálculo para assim que uma linha inteira
+    o ultrapassa.
+
+    Args:
+        a (str): Primeiro texto
+        b (str): Segundo texto
+        max_distance (int): Limite opcional da distância
+
+    Returns:
+        int: Distância entre os textos, ou max_distance + 1 se o limite foi ultrapassado
+    """
+    # Prefixo e sufixo comuns não alteram a distância
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end = 0
+    while end < len(a) - start and end < len(b) - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+    a, b = a[start:len(a) - end], b[start:len(b) - end]
+    if len(a) < len(b):
+        a, b = b, a
+    if max_distance is None:
+        max_distance = len(a)
+    if len(a) - len(b) > max_distance:
+        return max_distance + 1
+    if not b:
+        return len(a)
+
+    over = max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        low, high = max(1, i - max_distance), min(len(b), i + max_distance)
+        current = [over] * (len(b) + 1)
+        current[0] = row_min = min(i, over)
+        for j in range(low, high + 1):
+            cost = previous[j - 1] + (char_a != b[j - 1])
+            if previous[j] + 1 < cost:
+                cost = previous[j] + 1
+            if current[j - 1] + 1 < cost:
+                cost = current[j - 1] + 1
+            current[j] = cost
+            if cost < row_min:
+                row_min = cost
+        if row_min > max_distance:
+            return over
+        previous = current
+    return min(previous[-1], over)
+
+def text_similarity(term, text, threshold=0.0, cache=None, spacing=True):
+    """
+    Calcula a semelhança entre um termo e o trecho mais parecido de um texto,
+    ambos normalizados. Um termo contido no texto vale 1.0; senão o termo é
+    comparado com cada sequência de palavras do texto com a mesma quantidade
+    de palavras do termo, valendo 1 - distância de edição / maior tamanho.
+    Se nenhuma alcança `threshold`, tenta sequências com uma palavra a menos
+    e uma a mais (espaço digitado a mais ou a menos).
+
+    Args:
+        term (str): Termo buscado
+        text (str): Texto comparado
+        threshold (float): Semelhança mínima de interesse; abaixo dela o
+                           cálculo é interrompido e o resultado é 0.0
+        cache (dict): Semelhanças já calculadas por trecho, para o mesmo termo
+        spacing (bool): False compara apenas com a mesma quantidade de palavras
+
+    Returns:
+        float: Semelhança entre 0.0 e 1.0
+    """
+    if term in text:
+        return 1.0
+    words = text.split()
+    size = term.count(' ') + 1
+    best = 0.0
+    for count in (size, size - 1, size + 1) if spacing else (size,):
+        if count < 1 or (count != size and count > len(words)):
+            continue
+        for start in range(max(len(words) - count, 0) + 1):
+            window = ' '.join(words[start:start + count])
+            score = cache.get(window) if cache is not None else None
+            if score is None:
+                longest = max(len(term), len(window))
+                limit = int((1 - threshold) * longest)
+                # Cada letra do trecho ausente do termo exige ao menos uma edição
+                if len(set(window).difference(term)) > limit:
+                    score = 0.0
+                else:
+                    distance = edit_distance(term, window, limit)
+                    score = 1 - distance / longest if distance <= limit else 0.0
+                if cache is not None:
+                    cache[window] = score
+            if score > best:
+                best = score
+        if best:
+            break
+    return best if best >= threshold else 0.0
@@ -3,10 +3,11 @@ Módulo que implementa funções de validação para a API.
 Inclui validação de chave API, schemas, email e senha.
 """
 
-from flask import request, current_app, jsonify
+from flask import request, current_app, jsonify, abort
 from functools import wraps
 from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
 from marshmallow import ValidationError
+from pydantic import BaseModel, ValidationError as PydanticValidationError
 
 def validate_api_key():
     """
@@ -56,25 +57,70 @@ def handle_validation_error(error):
         })
     return {'detail': errors}, 400
 
+def validation_messages(error):
+    """
+    Converte erros de validação Pydantic no formato do Marshmallow.
+
+    Args:
+        error: ValidationError do Pydantic
+
+    Returns:
+        dict: Mensagens de erro indexadas pelo campo ('_schema' para o objeto)
+    """
+    messages = {}
+    for err in error.errors():
+        field = '.'.join(str(part) for part in err['loc']) or '_schema'
+        messages.setdefault(field, []).append(err['msg'])
+    return messages
+
+def load_payload(model, data):
+    """
+    Valida um item (já decodificado) com um modelo Pydantic.
+
+    Args:
+        model: Classe do modelo Pydantic
+        data: Item a validar
+
+    Returns:
+        tuple: (instância validada ou None, dicionário de erros)
+    """
+    try:
+        return model.model_validate(data), {}
+    except PydanticValidationError as err:
+        return None, validation_messages(err)
+
 def validate_schema(schema):
     """
-    Decorator que valida os dados da requisição contra um schema.
-    
+    Decorator que valida os dados da requisição contra um schema e entrega
+    o resultado à rota no argumento `data`, sem decodificar o corpo de novo.
+
+    Com um modelo Pydantic, o corpo é decodificado e validado em uma única
+    passagem (`model_validate_json`) e a rota recebe a instância normalizada.
+    Com um schema do Marshmallow, a rota recebe o dicionário de `schema.load`.
+
     Args:
-        schema: Schema do Marshmallow para validação
-        
+        schema: Classe do modelo Pydantic ou instância de schema do Marshmallow
+
     Returns:
         function: Decorator que valida os dados
     """
+    is_model = isinstance(schema, type) and issubclass(schema, BaseModel)
+
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
+            if not request.is_json:
+                abort(415)
             try:
-                data = request.get_json()
-                schema.load(data)
-                return f(*args, **kwargs)
+                if is_model:
+                    data = schema.model_validate_json(request.get_data())
+                else:
+                    data = schema.load(request.get_json())
+            except PydanticValidationError as err:
+                return jsonify({"message": "Validation error", "errors": validation_messages(err)}), 400
             except ValidationError as err:
                 return jsonify({"message": "Validation error", "errors": err.messages}), 400
+            return f(*args, data=data, **kwargs)
         return decorated_function
     return decorator
 
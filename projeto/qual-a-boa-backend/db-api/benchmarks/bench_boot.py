@@ -0,0 +1,65 @@
+"""
+Benchmark do tempo de inicialização de um worker.
+
+Cada amostra roda em um processo Python novo (importações a frio, como um
+worker reciclado sem preload) e registra o tempo de importação do pacote
+`app`, o tempo de `create_app('production')` e as etapas medidas em
+`app.extensions['boot_timings']`, com FAST_BOOT desligado e ligado.
+
+Guarde a saída para comparar versões: o custo de reiniciar um worker deve
+ficar estável à medida que a aplicação cresce.
+
+Uso: python benchmarks/bench_boot.py [amostras]
+     (padrão: 10)
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SAMPLE = """
+import json, logging, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+from app.core.logger import logger
+logger.setLevel(logging.WARNING)
+application = app.create_app('production')
+created = time.perf_counter()
+print(json.dumps({
+    'import app': (imported - start) * 1000,
+    'create_app': (created - imported) * 1000,
+    **{name: value for name, value in application.extensions['boot_timings'].items()
+       if name not in ('imports', 'total')},
+}))
+"""
+
+def sample(fast_boot, database_url):
+    env = dict(os.environ, FAST_BOOT='1' if fast_boot else '0', DATABASE_URL=database_url, LOG_LEVEL='WARNING')
+    output = subprocess.run([sys.executable, '-c', SAMPLE], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    samples = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    # Cria o esquema uma vez, como o `flask db upgrade` do deploy
+    sample(False, database_url)
+
+    print(f'Mediana de {samples} processos (ms)\n')
+    results = {}
+    for fast_boot in (False, True):
+        runs = [sample(fast_boot, database_url) for _ in range(samples)]
+        results[fast_boot] = {name: statistics.median(run.get(name, 0.0) for run in runs) for name in runs[0]}
+    phases = list(dict.fromkeys([*results[False], *results[True]]))
+    print(f"{'etapa':<14} {'FAST_BOOT=0':>12} {'FAST_BOOT=1':>12}")
+    for phase in phases:
+        print(f'{phase:<14} {results[False].get(phase, 0.0):12.1f} {results[True].get(phase, 0.0):12.1f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""
+Benchmark da busca aproximada (fuzzy=1 da rota /search) contra a busca exata.
+
+Usa o catálogo sintético do bench_suite e sorteia termos a partir dos
+próprios nomes ("Cantina Mineiro 123" -> "cantina mineiro") e cidades, com
+um erro de digitação (troca, remoção, inserção ou transposição) em cada
+termo da busca aproximada. Mede, em páginas de 20:
+
+- a busca exata no banco (LIKE nas colunas normalizadas) com o termo correto;
+- a busca exata pelo índice de trigramas em memória com o termo correto;
+- a busca aproximada pelo índice (candidatos por trigramas + distância de
+  edição + seleção dos melhores em heap) com o termo errado;
+- a alternativa sem filtro de candidatos: `text_similarity` em todas as
+  linhas, seguida de ordenação completa (poucas consultas).
+
+O banco SQLite fica em --data-dir e é o mesmo do bench_suite.
+
+Uso: python benchmarks/bench_fuzzy.py [--rows 1m] [--queries 100]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import string
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+os.environ.setdefault('QUERY_SLOW_MS', '0')
+os.environ.setdefault('CACHE_BACKEND', 'none')
+
+from benchmarks.bench_suite import CITIES, NAME_PREFIXES, NAME_WORDS, parse_rows, seed  # noqa: E402
+
+def typo(term, rng):
+    """Aplica um erro de digitação em uma posição sorteada do termo."""
+    position = rng.randrange(1, len(term) - 1)
+    kind = rng.choice(('replace', 'delete', 'insert', 'swap'))
+    if kind == 'replace':
+        return term[:position] + rng.choice(string.ascii_lowercase) + term[position + 1:]
+    if kind == 'delete':
+        return term[:position] + term[position + 1:]
+    if kind == 'insert':
+        return term[:position] + rng.choice(string.ascii_lowercase) + term[position:]
+    return term[:position - 1] + term[position] + term[position - 1] + term[position + 1:]
+
+def measure(run, sample):
+    timings = []
+    for criteria in sample:
+        start = time.perf_counter()
+        run(criteria)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[max(int(len(timings) * 0.95) - 1, 0)]
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark da busca aproximada')
+    parser.add_argument('--rows', default='1m', help='Restaurantes no catálogo (1k, 100k, 1m)')
+    parser.add_argument('--queries', type=int, default=100, help='Termos sorteados')
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'qualaboa-bench'),
+                        help='Diretório do banco SQLite')
+    args = parser.parse_args()
+
+    rows = parse_rows(args.rows)
+    os.makedirs(args.data_dir, exist_ok=True)
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(args.data_dir, f'restaurants_{rows}.db')}"
+
+    from app import create_app
+    from app.models import Restaurant
+    from app.services.pagination import Page
+    from app.services.search import search_page
+    from app.services.trigram_index import FUZZY_MIN_SIMILARITY, restaurant_index
+    from app.utils.text import normalize_text, text_similarity
+
+    app = create_app('production')
+    with app.app_context():
+        seed(rows)
+        page = Page(limit=20, after=0, fields=Restaurant.PUBLIC_FIELDS)
+
+        start = time.perf_counter()
+        restaurant_index.rebuild()
+        print(f'Índice construído em {time.perf_counter() - start:.1f}s')
+
+        rng = random.Random(5)
+        exact, fuzzy = [], []
+        for _ in range(args.queries):
+            if rng.random() < 0.5:
+                field, term = 'name', normalize_text(f'{rng.choice(NAME_PREFIXES)} {rng.choice(NAME_WORDS)}')
+            else:
+                field, term = 'city', normalize_text(rng.choice(CITIES)[0])
+            exact.append({field: term})
+            fuzzy.append({field: typo(term, rng)})
+
+        def database(criteria):
+            restaurant_index.enabled = False
+            return search_page(criteria, page)
+
+        def memory(criteria):
+            restaurant_index.enabled = True
+            return search_page(criteria, page)
+
+        def fuzzy_memory(criteria):
+            restaurant_index.enabled = False
+            return search_page(criteria, page, fuzzy=True)
+
+        def scan_all(criteria):
+            # Sem filtro de candidatos: compara com todas as linhas e ordena tudo
+            (field, term), = criteria.items()
+            values = restaurant_index._values[field]
+            cache = {}
+            scored = [(text_similarity(term, value, FUZZY_MIN_SIMILARITY, cache), -restaurant_id)
+                      for restaurant_id, value in values.items()]
+            return sorted((item for item in scored if item[0]), reverse=True)[:page.limit]
+
+        found = sum(bool(fuzzy_memory(criteria)[0]) for criteria in fuzzy)
+        print(f'Termos com erro encontrados pela busca aproximada: {found} de {len(fuzzy)}')
+
+        print(f'{"busca":<36} {"p50":>10} {"p95":>10}')
+        for label, run, sample in (
+            ('exata no banco (termo correto)', database, exact),
+            ('exata no índice (termo correto)', memory, exact),
+            ('aproximada no índice (com erro)', fuzzy_memory, fuzzy),
+            ('todas as linhas (com erro)', scan_all, fuzzy[:3]),
+        ):
+            p50, p95 = measure(run, sample)
+            print(f'{label:<36} {p50:>8.1f}ms {p95:>8.1f}ms')
+
+if __name__ == '__main__':
+    main()
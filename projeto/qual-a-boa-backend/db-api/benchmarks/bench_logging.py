@@ -0,0 +1,121 @@
+"""
+Benchmark do custo de log por requisição.
+
+Simula uma requisição com as chamadas de log de uma rota típica (uma INFO,
+duas DEBUG e uma WARNING) e mede o tempo gasto na thread da requisição:
+
+- síncrono: StreamHandler + TimedRotatingFileHandler ligados ao logger, com
+  mensagens em f-string (configuração anterior);
+- fila: LazyQueueHandler + QueueListener, com argumentos formatados pela
+  thread do listener;
+- fila com amostragem: o mesmo pipeline com LOG_DEBUG_SAMPLE_RATE = 0.1.
+
+O console é redirecionado para um arquivo temporário, para que o terminal
+não domine a medição.
+
+Uso: python benchmarks/bench_logging.py [requisições] [threads]
+     (padrão: 20000 4)
+"""
+
+import logging
+import os
+import queue
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from logging.handlers import QueueListener, TimedRotatingFileHandler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.logger import DebugSampler, LazyQueueHandler, LoggerSingleton
+
+FORMAT = logging.Formatter(LoggerSingleton.LOG_FORMAT, datefmt=LoggerSingleton.LOG_DATE_FORMAT)
+
+def build_handlers(directory, name):
+    console = logging.StreamHandler(open(os.path.join(directory, f'{name}.console'), 'w'))
+    console.setLevel(logging.INFO)
+    file_handler = TimedRotatingFileHandler(
+        os.path.join(directory, f'{name}.log'), when='midnight', backupCount=7, encoding='utf-8')
+    file_handler.setLevel(logging.DEBUG)
+    for handler in (console, file_handler):
+        handler.setFormatter(FORMAT)
+    return console, file_handler
+
+def sync_request(log, restaurant_id, args):
+    log.info(f"Fetching restaurant with ID: {restaurant_id}")
+    log.debug(f"Query arguments: {args}")
+    log.debug(f"Restaurant {restaurant_id} served from the database")
+    log.warning(f"Slow response for restaurant {restaurant_id}")
+
+def lazy_request(log, restaurant_id, args):
+    log.info("Fetching restaurant with ID: %s", restaurant_id)
+    log.debug("Query arguments: %s", args)
+    log.debug("Restaurant %s served from the database", restaurant_id)
+    log.warning("Slow response for restaurant %s", restaurant_id)
+
+def run(log, simulate, requests, threads):
+    """Executa as requisições em várias threads e retorna as durações."""
+    durations = []
+    args = {'state': 'SP', 'city': 'São Paulo', 'limit': '50'}
+
+    def worker(count):
+        local = []
+        for i in range(count):
+            start = time.perf_counter()
+            simulate(log, i, args)
+            local.append(time.perf_counter() - start)
+        durations.extend(local)
+
+    pool = [threading.Thread(target=worker, args=(requests // threads,)) for _ in range(threads)]
+    start = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return durations, time.perf_counter() - start
+
+def report(label, durations, elapsed):
+    durations.sort()
+    p99 = durations[int(len(durations) * 0.99) - 1]
+    print(f'{label:<22} média {statistics.mean(durations) * 1e6:7.1f} µs   '
+          f'p99 {p99 * 1e6:7.1f} µs   total {elapsed:.2f}s')
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    directory = tempfile.mkdtemp()
+    print(f'{requests} requisições, {threads} threads, 4 chamadas de log por requisição\n')
+
+    log = logging.getLogger('bench.sync')
+    log.setLevel(logging.DEBUG)
+    log.propagate = False
+    handlers = build_handlers(directory, 'sync')
+    for handler in handlers:
+        log.addHandler(handler)
+    report('síncrono', *run(log, sync_request, requests, threads))
+    for handler in handlers:
+        handler.close()
+
+    for label, rate in (('fila', 1.0), ('fila, DEBUG a 10%', 0.1)):
+        log = logging.getLogger(f'bench.queue.{rate}')
+        log.setLevel(logging.DEBUG)
+        log.propagate = False
+        log_queue = queue.SimpleQueue()
+        queue_handler = LazyQueueHandler(log_queue)
+        queue_handler.addFilter(DebugSampler(rate))
+        log.addHandler(queue_handler)
+        handlers = build_handlers(directory, f'queue{rate}')
+        listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        durations, elapsed = run(log, lazy_request, requests, threads)
+        start = time.perf_counter()
+        listener.stop()
+        report(label, durations, elapsed)
+        print(f'{"":<22} (o listener terminou de gravar em mais {time.perf_counter() - start:.2f}s)')
+        for handler in handlers:
+            handler.close()
+
+if __name__ == '__main__':
+    main()
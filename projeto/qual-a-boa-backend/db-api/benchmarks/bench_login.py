@@ -0,0 +1,134 @@
+"""
+Benchmark de carga mista: logins (bcrypt) concorrendo com leituras de
+restaurantes, no Gunicorn configurado para produção.
+
+Sobe o Gunicorn com deploy/gunicorn_config.py e o worker configurado
+(GUNICORN_WORKER_CLASS, padrão sync) e mede p50/p99 dos logins e das
+leituras, contando as respostas 503 do hashing saturado, em três modos:
+
+- bcrypt na thread da requisição (PASSWORD_POOL_WORKERS = 0, sem limite);
+- limite por processo (PASSWORD_LOCK_DIR vazio): no worker sync cada
+  processo atende um request, então o limite nunca é atingido;
+- limite do host (PASSWORD_LOCK_DIR, padrão do gunicorn_config.py): no
+  máximo PASSWORD_POOL_WORKERS bcrypt ao mesmo tempo em todos os workers.
+
+Uso: python benchmarks/bench_login.py [segundos] [clientes_login] [clientes_leitura]
+     (padrão: 5 16 4; workers pelo WEB_CONCURRENCY, padrão 2N+1)
+"""
+
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('DATABASE_URL', f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+
+from benchmarks.bench_workers import free_port, percentile, start_gunicorn  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.core.logger import logger  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import Restaurant, User  # noqa: E402
+
+def seed():
+    db.drop_all()
+    db.create_all()
+    user = User(username='bench', email='bench@example.com')
+    user.set_password('Senha1234')
+    db.session.add(user)
+    db.session.add_all(Restaurant(
+        cnpj=f'00.000.000/{i:04d}-00', name=f'Restaurante {i}', state='SP', city='São Paulo',
+        type='Brasileira', operating_hours='Seg-Dom: 11:00-23:00', postal_code='01000-000',
+        street_number=str(i),
+    ) for i in range(200))
+    db.session.commit()
+
+def request(url, body=None):
+    """Executa a requisição e retorna (status, segundos)."""
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=60) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as err:
+        status = err.code
+    return status, time.perf_counter() - start
+
+def load(base_url, seconds, login_clients, read_clients):
+    results = {'login': [], 'read': [], 'rejected': 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def client(kind):
+        url = f'{base_url}/api/auth/login' if kind == 'login' else f'{base_url}/api/restaurants/?limit=50'
+        body = {'email': 'bench@example.com', 'password': 'Senha1234'} if kind == 'login' else None
+        while time.perf_counter() < deadline:
+            status, elapsed = request(url, body)
+            with lock:
+                if status == 503:
+                    results['rejected'] += 1
+                else:
+                    results[kind].append(elapsed)
+
+    threads = [threading.Thread(target=client, args=('login',)) for _ in range(login_clients)]
+    threads += [threading.Thread(target=client, args=('read',)) for _ in range(read_clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+def run(seconds, login_clients, read_clients):
+    logger.setLevel(logging.WARNING)
+    app = create_app('production')
+    with app.app_context():
+        seed()
+        db.engine.dispose()
+
+    worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'sync')
+    workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+    threads = int(os.getenv('GUNICORN_THREADS', '1'))
+    pool = app.config['PASSWORD_POOL_WORKERS']
+    print(f'Gunicorn {worker_class}, {workers} workers; {login_clients} clientes de login, '
+          f'{read_clients} de leitura, {seconds}s por modo\n')
+
+    log_dir = tempfile.mkdtemp()
+    modes = [
+        ('bcrypt na thread da requisição', {'PASSWORD_POOL_WORKERS': '0', 'PASSWORD_LOCK_DIR': ''}),
+        (f'limite por processo ({pool} por worker)', {'PASSWORD_LOCK_DIR': ''}),
+        (f'limite do host ({pool} no total)', {'PASSWORD_LOCK_DIR': tempfile.mkdtemp()}),
+    ]
+    for label, env in modes:
+        previous = {name: os.environ.get(name) for name in env}
+        os.environ.update(env, CACHE_BACKEND='none')
+        port = free_port()
+        process = start_gunicorn(worker_class, workers, threads, port, log_dir)
+        try:
+            results = load(f'http://127.0.0.1:{port}', seconds, login_clients, read_clients)
+        finally:
+            process.terminate()
+            process.wait()
+            for name, value in previous.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+        print(f"{label}:")
+        print(f"  logins:   {len(results['login']):5d}  p50 {percentile(results['login'], .5) * 1000:7.1f} ms"
+              f"  p99 {percentile(results['login'], .99) * 1000:7.1f} ms  (503: {results['rejected']})")
+        print(f"  leituras: {len(results['read']):5d}  p50 {percentile(results['read'], .5) * 1000:7.1f} ms"
+              f"  p99 {percentile(results['read'], .99) * 1000:7.1f} ms")
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    run(*(args + [5, 16, 4][len(args):]))
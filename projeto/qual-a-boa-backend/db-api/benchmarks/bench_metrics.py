@@ -0,0 +1,70 @@
+"""
+Benchmark do custo das métricas por requisição.
+
+Mede, dentro de um contexto de requisição, o tempo dos hooks before/after
+request das métricas e do monitor de consultas (sem o restante da
+requisição) e o custo adicionado a cada consulta SQL pelos eventos do engine. Roda duas vezes: com o registro
+em memória do processo e em modo multiprocesso (PROMETHEUS_MULTIPROC_DIR,
+como sob o Gunicorn).
+
+Uso: python benchmarks/bench_metrics.py [repetições]
+     (padrão: 100000)
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DATABASE_URL', f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+def measure(total):
+    from flask import Response
+    from sqlalchemy import event, text
+
+    from app import create_app
+    from app.extensions import db
+    from app.services import metrics, query_monitor as monitor
+
+    app = create_app('production')
+    response = Response('{}', mimetype='application/json')
+    response.headers['X-Cache'] = 'HIT'
+
+    with app.test_request_context('/api/restaurants/1'):
+        app.preprocess_request()  # resolve request.endpoint como em uma requisição real
+        start = time.perf_counter()
+        for _ in range(total):
+            metrics._before_request()
+            monitor.query_monitor._before_request()
+            monitor.query_monitor._after_request(response)
+            metrics._after_request(response)
+        hooks = (time.perf_counter() - start) / total
+
+        queries = max(total // 10, 1000)
+        with db.engine.connect() as connection:
+            def run_queries():
+                begin = time.perf_counter()
+                for _ in range(queries):
+                    connection.execute(text('SELECT 1'))
+                return (time.perf_counter() - begin) / queries
+
+            with_events = run_queries()
+            event.remove(db.engine.__class__, 'before_cursor_execute', monitor._before_cursor_execute)
+            event.remove(db.engine.__class__, 'after_cursor_execute', monitor._after_cursor_execute)
+            without_events = run_queries()
+
+    mode = 'multiprocesso' if 'PROMETHEUS_MULTIPROC_DIR' in os.environ else 'processo único'
+    print(f'{mode:<15} hooks por requisição: {hooks * 1e6:6.2f} µs   '
+          f'por consulta SQL: {(with_events - without_events) * 1e6:6.2f} µs')
+
+if __name__ == '__main__':
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    if os.environ.get('BENCH_METRICS_CHILD'):
+        measure(total)
+    else:
+        for env in ({}, {'PROMETHEUS_MULTIPROC_DIR': tempfile.mkdtemp()}):
+            subprocess.run([sys.executable, __file__, str(total)],
+                           env={**os.environ, **env, 'BENCH_METRICS_CHILD': '1'}, check=True)
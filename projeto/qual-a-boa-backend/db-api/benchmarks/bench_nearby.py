@@ -0,0 +1,144 @@
+"""
+Benchmark da busca por proximidade (GET /api/restaurants/nearby).
+
+Popula um banco com restaurantes espalhados em torno das capitais (as
+coordenadas são sorteadas diretamente, como se a tabela de CEPs tivesse
+precisão de rua) e mede, para cada raio, a busca da rota (raios crescentes,
+`nearby_restaurants`), uma única consulta pela grade espacial
+(`nearby_statement`, que lê apenas as células do raio pelo índice de
+geo_cell) e a mesma consulta sem o filtro de células, que percorre a tabela
+inteira. Os resultados da grade e da tabela são conferidos.
+
+O banco SQLite fica em --data-dir e é reutilizado entre execuções.
+
+Uso: python benchmarks/bench_nearby.py [--rows 1m] [--queries 50]
+"""
+
+import argparse
+import math
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+# A consulta sem grade é lenta de propósito: não registra no log de consultas lentas
+os.environ.setdefault('QUERY_SLOW_MS', '0')
+
+from benchmarks.bench_suite import parse_rows  # noqa: E402
+
+RADII_KM = (1, 5, 20)
+
+def seed(rows, centers, batch_size=20000):
+    from sqlalchemy import func, insert, select
+
+    from app.extensions import db
+    from app.models import Restaurant
+    from app.utils.geo import geo_cell
+
+    db.create_all()
+    total = db.session.execute(select(func.count(Restaurant.id))).scalar()
+    if total >= rows:
+        print(f'Reutilizando catálogo com {total} restaurantes')
+        return
+    db.drop_all()
+    db.create_all()
+    print(f'Populando {rows} restaurantes...')
+    start = time.perf_counter()
+    rng = random.Random(42)
+    for first in range(0, rows, batch_size):
+        batch = []
+        for number in range(first, min(first + batch_size, rows)):
+            center_lat, center_lon = centers[number % len(centers)]
+            lat = center_lat + rng.gauss(0, 0.15)
+            lon = center_lon + rng.gauss(0, 0.15)
+            batch.append({
+                'cnpj': f'{number:014d}', 'name': f'Restaurante {number}', 'state': 'SP', 'city': 'Cidade',
+                'type': 'Brasileira', 'postal_code': '00000-000', 'street_number': '1',
+                'latitude': lat, 'longitude': lon, 'geo_cell': geo_cell(lat, lon),
+            })
+        db.session.execute(insert(Restaurant.__table__), batch)
+    db.session.commit()
+    print(f'Catálogo criado em {time.perf_counter() - start:.1f}s')
+
+def measure(run, queries):
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        run(query)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark da busca por proximidade')
+    parser.add_argument('--rows', default='1m', help='Restaurantes no catálogo (1k, 100k, 1m)')
+    parser.add_argument('--queries', type=int, default=50, help='Consultas por raio')
+    parser.add_argument('--limit', type=int, default=20, help='Resultados por consulta')
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'qualaboa-bench'),
+                        help='Diretório do banco SQLite')
+    args = parser.parse_args()
+
+    rows = parse_rows(args.rows)
+    os.makedirs(args.data_dir, exist_ok=True)
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(args.data_dir, f'nearby_{rows}.db')}"
+
+    from sqlalchemy import select
+
+    from app import create_app
+    from app.extensions import db
+    from app.models import Restaurant
+    from app.services.geo import (
+        CANDIDATE_MARGIN, EXTRA_CANDIDATES, NearbyQuery, nearby_restaurants, nearby_statement,
+    )
+    from app.utils.geo import KM_PER_DEGREE, cep_coordinates
+
+    app = create_app('production')
+    with app.app_context():
+        cep_coordinates.load()
+        centers = sorted(set(cep_coordinates._table.values()))
+        seed(rows, centers)
+
+        def full_scan(query):
+            # Mesmo filtro e ordem da grade, sem restringir as células
+            scale = math.cos(math.radians(query.lat))
+            approx = (Restaurant.latitude - query.lat) * (Restaurant.latitude - query.lat) \
+                + (Restaurant.longitude - query.lon) * scale * (Restaurant.longitude - query.lon) * scale
+            max_degrees = query.radius_km / KM_PER_DEGREE * CANDIDATE_MARGIN
+            statement = (
+                select(Restaurant.id).where(Restaurant.geo_cell.isnot(None))
+                .where(approx <= max_degrees * max_degrees)
+                .order_by(approx, Restaurant.id).limit(query.limit + EXTRA_CANDIDATES)
+            )
+            return db.session.execute(statement).all()
+
+        def grid(query):
+            return db.session.execute(nearby_statement(query)).all()
+
+        def endpoint(query):
+            # Busca completa da rota: raios crescentes e refinamento exato
+            return nearby_restaurants(query)
+
+        rng = random.Random(7)
+        print(f'{"raio":>6} {"rota p50":>9} {"rota p95":>9} {"grade p50":>10} {"grade p95":>10} '
+              f'{"tabela p50":>11} {"tabela p95":>11}  resultados')
+        for radius in RADII_KM:
+            queries = []
+            for _ in range(args.queries):
+                lat, lon = rng.choice(centers)
+                queries.append(NearbyQuery(lat + rng.gauss(0, 0.1), lon + rng.gauss(0, 0.1), radius, args.limit))
+            for query in queries[:5]:
+                assert [row.id for row in grid(query)] == [row.id for row in full_scan(query)]
+            route_p50, route_p95 = measure(endpoint, queries)
+            grid_p50, grid_p95 = measure(grid, queries)
+            scan_p50, scan_p95 = measure(full_scan, queries[:max(5, args.queries // 10)])
+            found = statistics.mean(len(nearby_restaurants(query)) for query in queries[:10])
+            print(f'{radius:>4}km {route_p50:>7.2f}ms {route_p95:>7.2f}ms {grid_p50:>8.2f}ms {grid_p95:>8.2f}ms '
+                  f'{scan_p50:>9.2f}ms {scan_p95:>9.2f}ms  {found:.0f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""
+Benchmark do filtro "aberto agora" (open_at/open_now da rota /search).
+
+Popula um banco com restaurantes de horários variados (turno único, almoço
+e jantar, madrugada, 24h, fechado aos domingos) e mede, para instantes
+sorteados da semana:
+
+- a página de 20 restaurantes abertos pelo índice dos intervalos
+  (`search_page` com o critério open_at);
+- a contagem de restaurantes abertos (como em /facets);
+- a alternativa sem intervalos: ler `operating_hours` de todas as linhas e
+  interpretar o texto na aplicação a cada requisição.
+
+O banco SQLite fica em --data-dir e é reutilizado entre execuções.
+
+Uso: python benchmarks/bench_open_hours.py [--rows 1m] [--queries 50]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+# A alternativa sem índice é lenta de propósito: não registra no log de consultas lentas
+os.environ.setdefault('QUERY_SLOW_MS', '0')
+
+from benchmarks.bench_suite import parse_rows  # noqa: E402
+
+HOURS = (
+    'Seg-Sex: 11:00-23:00, Sáb-Dom: 12:00-00:00',
+    'Mon-Fri: 11:00-15:00, 18:00-23:00, Sat: 18:00-02:00',
+    'Ter-Dom: 18:00-23:30',
+    'Seg-Sáb: 07:00-19:00; Domingo: fechado',
+    '24h',
+    'Qui-Sáb: 20:00-05:00',
+    '11:00-15:00',
+)
+
+def seed(rows, batch_size=20000):
+    from sqlalchemy import func, insert, select
+
+    from app.extensions import db
+    from app.models import Restaurant
+    from app.models.restaurant_hours import insert_opening_hours
+
+    db.create_all()
+    total = db.session.execute(select(func.count(Restaurant.id))).scalar()
+    if total >= rows:
+        print(f'Reutilizando catálogo com {total} restaurantes')
+        return
+    db.drop_all()
+    db.create_all()
+    print(f'Populando {rows} restaurantes...')
+    start = time.perf_counter()
+    table = Restaurant.__table__
+    for first in range(0, rows, batch_size):
+        batch = [{
+            'cnpj': f'{number:014d}', 'name': f'Restaurante {number}', 'state': 'SP', 'city': 'Cidade',
+            'type': 'Brasileira', 'postal_code': '00000-000', 'street_number': '1',
+            'operating_hours': HOURS[number % len(HOURS)],
+        } for number in range(first, min(first + batch_size, rows))]
+        ids = db.session.execute(insert(table).returning(table.c.id, sort_by_parameter_order=True), batch).scalars().all()
+        insert_opening_hours(db.session, zip(ids, (row['operating_hours'] for row in batch)))
+    db.session.commit()
+    print(f'Catálogo criado em {time.perf_counter() - start:.1f}s')
+
+def measure(run, minutes):
+    timings = []
+    for minute in minutes:
+        start = time.perf_counter()
+        run(minute)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[max(int(len(timings) * 0.95) - 1, 0)]
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark do filtro open_at/open_now')
+    parser.add_argument('--rows', default='1m', help='Restaurantes no catálogo (1k, 100k, 1m)')
+    parser.add_argument('--queries', type=int, default=50, help='Instantes sorteados')
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'qualaboa-bench'),
+                        help='Diretório do banco SQLite')
+    args = parser.parse_args()
+
+    rows = parse_rows(args.rows)
+    os.makedirs(args.data_dir, exist_ok=True)
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(args.data_dir, f'open_hours_{rows}.db')}"
+
+    from sqlalchemy import func, select
+
+    from app import create_app
+    from app.extensions import db
+    from app.models import Restaurant
+    from app.services.opening_hours import open_at_filter
+    from app.services.pagination import Page
+    from app.services.search import search_page
+    from app.utils.opening_hours import MINUTES_PER_WEEK, OperatingHoursError, parse_operating_hours
+
+    app = create_app('production')
+    with app.app_context():
+        seed(rows)
+        rng = random.Random(7)
+        minutes = [rng.randrange(MINUTES_PER_WEEK) for _ in range(args.queries)]
+
+        def page(minute):
+            return search_page({'open_at': minute}, Page(limit=20, after=0, fields=Restaurant.PUBLIC_FIELDS))[0]
+
+        def count(minute):
+            return db.session.execute(select(func.count(Restaurant.id)).where(open_at_filter(minute, aggregate=True))).scalar()
+
+        def parse_each_row(minute):
+            # Sem intervalos compilados: interpreta o texto de cada linha
+            total = 0
+            for text, in db.session.execute(select(Restaurant.operating_hours)):
+                try:
+                    intervals = parse_operating_hours(text)
+                except OperatingHoursError:
+                    continue
+                total += any(start <= minute < end for start, end in intervals)
+            return total
+
+        for minute in minutes[:3]:
+            assert count(minute) == parse_each_row(minute)
+
+        print(f'{"consulta":<32} {"p50":>10} {"p95":>10}')
+        for label, run, sample in (
+            ('página de 20 (índice)', page, minutes),
+            ('contagem (índice)', count, minutes),
+            ('texto de cada linha', parse_each_row, minutes[:3]),
+        ):
+            p50, p95 = measure(run, sample)
+            print(f'{label:<32} {p50:>8.2f}ms {p95:>8.2f}ms')
+        print(f'Abertos em média: {statistics.mean(count(minute) for minute in minutes[:10]):.0f} de {rows}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Micro-benchmark da serialização das listagens de restaurantes.
+
+Compara o caminho antigo (objetos ORM + `to_dict()` + `jsonify`) com o
+caminho atual (tuplas de colunas + codificador de linha pré-compilado) e,
+se instalado, com o orjson. Usa um banco SQLite temporário, a menos que
+DATABASE_URL esteja definida.
+
+Uso: python benchmarks/bench_serialization.py [linhas ...]   (padrão: 1000 100000)
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DATABASE_URL', f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+
+from flask import jsonify
+from sqlalchemy import insert
+
+from app import create_app
+from app.extensions import db
+from app.models import Restaurant
+from app.services.pagination import select_fields
+from app.services.serialization import json_response, orjson
+
+def seed(total):
+    """Recria a tabela com `total` restaurantes sintéticos."""
+    db.drop_all()
+    db.create_all()
+    rows = [{
+        'cnpj': f'{i:014d}', 'name': f'Restaurante {i}', 'state': 'SP', 'city': 'São Paulo',
+        'type': 'Brasileira', 'operating_hours': 'Seg-Dom: 11:00-23:00', 'postal_code': '01234-567',
+        'street_number': str(i % 1000), 'name_search': f'restaurante {i}', 'city_search': 'sao paulo',
+        'type_search': 'brasileira',
+    } for i in range(total)]
+    for start in range(0, total, 10000):
+        db.session.execute(insert(Restaurant.__table__), rows[start:start + 10000])
+    db.session.commit()
+
+def old_path(total):
+    restaurants = Restaurant.query.order_by(Restaurant.id).limit(total).all()
+    return jsonify([restaurant.to_dict() for restaurant in restaurants]).get_data()
+
+def new_path(total):
+    statement = select_fields(Restaurant.PUBLIC_FIELDS).order_by(Restaurant.id).limit(total)
+    response, _ = json_response(db.session.execute(statement).all())
+    return response.get_data()
+
+def measure(function, total, repeat=3):
+    """Retorna o menor tempo de `repeat` execuções e o corpo gerado."""
+    best = None
+    for _ in range(repeat):
+        db.session.expunge_all()
+        start = time.perf_counter()
+        body = function(total)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, body
+
+def run(sizes):
+    app = create_app('production')
+    with app.app_context():
+        for total in sizes:
+            seed(total)
+            old_time, old_body = measure(old_path, total)
+            new_time, new_body = measure(new_path, total)
+            assert new_body == old_body, 'A saída do caminho rápido difere de jsonify'
+            print(f"{total} linhas:")
+            print(f"  ORM + to_dict + jsonify: {old_time * 1000:9.1f} ms")
+            print(f"  tuplas + codificador:    {new_time * 1000:9.1f} ms ({old_time / new_time:.1f}x)")
+            if orjson is not None:
+                app.config['JSON_BACKEND'] = 'orjson'
+                orjson_time, _ = measure(new_path, total)
+                app.config['JSON_BACKEND'] = 'json'
+                print(f"  tuplas + orjson:         {orjson_time * 1000:9.1f} ms ({old_time / orjson_time:.1f}x)")
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or [1000, 100000])
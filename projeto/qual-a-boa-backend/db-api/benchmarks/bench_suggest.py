@@ -0,0 +1,112 @@
+"""
+Benchmark das sugestões por prefixo (GET /api/restaurants/suggest).
+
+Usa o catálogo sintético do bench_suite (nomes e cidades acentuados) e mede:
+
+- a construção da estrutura em memória a partir do banco;
+- `suggest_index.suggest` para prefixos de 1 a 8 caracteres tirados dos
+  próprios valores, na primeira vez (trecho percorrido) e em regime;
+- o mesmo em regime com escritas intercaladas (uma alteração confirmada a
+  cada 10 consultas), que reposicionam os valores memorizados;
+- a rota completa pelo cliente de testes do Flask (sem rede);
+- a alternativa atual do frontend, /search?name=<prefixo>&limit=10.
+
+O banco SQLite fica em --data-dir e é o mesmo do bench_suite.
+
+Uso: python benchmarks/bench_suggest.py [--rows 1m] [--queries 5000]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+os.environ.setdefault('QUERY_SLOW_MS', '0')
+os.environ.setdefault('CACHE_BACKEND', 'none')
+
+from benchmarks.bench_suite import parse_rows, restaurant_row, seed  # noqa: E402
+
+def percentiles(timings):
+    timings = sorted(timings)
+    return statistics.median(timings), timings[max(int(len(timings) * 0.99) - 1, 0)]
+
+def report(label, timings):
+    p50, p99 = percentiles(timings)
+    print(f'{label:<40} {p50 * 1000:>9.1f}µs {p99 * 1000:>9.1f}µs')
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark das sugestões por prefixo')
+    parser.add_argument('--rows', default='1m', help='Restaurantes no catálogo (1k, 100k, 1m)')
+    parser.add_argument('--queries', type=int, default=5000, help='Consultas por medição')
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'qualaboa-bench'),
+                        help='Diretório do banco SQLite')
+    args = parser.parse_args()
+
+    rows = parse_rows(args.rows)
+    os.makedirs(args.data_dir, exist_ok=True)
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(args.data_dir, f'restaurants_{rows}.db')}"
+
+    from app import create_app
+    from app.models import Restaurant
+    from app.services.suggest import suggest_index
+
+    app = create_app('production')
+    with app.app_context():
+        seed(rows)
+
+        start = time.perf_counter()
+        total = suggest_index.rebuild()
+        usage = suggest_index.memory_usage()
+        print(f'Estrutura construída com {total} restaurantes em {time.perf_counter() - start:.1f}s '
+              f"({usage['name']['values']} nomes, {usage['city']['values']} cidades distintas)")
+
+        rng = random.Random(11)
+        values = {field: list(suggest_index._counts[field]) for field in suggest_index.FIELDS}
+        queries = []
+        for _ in range(args.queries):
+            field = rng.choice(('name', 'name', 'city'))
+            value = rng.choice(values[field])
+            queries.append((field, value[:rng.randint(1, min(8, len(value)))]))
+
+        def run(sample, writes=False):
+            timings = []
+            for number, (field, prefix) in enumerate(sample):
+                if writes and number % 10 == 0:
+                    row = restaurant_row(rng.randrange(rows), rng)
+                    row.update(Restaurant.derived_columns(row))
+                    suggest_index.apply({rng.randrange(1, rows + 1): {
+                        'name': (row['name_search'], row['name']), 'city': (row['city_search'], row['city']),
+                    }})
+                start = time.perf_counter()
+                suggest_index.suggest(field, prefix, 10)
+                timings.append((time.perf_counter() - start) * 1000)
+            return timings
+
+        print(f'{"medição":<40} {"p50":>11} {"p99":>11}')
+        report('estrutura, primeira consulta', run(queries))
+        report('estrutura, em regime', run(queries))
+        report('estrutura, com escritas a cada 10', run(queries, writes=True))
+
+        client = app.test_client()
+        timings = []
+        for field, prefix in queries[:2000]:
+            start = time.perf_counter()
+            client.get('/api/restaurants/suggest', query_string={'q': prefix, 'field': field})
+            timings.append((time.perf_counter() - start) * 1000)
+        report('rota /suggest (cliente de testes)', timings)
+
+        timings = []
+        for field, prefix in queries[:50]:
+            start = time.perf_counter()
+            client.get('/api/restaurants/search', query_string={field: prefix, 'limit': 10})
+            timings.append((time.perf_counter() - start) * 1000)
+        report('rota /search (alternativa atual)', timings)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,383 @@
+"""
+Suíte de benchmarks dos endpoints da API.
+
+Sobe a aplicação localmente (no próprio processo, com o servidor WSGI do
+Werkzeug em threads, ou com o Gunicorn), popula um catálogo sintético de
+restaurantes com cidades brasileiras acentuadas e aplica, cenário por
+cenário, carga com a concorrência pedida sobre listagem, detalhe, busca,
+login e criação de restaurantes. Para cada cenário informa vazão, p50, p95,
+p99 e erros, e grava o resultado em JSON (com o commit atual) para comparar
+execuções de commits diferentes com --compare.
+
+O catálogo fica em um banco SQLite por tamanho em --data-dir e é reutilizado
+entre execuções; use --database-url para medir contra o PostgreSQL.
+
+Observação: a configuração 'testing' roda com DEBUG (JSON indentado) e bcrypt
+de custo 4; use --config production para números próximos aos de produção.
+
+Uso:
+    python benchmarks/bench_suite.py --rows 100k --concurrency 16 --duration 10
+    python benchmarks/bench_suite.py --rows 1m --server gunicorn --workers 4
+    python benchmarks/bench_suite.py --compare benchmarks/results/anterior.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+SCENARIOS = ('list', 'detail', 'search', 'login', 'write')
+
+CITIES = [
+    ('São Paulo', 'SP'), ('Ribeirão Preto', 'SP'), ('Jundiaí', 'SP'), ('São José dos Campos', 'SP'),
+    ('Niterói', 'RJ'), ('Petrópolis', 'RJ'), ('Belo Horizonte', 'MG'), ('Uberlândia', 'MG'),
+    ('Florianópolis', 'SC'), ('Itajaí', 'SC'), ('Curitiba', 'PR'), ('Maringá', 'PR'),
+    ('Porto Alegre', 'RS'), ('Goiânia', 'GO'), ('Brasília', 'DF'), ('Cuiabá', 'MT'),
+    ('Belém', 'PA'), ('São Luís', 'MA'), ('Teresina', 'PI'), ('Maceió', 'AL'),
+    ('João Pessoa', 'PB'), ('Mossoró', 'RN'), ('Vitória', 'ES'), ('Salvador', 'BA'),
+]
+TYPES = ['Brasileira', 'Italiana', 'Japonesa', 'Churrascaria', 'Pizzaria', 'Árabe',
+         'Mexicana', 'Vegetariana', 'Frutos do Mar', 'Lanchonete']
+NAME_PREFIXES = ['Cantina', 'Sabor', 'Cozinha', 'Empório', 'Boteco', 'Galeto', 'Recanto', 'Cafeteria']
+NAME_WORDS = ['Mineiro', 'Baiana', 'Gaúcho', 'Nordestino', 'Açaí', 'Pão de Queijo', 'Feijão', 'Caiçara']
+
+BENCH_EMAIL = 'bench@example.com'
+BENCH_PASSWORD = 'Senha1234'
+
+def parse_rows(text):
+    """Converte '1k', '100k' ou '1m' em quantidade de linhas."""
+    text = text.lower()
+    multiplier = {'k': 1000, 'm': 1000000}.get(text[-1], 1)
+    return int(float(text.rstrip('km')) * multiplier)
+
+def cnpj(number, branch=1):
+    return f'{number // 1000000 % 100:02d}.{number // 1000 % 1000:03d}.{number % 1000:03d}/{branch:04d}-{number % 100:02d}'
+
+def restaurant_row(number, rng):
+    city, state = CITIES[number % len(CITIES)]
+    return {
+        'cnpj': cnpj(number),
+        'name': f'{rng.choice(NAME_PREFIXES)} {rng.choice(NAME_WORDS)} {number}',
+        'state': state,
+        'city': city,
+        'type': TYPES[number % len(TYPES)],
+        'operating_hours': 'Seg-Sex: 11:00-23:00, Sáb-Dom: 12:00-00:00',
+        'postal_code': f'{rng.randrange(10000, 100000)}-{number % 1000:03d}',
+        'street_number': str(number % 5000 + 1),
+    }
+
+def seed(rows, reseed=False, batch_size=10000):
+    """
+    Popula o banco configurado com `rows` restaurantes e o usuário do benchmark.
+
+    Reaproveita o banco quando ele já tem o catálogo e o usuário.
+    """
+    from sqlalchemy import func, insert, select
+
+    from app.extensions import db
+    from app.models import Restaurant, User
+    from app.models.restaurant_hours import insert_opening_hours
+
+    if not reseed:
+        try:
+            total = db.session.execute(select(func.count(Restaurant.id))).scalar()
+            user = db.session.execute(select(User.id).filter_by(email=BENCH_EMAIL)).scalar()
+            if total >= rows and user is not None:
+                print(f'Reutilizando catálogo com {total} restaurantes')
+                return
+        except Exception:
+            db.session.rollback()
+
+    print(f'Populando {rows} restaurantes...')
+    start = time.perf_counter()
+    db.drop_all()
+    db.create_all()
+    rng = random.Random(42)
+    for first in range(0, rows, batch_size):
+        batch = [restaurant_row(number, rng) for number in range(first, min(first + batch_size, rows))]
+        for row in batch:
+            row.update(Restaurant.derived_columns(row))
+        table = Restaurant.__table__
+        ids = db.session.execute(insert(table).returning(table.c.id, sort_by_parameter_order=True), batch).scalars().all()
+        insert_opening_hours(db.session, zip(ids, (row['operating_hours'] for row in batch)))
+    user = User(username='bench', email=BENCH_EMAIL)
+    user.set_password(BENCH_PASSWORD)
+    db.session.add(user)
+    db.session.commit()
+    print(f'Catálogo criado em {time.perf_counter() - start:.1f}s')
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def wait_ready(base_url, process=None, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f'Servidor terminou com código {process.returncode}')
+        try:
+            urllib.request.urlopen(f'{base_url}/api/restaurants/?limit=1').read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'Servidor não respondeu em {timeout} segundos')
+
+def start_inprocess(app):
+    from werkzeug.serving import make_server
+
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f'http://127.0.0.1:{server.server_port}', server.shutdown
+
+def start_gunicorn(args):
+    port = free_port()
+    env = dict(
+        os.environ,
+        FLASK_ENV=args.config,
+        GUNICORN_WORKER_CLASS=args.worker_class,
+        WEB_CONCURRENCY=str(args.workers),
+        GUNICORN_THREADS=str(args.threads),
+    )
+    log_dir = tempfile.mkdtemp()
+    process = subprocess.Popen([
+        sys.executable, '-m', 'gunicorn', '-c', 'deploy/gunicorn_config.py',
+        '--bind', f'127.0.0.1:{port}', '--log-level', 'warning',
+        '--error-logfile', os.path.join(log_dir, 'error.log'),
+        '--access-logfile', os.path.join(log_dir, 'access.log'),
+        'run:app',
+    ], cwd=ROOT, env=env)
+    base_url = f'http://127.0.0.1:{port}'
+    try:
+        wait_ready(base_url, process)
+    except RuntimeError:
+        process.terminate()
+        raise
+
+    def stop():
+        process.terminate()
+        process.wait()
+    return base_url, stop
+
+def call(method, url, body=None, headers=None):
+    """Executa a requisição e retorna (status, segundos, corpo)."""
+    data = json.dumps(body).encode() if body is not None else None
+    request = urllib.request.Request(url, data=data, method=method,
+                                     headers={'Content-Type': 'application/json', **(headers or {})})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            payload = response.read()
+            status = response.status
+    except urllib.error.HTTPError as err:
+        payload, status = err.read(), err.code
+    except OSError:
+        payload, status = b'', 0
+    return status, time.perf_counter() - start, payload
+
+def build_requests(rows, token):
+    """Gera, por cenário, uma função que sorteia (método, caminho, corpo, cabeçalhos)."""
+    auth = {'Authorization': f'Bearer {token}'}
+    counter = iter(range(10 ** 8))
+    lock = threading.Lock()
+    # Filial sorteada por execução: os CNPJs não colidem com os do catálogo
+    # nem com os criados em execuções anteriores sobre o mesmo banco
+    branch = random.randint(2, 9999)
+
+    def write():
+        with lock:
+            number = next(counter)
+        row = restaurant_row(number, random)
+        row['cnpj'] = cnpj(number, branch=branch)
+        return 'POST', '/api/restaurants/', row, auth
+
+    def search():
+        city, _ = random.choice(CITIES)
+        params = urllib.parse.urlencode({'city': city[:random.randint(3, len(city))],
+                                         'name': random.choice(NAME_WORDS), 'limit': 20})
+        return 'GET', f'/api/restaurants/search?{params}', None, None
+
+    return {
+        'list': lambda: ('GET', f'/api/restaurants/?limit=50&after={random.randrange(rows)}', None, None),
+        'detail': lambda: ('GET', f'/api/restaurants/{random.randint(1, rows)}', None, None),
+        'search': search,
+        'login': lambda: ('POST', '/api/auth/login', {'email': BENCH_EMAIL, 'password': BENCH_PASSWORD}, None),
+        'write': write,
+    }
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+def run_scenario(base_url, make_request, concurrency, duration):
+    durations, statuses = [], {}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client():
+        local, local_statuses = [], {}
+        while time.perf_counter() < deadline:
+            method, path, body, headers = make_request()
+            status, elapsed, _ = call(method, base_url + path, body, headers)
+            local.append(elapsed)
+            local_statuses[status] = local_statuses.get(status, 0) + 1
+        with lock:
+            durations.extend(local)
+            for status, count in local_statuses.items():
+                statuses[status] = statuses.get(status, 0) + count
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    durations.sort()
+    return {
+        'requests': len(durations),
+        'throughput': round(len(durations) / elapsed, 2),
+        'p50_ms': round(percentile(durations, .50) * 1000, 2),
+        'p95_ms': round(percentile(durations, .95) * 1000, 2),
+        'p99_ms': round(percentile(durations, .99) * 1000, 2),
+        'mean_ms': round(statistics.mean(durations) * 1000, 2) if durations else 0.0,
+        'errors': sum(count for status, count in statuses.items() if not 200 <= status < 300),
+        'statuses': {str(status): count for status, count in sorted(statuses.items())},
+    }
+
+def git_commit():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no', '.'], cwd=ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'desconhecido'
+    return f'{commit}-dirty' if dirty else commit
+
+def print_report(results, baseline=None):
+    print(f"\n{'cenário':<8} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'erros':>6}")
+    for name, result in results['scenarios'].items():
+        line = (f"{name:<8} {result['throughput']:9.1f} {result['p50_ms']:8.1f} "
+                f"{result['p95_ms']:8.1f} {result['p99_ms']:8.1f} {result['errors']:6d}")
+        previous = (baseline or {}).get('scenarios', {}).get(name)
+        if previous and previous['throughput']:
+            change = (result['throughput'] / previous['throughput'] - 1) * 100
+            p99_change = (result['p99_ms'] / previous['p99_ms'] - 1) * 100 if previous['p99_ms'] else 0.0
+            line += f"   vazão {change:+6.1f}%  p99 {p99_change:+6.1f}%"
+        print(line)
+    if baseline:
+        print(f"\n(comparado com {baseline['commit']} de {baseline['timestamp']})")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark dos endpoints da API de restaurantes.')
+    parser.add_argument('--rows', type=parse_rows, default=parse_rows('1k'),
+                        help='Restaurantes no catálogo: 1k, 100k, 1m ou um número (padrão: 1k)')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS),
+                        help=f"Cenários separados por vírgula (padrão: {','.join(SCENARIOS)})")
+    parser.add_argument('--concurrency', type=int, default=16, help='Clientes simultâneos (padrão: 16)')
+    parser.add_argument('--duration', type=float, default=10, help='Segundos por cenário (padrão: 10)')
+    parser.add_argument('--config', default='testing', help="Configuração do create_app (padrão: testing)")
+    parser.add_argument('--server', choices=('inprocess', 'gunicorn'), default='inprocess')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Workers do Gunicorn')
+    parser.add_argument('--worker-class', default='sync', help='Classe de worker do Gunicorn')
+    parser.add_argument('--threads', type=int, default=1, help='Threads por worker (gthread)')
+    parser.add_argument('--cache', choices=('local', 'redis', 'none'),
+                        help='CACHE_BACKEND durante a medição (padrão: o da configuração)')
+    parser.add_argument('--database-url', help='Banco a usar em vez do SQLite de --data-dir')
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'qualaboa-bench'),
+                        help='Diretório dos catálogos SQLite reutilizados entre execuções')
+    parser.add_argument('--reseed', action='store_true', help='Recria o catálogo mesmo se já existir')
+    parser.add_argument('--output', help='Arquivo JSON do resultado (padrão: benchmarks/results/)')
+    parser.add_argument('--compare', help='Resultado JSON anterior para comparação')
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    scenarios = [name for name in args.scenarios.split(',') if name]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        sys.exit(f"Cenários desconhecidos: {', '.join(sorted(unknown))}")
+
+    # A configuração é lida na importação de app.config: o ambiente vem antes
+    os.makedirs(args.data_dir, exist_ok=True)
+    database_url = args.database_url or f"sqlite:///{os.path.join(args.data_dir, f'restaurants_{args.rows}.db')}"
+    os.environ['DATABASE_URL'] = os.environ['TEST_DATABASE_URL'] = database_url
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+    if args.cache:
+        os.environ['CACHE_BACKEND'] = args.cache
+    sys.path.insert(0, ROOT)
+
+    from app import create_app
+    from app.core.logger import logger
+
+    logger.setLevel(os.environ['LOG_LEVEL'])
+    app = create_app(args.config)
+    with app.app_context():
+        seed(args.rows, reseed=args.reseed)
+
+    if args.server == 'gunicorn':
+        base_url, stop = start_gunicorn(args)
+    else:
+        base_url, stop = start_inprocess(app)
+
+    try:
+        status, _, payload = call('POST', f'{base_url}/api/auth/login',
+                                  {'email': BENCH_EMAIL, 'password': BENCH_PASSWORD})
+        if status != 200:
+            sys.exit(f'Login do usuário de benchmark falhou ({status})')
+        requests = build_requests(args.rows, json.loads(payload)['access_token'])
+
+        results = {
+            'commit': git_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'config': args.config,
+            'server': args.server if args.server == 'inprocess' else
+                      f'gunicorn {args.worker_class} {args.workers}x{args.threads}',
+            'database': 'sqlite' if database_url.startswith('sqlite') else database_url.split(':', 1)[0],
+            'cache': os.environ.get('CACHE_BACKEND', app.config['CACHE_BACKEND']),
+            'rows': args.rows,
+            'concurrency': args.concurrency,
+            'duration': args.duration,
+            'scenarios': {},
+        }
+        for name in scenarios:
+            print(f'Executando {name}...')
+            results['scenarios'][name] = run_scenario(base_url, requests[name], args.concurrency, args.duration)
+    finally:
+        stop()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            baseline = json.load(file)
+    print_report(results, baseline)
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')
+        output = os.path.join(RESULTS_DIR, f"{stamp}_{results['commit']}_{args.rows}.json")
+    with open(output, 'w', encoding='utf-8') as file:
+        json.dump(results, file, ensure_ascii=False, indent=2)
+    print(f'\nResultado gravado em {output}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Micro-benchmark da validação das requisições de escrita de restaurantes.
+
+Compara, por requisição, o caminho antigo (get_json + `schema.load` do
+Marshmallow descartado + get_json de novo na rota) com o atual
+(`validate_schema(RestaurantCreate)`: decodificação e validação Pydantic em
+uma única passagem, entregando o objeto à rota). O custo do contexto de
+requisição é medido à parte e descontado.
+
+Uso: python benchmarks/bench_validation.py [requisições]   (padrão: 20000)
+"""
+
+import os
+import sys
+import tempfile
+import time
+from functools import wraps
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DATABASE_URL', f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+
+from flask import request
+from marshmallow import Schema, fields
+
+from app import create_app
+from app.schemas.restaurant import RestaurantCreate
+from app.utils.validators import validate_schema
+
+PAYLOAD = {
+    'cnpj': '12.345.678/0001-99', 'name': 'Italian Bistro', 'state': 'SP', 'city': 'São Paulo',
+    'type': 'Italian', 'operating_hours': 'Mon-Fri: 11:00-22:00, Sat-Sun: 12:00-23:00',
+    'postal_code': '01234-567', 'street_number': '123',
+}
+
+class RestaurantSchema(Schema):
+    """Schema do Marshmallow usado pelas rotas antes da validação única."""
+    cnpj = fields.String(required=True)
+    name = fields.String(required=True)
+    state = fields.String(required=True)
+    city = fields.String(required=True)
+    type = fields.String(required=True)
+    operating_hours = fields.String(required=True)
+    postal_code = fields.String(required=True)
+    street_number = fields.String(required=True)
+
+def old_validate_schema(schema):
+    """Decorator antigo: valida e descarta o resultado."""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            schema.load(request.get_json())
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
+
+def baseline_view():
+    return None
+
+@old_validate_schema(RestaurantSchema())
+def old_view():
+    data = request.get_json()
+    return data['cnpj'], data['name'], data['state']
+
+@validate_schema(RestaurantCreate)
+def new_view(data):
+    return data.cnpj, data.name, data.state
+
+def measure(app, view, total):
+    start = time.perf_counter()
+    for _ in range(total):
+        with app.test_request_context('/', method='POST', json=PAYLOAD):
+            view()
+    return time.perf_counter() - start
+
+def run(total):
+    app = create_app('production')
+    baseline = measure(app, baseline_view, total)
+    old_time = measure(app, old_view, total) - baseline
+    new_time = measure(app, new_view, total) - baseline
+    print(f"{total} requisições (descontado o contexto de requisição):")
+    print(f"  get_json + Marshmallow + get_json: {old_time / total * 1e6:7.1f} µs/requisição")
+    print(f"  Pydantic em uma passagem:         {new_time / total * 1e6:7.1f} µs/requisição ({old_time / new_time:.1f}x)")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,181 @@
+"""
+Benchmark de modelos de worker do Gunicorn.
+
+Sobe o Gunicorn com deploy/gunicorn_config.py para cada combinação candidata
+de GUNICORN_WORKER_CLASS, WEB_CONCURRENCY e GUNICORN_THREADS, aplica uma carga
+de leituras (listagem, detalhe e busca) com vários clientes e mede a vazão,
+p50/p99 e erros. Ao final indica a combinação com maior vazão sem erros, com
+as variáveis de ambiente a usar em produção.
+
+Candidatos no formato classe:workers ou classe:workersxthreads, por exemplo
+sync:5, gthread:2x8 ou gevent:2. Sem candidatos, compara sync com N e 2N+1
+workers, gthread com N workers de 4 e 8 threads e, se o gevent estiver
+instalado, gevent com N workers (N = núcleos).
+
+Por padrão usa um banco SQLite temporário; defina DATABASE_URL para medir
+contra o PostgreSQL. Rode o gerador de carga em outra máquina quando os
+clientes disputarem CPU com os workers.
+
+Uso: python benchmarks/bench_workers.py [segundos] [clientes] [candidato ...]
+     (padrão: 10 32)
+"""
+
+import importlib.util
+import logging
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('DATABASE_URL', f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+
+from app import create_app
+from app.core.logger import logger
+from app.extensions import db
+from app.models import Restaurant
+
+RESTAURANTS = 2000
+
+def seed():
+    db.drop_all()
+    db.create_all()
+    db.session.add_all(Restaurant(
+        cnpj=f'00.000.{i // 10000:03d}/{i % 10000:04d}-00', name=f'Restaurante {i}', state='SP',
+        city='São Paulo', type='Brasileira', operating_hours='Seg-Dom: 11:00-23:00',
+        postal_code='01000-000', street_number=str(i),
+    ) for i in range(RESTAURANTS))
+    db.session.commit()
+
+def default_candidates():
+    cores = os.cpu_count() or 1
+    candidates = [('sync', cores, 1), ('sync', cores * 2 + 1, 1), ('gthread', cores, 4), ('gthread', cores, 8)]
+    if importlib.util.find_spec('gevent') is not None:
+        candidates.append(('gevent', cores, 1))
+    return candidates
+
+def parse_candidate(text):
+    worker_class, _, size = text.partition(':')
+    workers, _, threads = size.partition('x')
+    return worker_class, int(workers), int(threads or 1)
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def start_gunicorn(worker_class, workers, threads, port, log_dir):
+    env = dict(
+        os.environ,
+        FLASK_ENV='production',
+        CACHE_BACKEND='none',
+        LOG_LEVEL='WARNING',
+        GUNICORN_WORKER_CLASS=worker_class,
+        WEB_CONCURRENCY=str(workers),
+        GUNICORN_THREADS=str(threads),
+    )
+    command = [
+        sys.executable, '-m', 'gunicorn', '-c', 'deploy/gunicorn_config.py',
+        '--bind', f'127.0.0.1:{port}', '--log-level', 'warning',
+        '--error-logfile', os.path.join(log_dir, 'error.log'),
+        '--access-logfile', os.path.join(log_dir, 'access.log'),
+        'run:app',
+    ]
+    process = subprocess.Popen(command, cwd=ROOT, env=env)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'Gunicorn terminou com código {process.returncode}')
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/api/restaurants/?limit=1').read()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError('Gunicorn não respondeu em 60 segundos')
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+def load(base_url, seconds, clients):
+    """Executa a carga de leituras e retorna (durações, erros)."""
+    paths = [
+        lambda: '/api/restaurants/?limit=50',
+        lambda: f'/api/restaurants/{random.randint(1, RESTAURANTS)}',
+        lambda: f'/api/restaurants/search?name=restaurante%20{random.randint(1, 99)}&limit=20',
+    ]
+    durations, errors = [], [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def client():
+        local, failed = [], 0
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(base_url + random.choice(paths)(), timeout=30) as response:
+                    response.read()
+                local.append(time.perf_counter() - start)
+            except (urllib.error.URLError, OSError):
+                failed += 1
+        with lock:
+            durations.extend(local)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return durations, errors[0]
+
+def main():
+    seconds = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    candidates = [parse_candidate(arg) for arg in sys.argv[3:]] or default_candidates()
+
+    logger.setLevel(logging.WARNING)
+    app = create_app('production')
+    with app.app_context():
+        seed()
+        db.engine.dispose()
+
+    log_dir = tempfile.mkdtemp()
+    print(f'{clients} clientes, {seconds}s por candidato, {RESTAURANTS} restaurantes\n')
+    print(f"{'candidato':<16} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'erros':>6}")
+    results = []
+    for worker_class, workers, threads in candidates:
+        label = f'{worker_class}:{workers}' + (f'x{threads}' if worker_class == 'gthread' else '')
+        port = free_port()
+        try:
+            process = start_gunicorn(worker_class, workers, threads, port, log_dir)
+        except RuntimeError as err:
+            print(f'{label:<16} falhou ao iniciar: {err}')
+            continue
+        try:
+            durations, errors = load(f'http://127.0.0.1:{port}', seconds, clients)
+        finally:
+            process.terminate()
+            process.wait()
+        throughput = len(durations) / seconds
+        print(f'{label:<16} {throughput:8.1f} {percentile(durations, .5) * 1000:8.1f} '
+              f'{percentile(durations, .99) * 1000:8.1f} {errors:6d}')
+        results.append((errors == 0, throughput, worker_class, workers, threads, label))
+
+    if not results:
+        return
+    _, throughput, worker_class, workers, threads, label = max(results)
+    print(f'\nMelhor vazão: {label} ({throughput:.1f} req/s)')
+    print(f'  GUNICORN_WORKER_CLASS={worker_class} WEB_CONCURRENCY={workers} GUNICORN_THREADS={threads}')
+    print(f'  (logs do Gunicorn em {log_dir})')
+
+if __name__ == '__main__':
+    main()
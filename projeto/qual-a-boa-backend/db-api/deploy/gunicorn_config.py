@@ -1,14 +1,39 @@
 """
 Configuração do Gunicorn para ambiente de produção
+
+O modelo de workers é escolhido por variáveis de ambiente (os mesmos valores
+dimensionam o pool de conexões de cada worker, veja app/config.py):
+
+    GUNICORN_WORKER_CLASS: 'sync' (padrão), 'gthread' ou 'gevent'
+    WEB_CONCURRENCY: Quantidade de workers
+    GUNICORN_THREADS: Threads por worker no modo gthread
+    GUNICORN_WORKER_CONNECTIONS: Conexões simultâneas por worker no modo gevent
+
+- sync: um request por processo; clientes lentos ocupam o worker inteiro,
+  por isso deve ficar atrás do Nginx (que faz o buffer das requisições).
+- gthread: cada worker atende GUNICORN_THREADS requests em threads. As sessões
+  do SQLAlchemy são isoladas por contexto de aplicação (uma por thread).
+- gevent: requer o pacote gevent (e psycogreen para o psycopg2). O monkey
+  patching precisa acontecer antes de importar a aplicação, então o preload
+  é desativado nesse modo.
+
+Use `python benchmarks/bench_workers.py` para escolher a combinação pela vazão
+medida, em vez da regra 2N+1.
 """
 
 import multiprocessing
+import os
 
-# Número de workers com base no número de núcleos
-workers = multiprocessing.cpu_count() * 2 + 1
+# Tipo de worker: sync, gthread ou gevent
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'sync')
 
-# Tipo de worker (use o tipo de worker sync para Flask)
-worker_class = 'sync'
+# Número de workers com base no número de núcleos. O mesmo valor
+# (WEB_CONCURRENCY) define o tamanho do pool de conexões de cada worker
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+
+# Threads por worker (gthread) e conexões por worker (gevent)
+threads = int(os.getenv('GUNICORN_THREADS', '1'))
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', '1000'))
 
 # Tempo limite para requests em segundos
 timeout = 60
@@ -30,8 +55,58 @@ accesslog = '/var/log/gunicorn/access.log'
 # Formatar logs de acesso
 access_log_format = '%(h)s %(l)s %(u)s %(t)s "%(r)s" %(s)s %(b)s "%(f)s" "%(a)s"'
 
-# Preload da aplicação para melhor performance
-preload_app = True
+# Diretório onde cada worker grava as métricas do Prometheus; /metrics
+# agrega os arquivos de todos os processos
+# (o diretório precisa existir antes do preload da aplicação)
+prometheus_dir = os.getenv('PROMETHEUS_MULTIPROC_DIR', '/tmp/qualaboa-metrics')
+os.makedirs(prometheus_dir, exist_ok=True)
+
+# Vagas do hashing de senhas compartilhadas por todos os workers: limitam os
+# bcrypt simultâneos no host (PASSWORD_POOL_WORKERS), também no worker sync,
+# que atende um request por processo. Vazio desativa (limite por processo)
+password_lock_dir = os.getenv('PASSWORD_LOCK_DIR', '/tmp/qualaboa-passwords')
+
+# Um worker sync esperando uma vaga não atende mais nada: sem fila, os logins
+# excedentes recebem 503 na hora e o worker volta para as leituras
+password_max_pending = os.getenv('PASSWORD_POOL_MAX_PENDING', '0' if worker_class == 'sync' else '16')
+
+# Todos os workers gravam em logs/app.log; a rotação fica a cargo do logrotate
+# (o TimedRotatingFileHandler de cada processo rotacionaria o mesmo arquivo)
+raw_env = [
+    'LOG_FILE_MODE=watched', f'PROMETHEUS_MULTIPROC_DIR={prometheus_dir}',
+    f'PASSWORD_LOCK_DIR={password_lock_dir}', f'PASSWORD_POOL_MAX_PENDING={password_max_pending}',
+]
+
+# Preload da aplicação para melhor performance (exceto com gevent, que
+# precisa aplicar o monkey patching antes de a aplicação ser importada)
+preload_app = worker_class != 'gevent'
 
 # Modo demônio (desabilite se estiver usando supervisord ou systemd)
-daemon = False 
\ No newline at end of file
+daemon = False
+
+def on_starting(server):
+    """Descarta as métricas de execuções anteriores (os workers recriam as suas)."""
+    for name in os.listdir(prometheus_dir):
+        os.remove(os.path.join(prometheus_dir, name))
+
+def child_exit(server, worker):
+    """Remove os gauges do worker encerrado da agregação do /metrics."""
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
+
+def post_fork(server, worker):
+    """Descarta as conexões e os caches herdados do processo mestre."""
+    if not preload_app:
+        return
+    from app.services.workers import init_worker
+    init_worker(server.app.wsgi())
+
+def post_worker_init(worker):
+    """Torna o psycopg2 cooperativo nos workers gevent."""
+    if worker_class == 'gevent':
+        try:
+            from psycogreen.gevent import patch_psycopg
+        except ImportError:
+            worker.log.warning('psycogreen não instalado: consultas ao banco bloqueiam o worker gevent')
+        else:
+            patch_psycopg()
@@ -4,6 +4,10 @@ CREATE DATABASE restaurant_db;
 -- Connect to the database
 \c restaurant_db;
 
+-- Extensions used by restaurant search
+CREATE EXTENSION IF NOT EXISTS unaccent;
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 -- Create the restaurants table
 CREATE TABLE restaurants (
     id SERIAL PRIMARY KEY,
@@ -14,21 +18,59 @@ CREATE TABLE restaurants (
     type VARCHAR(50) NOT NULL,
     operating_hours VARCHAR(200),
     postal_code VARCHAR(9) NOT NULL,
-    street_number VARCHAR(10) NOT NULL
+    street_number VARCHAR(10) NOT NULL,
+    name_search VARCHAR(100) NOT NULL DEFAULT '',
+    city_search VARCHAR(100) NOT NULL DEFAULT '',
+    type_search VARCHAR(50) NOT NULL DEFAULT '',
+    latitude DOUBLE PRECISION,
+    longitude DOUBLE PRECISION,
+    geo_cell INTEGER,
+    version INTEGER NOT NULL DEFAULT 1
+);
+
+-- Users generation counter (bumped on every user update/delete, invalidates /me caches)
+CREATE TABLE users_generation (
+    id INTEGER PRIMARY KEY,
+    generation BIGINT NOT NULL DEFAULT 0
+);
+INSERT INTO users_generation (id, generation) VALUES (1, 0);
+
+-- Opening hours compiled into minute-of-week intervals (Monday 00:00 = 0),
+-- never crossing midnight; kept by the application on every write
+CREATE TABLE restaurant_hours (
+    restaurant_id INTEGER NOT NULL REFERENCES restaurants(id) ON DELETE CASCADE,
+    opens_at SMALLINT NOT NULL,
+    closes_at SMALLINT NOT NULL,
+    PRIMARY KEY (restaurant_id, opens_at)
 );
 
+-- Catalog version counter (bumped on every restaurant write, used for ETags)
+CREATE TABLE catalog_version (
+    id INTEGER PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+INSERT INTO catalog_version (id, version) VALUES (1, 0);
+
 -- Create the users table
 CREATE TABLE users (
     id SERIAL PRIMARY KEY,
     username VARCHAR(50) UNIQUE NOT NULL,
     email VARCHAR(100) UNIQUE NOT NULL,
-    password_hash VARCHAR(128) NOT NULL
+    password_hash VARCHAR(128) NOT NULL,
+    version INTEGER NOT NULL DEFAULT 1
 );
 
 -- Create indexes for better performance
 CREATE INDEX idx_restaurants_state ON restaurants(state);
 CREATE INDEX idx_restaurants_city ON restaurants(city);
 CREATE INDEX idx_restaurants_type ON restaurants(type);
+CREATE INDEX ix_restaurants_name_search_trgm ON restaurants USING gin (name_search gin_trgm_ops);
+CREATE INDEX ix_restaurants_city_search_trgm ON restaurants USING gin (city_search gin_trgm_ops);
+CREATE INDEX ix_restaurants_type_search_trgm ON restaurants USING gin (type_search gin_trgm_ops);
+CREATE INDEX ix_restaurants_name_search_prefix ON restaurants (name_search varchar_pattern_ops);
+CREATE INDEX ix_restaurants_city_search_prefix ON restaurants (city_search varchar_pattern_ops);
+CREATE INDEX ix_restaurants_geo_cell ON restaurants (geo_cell);
+CREATE INDEX ix_restaurant_hours_window ON restaurant_hours (opens_at, closes_at, restaurant_id);
 
 -- Sample data (optional)
 INSERT INTO restaurants (cnpj, name, state, city, type, operating_hours, postal_code, street_number)
@@ -36,4 +78,17 @@ VALUES
     ('12.345.678/0001-99', 'Italian Bistro', 'SP', 'São Paulo', 'Italian', 'Mon-Fri: 11:00-22:00, Sat-Sun: 12:00-23:00', '01234-567', '123'),
     ('98.765.432/0001-10', 'Brazilian Grill', 'RJ', 'Rio de Janeiro', 'Brazilian', 'Mon-Sun: 10:00-22:00', '20000-000', '456'),
     ('11.222.333/0001-44', 'Sushi Express', 'SP', 'São Paulo', 'Japanese', 'Tue-Sun: 18:00-23:00', '04567-890', '789'),
-    ('44.555.666/0001-77', 'Taco House', 'MG', 'Belo Horizonte', 'Mexican', 'Mon-Sat: 11:00-23:00', '30000-000', '101'); 
\ No newline at end of file
+    ('44.555.666/0001-77', 'Taco House', 'MG', 'Belo Horizonte', 'Mexican', 'Mon-Sat: 11:00-23:00', '30000-000', '101');
+
+-- Fill the normalized search columns of the sample data
+-- (run `python manage_restaurants.py backfill-search` for the exact app rule)
+UPDATE restaurants SET
+    name_search = lower(unaccent(name)),
+    city_search = lower(unaccent(city)),
+    type_search = lower(unaccent(type));
+
+-- Coordinates of the sample data come from the offline CEP table:
+-- run `python manage_restaurants.py backfill-location`
+
+-- Opening hours intervals of the sample data are compiled by the app:
+-- run `python manage_restaurants.py backfill-hours`
@@ -0,0 +1,139 @@
+from app import create_app
+from app.services.search import backfill_search_columns
+from app.services.geo import backfill_location_columns
+from app.services.opening_hours import backfill_opening_hours
+from app.services.trigram_index import restaurant_index
+from app.services.importer import RestaurantImport
+
+def backfill_search(batch_size=1000):
+    """Preenche as colunas normalizadas de busca em lotes"""
+    app = create_app()
+    with app.app_context():
+        total = backfill_search_columns(
+            batch_size=batch_size,
+            progress=lambda count: print(f"{count} restaurantes atualizados...")
+        )
+        print(f"Colunas de busca atualizadas para {total} restaurantes")
+        return total
+
+def backfill_location(batch_size=1000):
+    """Preenche as coordenadas e a célula da grade a partir da tabela de CEPs"""
+    app = create_app()
+    with app.app_context():
+        total, unresolved = backfill_location_columns(
+            batch_size=batch_size,
+            progress=lambda count: print(f"{count} restaurantes atualizados...")
+        )
+        print(f"Localização atualizada para {total} restaurantes")
+        if unresolved:
+            print(f"{unresolved} restaurantes com CEP fora da tabela de coordenadas (sem localização)")
+        return total, unresolved
+
+def backfill_hours(batch_size=1000):
+    """Compila o horário de funcionamento em intervalos e lista os não reconhecidos"""
+    app = create_app()
+    with app.app_context():
+        total, unparsed = backfill_opening_hours(
+            batch_size=batch_size,
+            progress=lambda count: print(f"{count} restaurantes processados...")
+        )
+        print(f"Horários compilados para {total} restaurantes")
+        if unparsed:
+            print(f"{len(unparsed)} restaurantes com horário não reconhecido (não aparecem em open_now):")
+            for restaurant_id, text, error in unparsed:
+                print(f"  {restaurant_id}: {text!r} ({error})")
+        return total, unparsed
+
+def index_stats():
+    """
+    Mede o tempo de construção e a memória do índice de trigramas.
+    O índice é construído neste processo apenas para a medição: os workers
+    reconstroem o próprio índice quando a versão do catálogo muda.
+    """
+    import time
+    app = create_app()
+    with app.app_context():
+        start = time.perf_counter()
+        total = restaurant_index.rebuild()
+        elapsed = time.perf_counter() - start
+        print(f"Índice construído com {total} restaurantes em {elapsed:.2f}s")
+
+        report = restaurant_index.memory_usage()
+        for field, stats in report['fields'].items():
+            print(
+                f"  {field}: {stats['trigrams']} trigramas, {stats['postings']} postings, "
+                f"{(stats['values_bytes'] + stats['postings_bytes']) / 1024 / 1024:.1f} MB"
+            )
+        print(f"Memória total aproximada: {report['total_bytes'] / 1024 / 1024:.1f} MB")
+        return report
+
+def import_restaurants(path, batch_size=5000, restart=False):
+    """Importa restaurantes de um arquivo CSV ou NDJSON, retomando do último lote confirmado"""
+    app = create_app()
+    with app.app_context():
+        job = RestaurantImport(path, batch_size=batch_size)
+        if restart:
+            job.reset()
+
+        def progress(position, inserted, rejected, rate):
+            print(f"{position} registros lidos, {inserted} inseridos, {rejected} rejeitados ({rate:.0f} registros/s)")
+
+        result = job.run(progress=progress)
+        print(
+            f"Importação concluída: {result['inserted']} inseridos, {result['rejected']} rejeitados "
+            f"em {result['elapsed']:.1f}s ({result['rate']:.0f} registros/s)"
+        )
+        if result['rejected']:
+            print(f"Registros rejeitados em: {job.rejects_path}")
+        return result
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Uso: python manage_restaurants.py [comando] [argumentos]")
+        print("Comandos disponíveis:")
+        print("  backfill-search [batch_size] - Preenche as colunas normalizadas de busca")
+        print("  backfill-location [batch_size] - Preenche as coordenadas a partir da tabela de CEPs")
+        print("  backfill-hours [batch_size] - Compila os horários de funcionamento e lista os não reconhecidos")
+        print("  index-stats - Mede o tempo de construção e a memória do índice de trigramas")
+        print("  import <arquivo.csv|arquivo.ndjson> [batch_size] [--restart] - Importa restaurantes")
+        sys.exit(1)
+
+    command = sys.argv[1]
+
+    if command == "backfill-search":
+        if len(sys.argv) > 3:
+            print("Erro: Número incorreto de argumentos para backfill-search")
+            print("Uso: python manage_restaurants.py backfill-search [batch_size]")
+            sys.exit(1)
+        backfill_search(int(sys.argv[2]) if len(sys.argv) == 3 else 1000)
+
+    elif command == "backfill-location":
+        if len(sys.argv) > 3:
+            print("Erro: Número incorreto de argumentos para backfill-location")
+            print("Uso: python manage_restaurants.py backfill-location [batch_size]")
+            sys.exit(1)
+        backfill_location(int(sys.argv[2]) if len(sys.argv) == 3 else 1000)
+
+    elif command == "backfill-hours":
+        if len(sys.argv) > 3:
+            print("Erro: Número incorreto de argumentos para backfill-hours")
+            print("Uso: python manage_restaurants.py backfill-hours [batch_size]")
+            sys.exit(1)
+        backfill_hours(int(sys.argv[2]) if len(sys.argv) == 3 else 1000)
+
+    elif command == "import":
+        args = [arg for arg in sys.argv[2:] if arg != "--restart"]
+        if len(args) not in (1, 2):
+            print("Erro: Número incorreto de argumentos para import")
+            print("Uso: python manage_restaurants.py import <arquivo> [batch_size] [--restart]")
+            sys.exit(1)
+        import_restaurants(args[0], int(args[1]) if len(args) == 2 else 5000, "--restart" in sys.argv)
+
+    elif command == "index-stats":
+        index_stats()
+
+    else:
+        print(f"Erro: Comando '{command}' não reconhecido")
+        sys.exit(1)
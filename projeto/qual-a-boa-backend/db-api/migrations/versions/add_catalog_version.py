@@ -0,0 +1,28 @@
+"""add catalog version counter and restaurant row version
+
+Revision ID: add_catalog_version
+Revises: add_restaurant_search_columns
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_catalog_version'
+down_revision = 'add_restaurant_search_columns'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'catalog_version',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('version', sa.BigInteger(), nullable=False, server_default='0'),
+    )
+    op.execute('INSERT INTO catalog_version (id, version) VALUES (1, 0)')
+    op.add_column('restaurants', sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+def downgrade():
+    op.drop_column('restaurants', 'version')
+    op.drop_table('catalog_version')
@@ -0,0 +1,25 @@
+"""add state, city and type indexes used by facet counts
+
+Revision ID: add_restaurant_facet_indexes
+Revises: add_catalog_version
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'add_restaurant_facet_indexes'
+down_revision = 'add_catalog_version'
+branch_labels = None
+depends_on = None
+
+# Bancos criados por init_db.sql já possuem estes índices
+def upgrade():
+    op.create_index('idx_restaurants_state', 'restaurants', ['state'], if_not_exists=True)
+    op.create_index('idx_restaurants_city', 'restaurants', ['city'], if_not_exists=True)
+    op.create_index('idx_restaurants_type', 'restaurants', ['type'], if_not_exists=True)
+
+def downgrade():
+    op.drop_index('idx_restaurants_type', table_name='restaurants')
+    op.drop_index('idx_restaurants_city', table_name='restaurants')
+    op.drop_index('idx_restaurants_state', table_name='restaurants')
@@ -0,0 +1,35 @@
+"""add restaurant opening hours intervals
+
+Revision ID: add_restaurant_hours
+Revises: add_restaurant_location
+Create Date: 2026-10-18 16:00:00.000000
+
+A tabela é criada vazia. Depois do upgrade, compile o horário de
+funcionamento dos restaurantes existentes (e veja quais não foram
+reconhecidos) com:
+
+    python manage_restaurants.py backfill-hours
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_restaurant_hours'
+down_revision = 'add_restaurant_location'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'restaurant_hours',
+        sa.Column('restaurant_id', sa.Integer(), sa.ForeignKey('restaurants.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('opens_at', sa.SmallInteger(), nullable=False),
+        sa.Column('closes_at', sa.SmallInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('restaurant_id', 'opens_at'),
+    )
+    op.create_index('ix_restaurant_hours_window', 'restaurant_hours', ['opens_at', 'closes_at', 'restaurant_id'])
+
+def downgrade():
+    op.drop_index('ix_restaurant_hours_window', table_name='restaurant_hours')
+    op.drop_table('restaurant_hours')
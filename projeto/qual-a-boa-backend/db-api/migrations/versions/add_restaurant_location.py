@@ -0,0 +1,32 @@
+"""add restaurant location columns and spatial grid index
+
+Revision ID: add_restaurant_location
+Revises: add_user_version
+Create Date: 2026-10-18 14:00:00.000000
+
+As colunas são criadas vazias. Depois do upgrade, preencha-as a partir da
+tabela de CEPs com:
+
+    python manage_restaurants.py backfill-location
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_restaurant_location'
+down_revision = 'add_user_version'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column('restaurants', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('restaurants', sa.Column('longitude', sa.Float(), nullable=True))
+    op.add_column('restaurants', sa.Column('geo_cell', sa.Integer(), nullable=True))
+    op.create_index('ix_restaurants_geo_cell', 'restaurants', ['geo_cell'])
+
+def downgrade():
+    op.drop_index('ix_restaurants_geo_cell', table_name='restaurants')
+    op.drop_column('restaurants', 'geo_cell')
+    op.drop_column('restaurants', 'longitude')
+    op.drop_column('restaurants', 'latitude')
@@ -0,0 +1,43 @@
+"""add restaurant search columns
+
+Revision ID: add_restaurant_search_columns
+Revises: add_unaccent_extension
+Create Date: 2026-10-18 10:00:00.000000
+
+As colunas são criadas vazias. Depois do upgrade, preencha-as com:
+
+    python manage_restaurants.py backfill-search
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_restaurant_search_columns'
+down_revision = 'add_unaccent_extension'
+branch_labels = None
+depends_on = None
+
+SEARCH_COLUMNS = (('name_search', 100), ('city_search', 100), ('type_search', 50))
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    for column, length in SEARCH_COLUMNS:
+        op.add_column('restaurants', sa.Column(column, sa.String(length), nullable=False, server_default=''))
+        op.execute(
+            f'CREATE INDEX IF NOT EXISTS ix_restaurants_{column}_trgm '
+            f'ON restaurants USING gin ({column} gin_trgm_ops)'
+        )
+
+    op.create_index('ix_restaurants_name_search_prefix', 'restaurants', ['name_search'],
+                    postgresql_ops={'name_search': 'varchar_pattern_ops'})
+    op.create_index('ix_restaurants_city_search_prefix', 'restaurants', ['city_search'],
+                    postgresql_ops={'city_search': 'varchar_pattern_ops'})
+
+def downgrade():
+    op.drop_index('ix_restaurants_city_search_prefix', table_name='restaurants')
+    op.drop_index('ix_restaurants_name_search_prefix', table_name='restaurants')
+    for column, _ in reversed(SEARCH_COLUMNS):
+        op.execute(f'DROP INDEX IF EXISTS ix_restaurants_{column}_trgm')
+        op.drop_column('restaurants', column)
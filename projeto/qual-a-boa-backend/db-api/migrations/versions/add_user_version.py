@@ -0,0 +1,21 @@
+"""add users.version used by the /me user cache
+
+Revision ID: add_user_version
+Revises: add_restaurant_facet_indexes
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_user_version'
+down_revision = 'add_restaurant_facet_indexes'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column('users', sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+def downgrade():
+    op.drop_column('users', 'version')
@@ -0,0 +1,26 @@
+"""add users generation counter
+
+Revision ID: add_users_generation
+Revises: add_restaurant_hours
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_users_generation'
+down_revision = 'add_restaurant_hours'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'users_generation',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('generation', sa.BigInteger(), nullable=False, server_default='0'),
+    )
+    op.execute('INSERT INTO users_generation (id, generation) VALUES (1, 0)')
+
+def downgrade():
+    op.drop_table('users_generation')
@@ -0,0 +1,65 @@
+"""
+Fixtures compartilhadas pelos testes automatizados da API.
+"""
+
+import pytest
+from sqlalchemy import update
+
+from app import create_app
+from app.extensions import db
+from app.models import CatalogVersion, Restaurant
+
+# test_api.py é um script manual que depende de um servidor rodando
+collect_ignore = ['test_api.py']
+
+@pytest.fixture
+def app():
+    """Aplicação configurada para testes com o banco recriado a cada teste."""
+    app = create_app('testing')
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def restaurants(app):
+    """Popula o banco com os restaurantes de exemplo de init_db.sql."""
+    rows = [
+        ('12.345.678/0001-99', 'Italian Bistro', 'SP', 'São Paulo', 'Italian', 'Mon-Fri: 11:00-22:00, Sat-Sun: 12:00-23:00', '01234-567', '123'),
+        ('98.765.432/0001-10', 'Brazilian Grill', 'RJ', 'Rio de Janeiro', 'Brazilian', 'Mon-Sun: 10:00-22:00', '20000-000', '456'),
+        ('11.222.333/0001-44', 'Sushi Express', 'SP', 'São Paulo', 'Japanese', 'Tue-Sun: 18:00-23:00', '04567-890', '789'),
+        ('44.555.666/0001-77', 'Taco House', 'MG', 'Belo Horizonte', 'Mexican', 'Mon-Sat: 11:00-23:00', '30000-000', '101'),
+        ('55.666.777/0001-88', 'Churrascaria Gaúcha', 'RS', 'Porto Alegre', 'Churrascaria', 'Mon-Sun: 11:00-23:00', '90000-000', '202'),
+    ]
+    fields = ('cnpj', 'name', 'state', 'city', 'type', 'operating_hours', 'postal_code', 'street_number')
+    objects = [Restaurant(**dict(zip(fields, row))) for row in rows]
+    db.session.add_all(objects)
+    db.session.commit()
+    return objects
+
+@pytest.fixture
+def auth_headers(app):
+    """Cabeçalho Authorization com um token JWT válido."""
+    from flask_jwt_extended import create_access_token
+    return {'Authorization': f"Bearer {create_access_token(identity='1')}"}
+
+@pytest.fixture
+def other_process(app):
+    """
+    Altera um restaurante como outro processo (outro worker ou o importador):
+    direto na conexão, sem os eventos de sessão deste processo.
+    """
+    def write(restaurant_id, **values):
+        db.session.commit()
+        row = db.session.execute(
+            db.select(Restaurant.name, Restaurant.city, Restaurant.type).where(Restaurant.id == restaurant_id)
+        ).one()._asdict()
+        row.update(values)
+        catalog = CatalogVersion.__table__
+        with db.engine.begin() as connection:
+            connection.execute(update(Restaurant.__table__).where(Restaurant.id == restaurant_id)
+                               .values(**values, **Restaurant.search_columns(row)))
+            connection.execute(update(catalog).values(version=catalog.c.version + 1))
+    return write
@@ -0,0 +1,35 @@
+"""
+Testes da inicialização rápida (FAST_BOOT) de create_app.
+"""
+
+import pytest
+from sqlalchemy import inspect
+
+from app import create_app
+from app.config import TestingConfig
+from app.extensions import db
+
+@pytest.fixture
+def fast_boot(monkeypatch, tmp_path):
+    monkeypatch.setattr(TestingConfig, 'FAST_BOOT', True)
+    monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'fast.db'}")
+    monkeypatch.delenv('FLASK_RUN_FROM_CLI', raising=False)
+
+def test_fast_boot_skips_schema_migrate_and_csrf(fast_boot):
+    app = create_app('testing')
+    with app.app_context():
+        assert inspect(db.engine).get_table_names() == []
+    assert 'migrate' not in app.extensions
+    assert 'csrf' not in app.extensions
+    timings = app.extensions['boot_timings']
+    assert 'schema' not in timings
+    assert timings['total'] >= timings['extensions']
+
+def test_fast_boot_registers_migrate_for_cli(fast_boot, monkeypatch):
+    monkeypatch.setenv('FLASK_RUN_FROM_CLI', 'true')
+    assert 'migrate' in create_app('testing').extensions
+
+def test_default_boot_creates_schema(app):
+    assert 'restaurants' in inspect(db.engine).get_table_names()
+    assert {'migrate', 'csrf'} <= set(app.extensions)
+    assert {'imports', 'extensions', 'schema', 'total'} <= set(app.extensions['boot_timings'])
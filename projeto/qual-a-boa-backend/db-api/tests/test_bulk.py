@@ -0,0 +1,55 @@
+"""
+Testes da criação e atualização de restaurantes em lote.
+"""
+
+import json
+
+from app.models import Restaurant
+
+def _row(i, **overrides):
+    row = {
+        'cnpj': f'00.000.000/{i:04d}-00', 'name': f'Restaurante {i}', 'state': 'SP',
+        'city': 'São Paulo', 'type': 'Brasileira', 'operating_hours': 'Mon-Sun: 11:00-23:00',
+        'postal_code': '01000-000', 'street_number': str(i),
+    }
+    row.update(overrides)
+    return row
+
+def test_bulk_requires_authentication(client):
+    assert client.post('/api/restaurants/bulk', json=[_row(1)]).status_code == 401
+
+def test_bulk_insert_reports_each_row(client, restaurants, auth_headers):
+    payload = [_row(1), _row(2, name=None), _row(1), _row(3, cnpj=restaurants[0].cnpj), 'x', _row(4)]
+    response = client.post('/api/restaurants/bulk?batch_size=2', json=payload, headers=auth_headers)
+    assert response.status_code == 200
+    report = response.get_json()
+    assert (report['created'], report['updated'], report['failed']) == (2, 0, 4)
+    assert [r['status'] for r in report['results']] == ['created', 'error', 'error', 'error', 'error', 'created']
+    assert 'name' in report['results'][1]['errors']
+    assert report['results'][2]['errors'] == {'cnpj': ['Duplicated in request']}
+
+    created = Restaurant.query.get(report['results'][5]['id'])
+    assert created.name == 'Restaurante 4'
+    assert created.city_search == 'sao paulo'
+
+def test_bulk_upsert_updates_existing_rows(client, restaurants, auth_headers):
+    payload = [_row(1), _row(2, cnpj=restaurants[0].cnpj, city='Ribeirão Preto')]
+    report = client.post('/api/restaurants/bulk?mode=upsert', json=payload, headers=auth_headers).get_json()
+    assert [r['status'] for r in report['results']] == ['created', 'updated']
+    assert report['results'][1]['id'] == restaurants[0].id
+
+    restaurant = Restaurant.query.get(restaurants[0].id)
+    assert (restaurant.city, restaurant.city_search) == ('Ribeirão Preto', 'ribeirao preto')
+
+def test_bulk_accepts_ndjson(client, app, auth_headers):
+    body = '\n'.join([json.dumps(_row(1)), '{broken', json.dumps(_row(2)), ''])
+    response = client.post(
+        '/api/restaurants/bulk', data=body, content_type='application/x-ndjson', headers=auth_headers
+    )
+    report = response.get_json()
+    assert [r['status'] for r in report['results']] == ['created', 'error', 'created']
+
+def test_bulk_rejects_invalid_requests(client, app, auth_headers):
+    assert client.post('/api/restaurants/bulk', json={'cnpj': 'x'}, headers=auth_headers).status_code == 400
+    assert client.post('/api/restaurants/bulk?mode=merge', json=[], headers=auth_headers).status_code == 400
+    assert client.post('/api/restaurants/bulk?batch_size=0', json=[], headers=auth_headers).status_code == 400
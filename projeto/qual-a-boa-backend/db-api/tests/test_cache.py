@@ -0,0 +1,93 @@
+"""
+Testes do cache de respostas das rotas de leitura de restaurantes.
+"""
+
+import fakeredis
+import pytest
+
+from app.extensions import db
+from app.services.cache import LocalCache, RedisCache, response_cache
+
+def test_repeated_list_is_served_from_cache(client, restaurants, auth_headers):
+    first = client.get('/api/restaurants/?limit=2')
+    # Parâmetros em outra ordem (e vazios) geram a mesma chave
+    second = client.get('/api/restaurants/?fields=&limit=2')
+    assert first.headers['X-Cache'] == 'MISS'
+    assert second.headers['X-Cache'] == 'HIT'
+    assert second.get_json() == first.get_json()
+    assert second.headers['X-Next-Cursor'] == first.headers['X-Next-Cursor']
+
+    stats = client.get('/api/restaurants/cache/stats', headers=auth_headers).get_json()
+    assert stats['backend'] == 'local'
+    assert (stats['hits'], stats['misses']) == (1, 1)
+
+def test_commit_invalidates_cached_responses(client, restaurants):
+    assert client.get(f'/api/restaurants/{restaurants[0].id}').headers['X-Cache'] == 'MISS'
+    assert client.get('/api/restaurants/search?name=bistro').headers['X-Cache'] == 'MISS'
+
+    invalidations = response_cache.info()['invalidations']
+    restaurants[0].name = 'Bistrô Italiano'
+    db.session.commit()
+    assert response_cache.info()['invalidations'] == invalidations + 1
+
+    detail = client.get(f'/api/restaurants/{restaurants[0].id}')
+    assert detail.headers['X-Cache'] == 'MISS'
+    assert detail.get_json()['name'] == 'Bistrô Italiano'
+    assert client.get('/api/restaurants/search?name=bistro').headers['X-Cache'] == 'MISS'
+
+def test_encoded_separators_do_not_share_key(client, restaurants):
+    assert client.get('/api/restaurants/search?city=sao paulo&name=bistro').get_json()
+    # Mesmo texto depois de juntado, mas um único parâmetro city
+    response = client.get('/api/restaurants/search?city=sao paulo%26name%3Dbistro')
+    assert response.headers['X-Cache'] == 'MISS'
+    assert response.get_json() == []
+
+def test_rollback_keeps_cache(client, restaurants):
+    client.get('/api/restaurants/')
+    restaurants[0].name = 'Descartado'
+    db.session.flush()
+    db.session.rollback()
+    assert client.get('/api/restaurants/').headers['X-Cache'] == 'HIT'
+
+def test_streaming_bypasses_cache(client, restaurants):
+    client.get('/api/restaurants/')
+    response = client.get('/api/restaurants/', headers={'Accept': 'application/x-ndjson'})
+    assert 'X-Cache' not in response.headers
+    assert response.mimetype == 'application/x-ndjson'
+
+def test_local_cache_evicts_least_recently_used():
+    cache = LocalCache(max_entries=2, ttl=60)
+    cache.set('a', '1')
+    cache.set('b', '2')
+    cache.get('a')
+    cache.set('c', '3')
+    assert cache.get('b') is None
+    assert cache.get('a') == '1'
+    assert cache.info()['evictions'] == 1
+
+def test_local_cache_expires_entries():
+    cache = LocalCache(ttl=0)
+    cache.set('a', '1')
+    assert cache.get('a') is None
+    assert cache.info()['evictions'] == 1
+
+@pytest.fixture
+def redis_cache(app):
+    """Troca o backend do cache por um Redis falso (fakeredis)."""
+    backend = response_cache.backend
+    response_cache.backend = RedisCache(fakeredis.FakeRedis(), ttl=60)
+    yield response_cache.backend
+    response_cache.backend = backend
+
+def test_redis_backend_caches_and_invalidates(client, restaurants, redis_cache):
+    assert client.get('/api/restaurants/').headers['X-Cache'] == 'MISS'
+    assert client.get('/api/restaurants/').headers['X-Cache'] == 'HIT'
+
+    db.session.delete(restaurants[4])
+    db.session.commit()
+    assert redis_cache.client.smembers(redis_cache.prefix + 'keys') == set()
+
+    response = client.get('/api/restaurants/')
+    assert response.headers['X-Cache'] == 'MISS'
+    assert len(response.get_json()) == 4
+    assert redis_cache.info()['hits'] == 1
@@ -0,0 +1,71 @@
+"""
+Testes da configuração e das estatísticas do pool de conexões.
+"""
+
+import pytest
+from sqlalchemy import exc
+
+from app.extensions import db
+from app.services.db_pool import TimedNullPool, TimedQueuePool, database_pool, engine_options, pool_sizes
+
+def _config(**values):
+    config = {
+        'SQLALCHEMY_DATABASE_URI': 'postgresql://user@localhost/restaurant_db',
+        'DB_WORKERS': 9,
+        'DB_WORKER_THREADS': 1,
+        'DB_MAX_CONNECTIONS': 100,
+        'DB_RESERVED_CONNECTIONS': 10,
+        'DB_CONNECT_TIMEOUT': 10,
+    }
+    config.update(values)
+    return config
+
+def test_sizes_derived_from_worker_budget():
+    # 90 conexões para 9 workers: cada um pode usar até 10
+    assert pool_sizes(_config()) == (1, 1)
+    assert pool_sizes(_config(DB_WORKER_THREADS=4)) == (4, 4)
+    assert pool_sizes(_config(DB_WORKER_THREADS=8)) == (8, 2)
+    # Mais workers do que conexões: uma por worker, sem overflow
+    assert pool_sizes(_config(DB_WORKERS=200)) == (1, 0)
+    assert pool_sizes(_config(DB_POOL_SIZE=3, DB_MAX_OVERFLOW=0)) == (3, 0)
+
+def test_engine_options_by_mode():
+    options = engine_options(_config(DB_POOL_RECYCLE=1800, DB_POOL_PRE_PING=True))
+    assert options['poolclass'] is TimedQueuePool
+    assert (options['pool_recycle'], options['pool_pre_ping']) == (1800, True)
+    assert options['connect_args'] == {'connect_timeout': 10}
+
+    pgbouncer = engine_options(_config(DB_POOL_MODE='pgbouncer'))
+    assert pgbouncer['poolclass'] is TimedNullPool
+    assert 'pool_size' not in pgbouncer
+
+    assert engine_options(_config(SQLALCHEMY_DATABASE_URI='sqlite://')) == {}
+    assert 'connect_args' not in engine_options(_config(SQLALCHEMY_DATABASE_URI='sqlite:///app.db'))
+
+def test_stats_track_checkouts(client, app, auth_headers):
+    assert isinstance(db.engine.pool, TimedQueuePool)
+    database_pool.reset()
+    with db.engine.connect():
+        stats = database_pool.stats()
+        assert stats['checked_out'] == 1
+    assert stats['checkouts'] == 1
+
+    response = client.get('/api/restaurants/db/stats', headers=auth_headers)
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['mode'] == 'queue'
+    assert body['size'] == app.config['DB_WORKER_THREADS']
+    assert body['wait_max_ms'] >= 0
+
+def test_exhausted_pool_counts_timeout(app):
+    pool = db.engine.pool
+    app_pool = TimedQueuePool(pool._creator, pool_size=1, max_overflow=0, timeout=0.01)
+    database_pool.reset()
+    connection = app_pool.connect()
+    try:
+        with pytest.raises(exc.TimeoutError):
+            app_pool.connect()
+    finally:
+        connection.close()
+        app_pool.dispose()
+    assert database_pool.stats()['timeouts'] == 1
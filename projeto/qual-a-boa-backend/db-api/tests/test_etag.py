@@ -0,0 +1,66 @@
+"""
+Testes das ETags e do GET condicional das rotas de restaurantes.
+"""
+
+import pytest
+from sqlalchemy import event
+
+from app.extensions import db
+
+@pytest.fixture
+def statements(app):
+    """Captura as instruções SQL executadas durante o teste."""
+    captured = []
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    yield captured
+    event.remove(db.engine, 'before_cursor_execute', capture)
+
+def test_list_returns_304_without_reading_restaurants(client, restaurants, statements):
+    first = client.get('/api/restaurants/?limit=2')
+    etag = first.headers['ETag']
+    assert etag.startswith('W/')
+
+    statements.clear()
+    second = client.get('/api/restaurants/?limit=2', headers={'If-None-Match': etag})
+    assert second.status_code == 304
+    assert second.headers['ETag'] == etag
+    assert not any('FROM restaurants' in statement for statement in statements)
+
+def test_catalog_etag_changes_on_every_write(client, restaurants, auth_headers):
+    etag = client.get('/api/restaurants/search?city=paulo').headers['ETag']
+
+    restaurants[0].name = 'Bistrô Italiano'
+    db.session.commit()
+    after_update = client.get('/api/restaurants/search?city=paulo', headers={'If-None-Match': etag})
+    assert after_update.status_code == 200
+    assert after_update.headers['ETag'] != etag
+
+    client.post('/api/restaurants/bulk', json=[], headers=auth_headers)
+    assert client.get('/api/restaurants/', headers={'If-None-Match': after_update.headers['ETag']}).status_code == 304
+
+    db.session.delete(restaurants[1])
+    db.session.commit()
+    assert client.get('/api/restaurants/', headers={'If-None-Match': after_update.headers['ETag']}).status_code == 200
+
+def test_detail_etag_follows_row_version(client, restaurants):
+    url = f'/api/restaurants/{restaurants[0].id}'
+    etag = client.get(url).headers['ETag']
+    assert client.get(url, headers={'If-None-Match': etag}).status_code == 304
+
+    # Escrever em outro restaurante não invalida a ETag desta linha
+    restaurants[1].name = 'Outro nome'
+    db.session.commit()
+    assert client.get(url, headers={'If-None-Match': etag}).status_code == 304
+
+    restaurants[0].name = 'Novo nome'
+    db.session.commit()
+    response = client.get(url, headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.get_json()['name'] == 'Novo nome'
+
+def test_missing_restaurant_has_no_etag(client, app):
+    response = client.get('/api/restaurants/999')
+    assert response.status_code == 404
+    assert 'ETag' not in response.headers
@@ -0,0 +1,49 @@
+"""
+Testes das contagens por faceta de restaurantes.
+"""
+
+from sqlalchemy import event
+
+from app.extensions import db
+
+def test_facets_count_state_type_and_city(client, restaurants):
+    response = client.get('/api/restaurants/facets')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['total'] == 5
+    assert data['state'][0] == {'value': 'SP', 'count': 2}
+    assert sum(item['count'] for item in data['state']) == 5
+    assert {item['value'] for item in data['type']} == {'Italian', 'Brazilian', 'Japanese', 'Mexican', 'Churrascaria'}
+    assert data['city'][0] == {'value': 'São Paulo', 'count': 2}
+
+def test_facets_use_grouped_queries(client, restaurants):
+    statements = []
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    try:
+        client.get('/api/restaurants/facets')
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', capture)
+    grouped = [statement for statement in statements if 'GROUP BY' in statement]
+    assert len(grouped) == 3
+
+def test_facets_are_scoped_by_search_filters(client, restaurants):
+    data = client.get('/api/restaurants/facets?city=paulo&city_limit=1').get_json()
+    assert data['total'] == 2
+    assert data['state'] == [{'value': 'SP', 'count': 2}]
+    assert data['type'] == [{'value': 'Italian', 'count': 1}, {'value': 'Japanese', 'count': 1}]
+    assert len(data['city']) == 1
+
+def test_facets_reject_invalid_city_limit(client, restaurants):
+    assert client.get('/api/restaurants/facets?city_limit=0').status_code == 400
+
+def test_facets_are_cached_until_next_write(client, restaurants):
+    assert client.get('/api/restaurants/facets').headers['X-Cache'] == 'MISS'
+    assert client.get('/api/restaurants/facets').headers['X-Cache'] == 'HIT'
+
+    db.session.delete(restaurants[0])
+    db.session.commit()
+    response = client.get('/api/restaurants/facets')
+    assert response.headers['X-Cache'] == 'MISS'
+    assert response.get_json()['total'] == 4
@@ -0,0 +1,64 @@
+"""
+Testes da busca aproximada (fuzzy=1), tolerante a erros de digitação.
+"""
+
+import pytest
+
+from app.extensions import db
+from app.services.trigram_index import TrigramIndex, restaurant_index
+from app.utils.text import edit_distance, text_similarity
+
+@pytest.fixture
+def fresh_index(app):
+    restaurant_index.reset()
+    yield restaurant_index
+    restaurant_index.reset()
+
+def _names(response):
+    return [r['name'] for r in response.get_json()]
+
+def test_similarity_compares_term_with_word_windows():
+    assert edit_distance('churascaria', 'churrascaria') == 1
+    assert edit_distance('kitten', 'sitting', max_distance=1) == 2
+    assert text_similarity('scaria', 'churrascaria gaucha') == 1.0
+    assert text_similarity('sao paolo', 'sao paulo') == pytest.approx(1 - 1 / 9)
+    assert text_similarity('churascaria', 'churrascaria gaucha') == pytest.approx(1 - 1 / 12)
+    assert text_similarity('pizza', 'sushi express', threshold=0.6) == 0.0
+
+def test_fuzzy_search_ranks_top_k_by_similarity():
+    index = TrigramIndex()
+    index._built = True
+    rows = {
+        1: 'pizzaria bel vista', 2: 'pizaria bella', 3: 'pizzaria bella', 4: 'bella napoli',
+        5: 'pizzaria bella', 6: 'cantina italiana',
+    }
+    for restaurant_id, name in rows.items():
+        index.upsert(restaurant_id, {'name': name, 'city': 'sao paulo', 'type': ''})
+    # Substrings exatas primeiro (empate: menor id), depois os erros de digitação
+    assert index.fuzzy_search({'name': 'pizzaria bella'}, 10) == [3, 5, 2, 1]
+    assert index.fuzzy_search({'name': 'pizzaria bella'}, 3) == [3, 5, 2]
+    assert index.fuzzy_search({'name': 'pizaria', 'city': 'sao paolo'}, 10)[:2] == [2, 1]
+    assert index.fuzzy_search({'name': 'pizza', 'city': 'rio'}, 10) == []
+
+def test_search_tolerates_typos_with_fuzzy(client, restaurants, fresh_index):
+    assert client.get('/api/restaurants/search?name=churascaria').get_json() == []
+    assert _names(client.get('/api/restaurants/search?name=churascaria&fuzzy=1')) == ['Churrascaria Gaúcha']
+    response = client.get('/api/restaurants/search?city=sao paolo&state=sp&fuzzy=1&limit=1')
+    assert _names(response) == ['Italian Bistro']
+    assert 'X-Next-Cursor' not in response.headers
+    # Termos curtos não geram trigramas: a busca continua exata
+    assert _names(client.get('/api/restaurants/search?state=rj&fuzzy=1')) == ['Brazilian Grill']
+
+def test_fuzzy_index_follows_committed_writes(client, restaurants, fresh_index):
+    assert _names(client.get('/api/restaurants/search?name=sushi expres&fuzzy=1')) == ['Sushi Express']
+    restaurants[3].name = 'Taqueria Sushi Expresso'
+    db.session.delete(restaurants[2])
+    db.session.commit()
+    assert _names(client.get('/api/restaurants/search?name=sushi expres&fuzzy=1')) == ['Taqueria Sushi Expresso']
+
+def test_fuzzy_index_follows_writes_from_other_processes(client, restaurants, fresh_index, other_process, monkeypatch):
+    monkeypatch.setattr(fresh_index.catalog, 'interval', 0)
+    assert _names(client.get('/api/restaurants/search?name=taco hous&fuzzy=1')) == ['Taco House']
+    other_process(restaurants[3].id, name='Tacos del Barrio')
+    assert client.get('/api/restaurants/search?name=taco hous&fuzzy=1').get_json() == []
+    assert _names(client.get('/api/restaurants/search?name=tacos del bario&fuzzy=1')) == ['Tacos del Barrio']
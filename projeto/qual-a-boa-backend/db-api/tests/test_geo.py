@@ -0,0 +1,76 @@
+"""
+Testes da tabela de CEPs, da grade espacial e da busca por proximidade.
+"""
+
+import math
+import random
+
+from sqlalchemy import update
+
+from app.extensions import db
+from app.models import Restaurant
+from app.services.geo import backfill_location_columns
+from app.utils.geo import CepCoordinates, cell_ranges, geo_cell, haversine_km
+
+def test_lookup_uses_longest_prefix(tmp_path):
+    path = tmp_path / 'ceps.csv'
+    path.write_text('# comentário\ncep,latitude,longitude\n01,-23.5,-46.6\n01310-100,-23.56,-46.65\n')
+    table = CepCoordinates(str(path))
+    assert table.lookup('01310-100') == (-23.56, -46.65)
+    assert table.lookup('01999-000') == (-23.5, -46.6)
+    assert table.lookup('99999-999') is None
+    assert table.lookup(None) is None
+
+def test_cell_ranges_cover_points_within_radius():
+    rng = random.Random(7)
+    for lat, lon, radius in ((-23.55, -46.63, 5), (-30.03, -51.22, 0.5), (0.0, 179.99, 20), (-89.9, 10.0, 30)):
+        ranges = cell_ranges(lat, lon, radius)
+        for _ in range(200):
+            # Ponto aleatório dentro do raio
+            other_lat = max(-90, min(90, lat + rng.uniform(-1, 1) * radius / 111.32))
+            span = min(180, radius / (111.32 * max(math.cos(math.radians(other_lat)), 1e-3)))
+            other_lon = (lon + rng.uniform(-1, 1) * span + 180) % 360 - 180
+            if haversine_km(lat, lon, other_lat, other_lon) > radius:
+                continue
+            cell = geo_cell(other_lat, other_lon)
+            assert any(first <= cell <= last for first, last in ranges)
+
+def test_writes_fill_location_from_cep(restaurants):
+    sao_paulo, rio = restaurants[0], restaurants[1]
+    assert (sao_paulo.latitude, sao_paulo.longitude) == (-23.5371, -46.6512)
+    assert sao_paulo.geo_cell == geo_cell(-23.5371, -46.6512)
+    assert rio.latitude == -22.9035
+
+def test_nearby_returns_closest_within_radius(client, restaurants):
+    response = client.get('/api/restaurants/nearby?lat=-23.55&lon=-46.64&radius_km=10')
+    assert response.status_code == 200
+    items = response.get_json()
+    assert [item['name'] for item in items] == ['Italian Bistro', 'Sushi Express']
+    assert items[0]['distance_km'] <= items[1]['distance_km'] <= 10
+    assert {'latitude', 'longitude', 'distance_km'} <= items[0].keys()
+
+    limited = client.get('/api/restaurants/nearby?lat=-23.55&lon=-46.64&radius_km=10&limit=1')
+    assert [item['name'] for item in limited.get_json()] == ['Italian Bistro']
+
+def test_nearby_rejects_invalid_parameters(client, app):
+    assert client.get('/api/restaurants/nearby?lon=-46.6').status_code == 400
+    assert client.get('/api/restaurants/nearby?lat=abc&lon=-46.6').status_code == 400
+    assert client.get('/api/restaurants/nearby?lat=-91&lon=-46.6').status_code == 400
+    assert client.get('/api/restaurants/nearby?lat=-23&lon=-46.6&radius_km=1000').status_code == 400
+
+def test_backfill_reports_unresolved_ceps(client, restaurants):
+    db.session.execute(update(Restaurant).values(latitude=None, longitude=None, geo_cell=None))
+    db.session.execute(update(Restaurant).where(Restaurant.id == restaurants[4].id).values(postal_code='99999-999'))
+    db.session.commit()
+    url = '/api/restaurants/nearby?lat=-23.55&lon=-46.64&radius_km=10'
+    before = client.get(url)
+    assert before.get_json() == []
+
+    assert backfill_location_columns(batch_size=2) == (5, 1)
+    located = db.session.query(Restaurant).filter(Restaurant.geo_cell.isnot(None)).count()
+    assert located == 4
+    # A ETag muda e o cache de respostas não serve mais a lista vazia
+    after = client.get(url, headers={'If-None-Match': before.headers['ETag']})
+    assert after.status_code == 200
+    assert after.headers['ETag'] != before.headers['ETag']
+    assert len(after.get_json()) == 2
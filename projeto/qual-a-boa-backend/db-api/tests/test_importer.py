@@ -0,0 +1,95 @@
+"""
+Testes da importação de restaurantes por arquivo (manage_restaurants.py import).
+"""
+
+import csv
+import json
+
+import pytest
+from sqlalchemy import insert
+
+from app.extensions import db
+from app.models import Restaurant
+from app.services import importer
+from app.services.importer import RestaurantImport
+
+FIELDS = ['cnpj', 'name', 'state', 'city', 'type', 'operating_hours', 'postal_code', 'street_number']
+
+def _record(i, **overrides):
+    record = {
+        'cnpj': f'{i // 10**6 % 100:02d}.{i // 1000 % 1000:03d}.{i % 1000:03d}/0001-00',
+        'name': f'Restaurante {i}', 'state': 'sp', 'city': 'São Paulo', 'type': 'Brasileira',
+        'operating_hours': 'Mon-Sun: 11:00-23:00', 'postal_code': '01000000', 'street_number': str(i),
+    }
+    record.update(overrides)
+    return record
+
+def _write_csv(path, records):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(records)
+
+def test_import_csv_validates_and_rejects(app, tmp_path):
+    path = tmp_path / 'restaurants.csv'
+    _write_csv(path, [_record(1), _record(2, cnpj='123'), _record(3, state='XX'), _record(1), _record(4)])
+
+    result = RestaurantImport(str(path), batch_size=2).run()
+    assert (result['position'], result['inserted'], result['rejected']) == (5, 2, 3)
+
+    restaurant = Restaurant.query.filter_by(name='Restaurante 4').one()
+    assert (restaurant.state, restaurant.postal_code, restaurant.city_search) == ('SP', '01000-000', 'sao paulo')
+
+    rejects = [json.loads(line) for line in open(f'{path}.rejects.ndjson', encoding='utf-8')]
+    assert [r['record'] for r in rejects] == [2, 3, 4]
+    assert rejects[2]['errors'] == ['cnpj: Restaurant with this CNPJ already exists']
+
+def test_import_ndjson(app, tmp_path):
+    path = tmp_path / 'restaurants.ndjson'
+    path.write_text(json.dumps(_record(1)) + '\n{oops\n' + json.dumps(_record(2)) + '\n', encoding='utf-8')
+    result = RestaurantImport(str(path)).run()
+    assert (result['inserted'], result['rejected']) == (2, 1)
+
+def test_import_resumes_after_last_committed_batch(app, tmp_path, monkeypatch):
+    path = tmp_path / 'restaurants.csv'
+    _write_csv(path, [_record(i) for i in range(10)])
+
+    write_batch = importer.write_batch
+    calls = []
+    def crash_on_third_batch(rows):
+        calls.append(len(rows))
+        if len(calls) == 3:
+            raise RuntimeError('crash')
+        write_batch(rows)
+    monkeypatch.setattr(importer, 'write_batch', crash_on_third_batch)
+
+    with pytest.raises(RuntimeError):
+        RestaurantImport(str(path), batch_size=3).run()
+    assert Restaurant.query.count() == 6
+
+    monkeypatch.setattr(importer, 'write_batch', write_batch)
+    result = RestaurantImport(str(path), batch_size=3).run()
+    assert (result['position'], result['inserted'], result['rejected']) == (10, 10, 0)
+    assert Restaurant.query.count() == 10
+
+def test_concurrent_insert_rejects_batch_and_continues(app, tmp_path, monkeypatch):
+    path = tmp_path / 'restaurants.csv'
+    _write_csv(path, [_record(i) for i in range(5)])
+
+    write_batch = importer.write_batch
+    def concurrent_insert(rows):
+        if len(rows) == 2 and Restaurant.query.count() == 0:
+            # Outra escrita grava o mesmo CNPJ depois da verificação do importador
+            data = {**rows[1], 'name': 'Concorrente'}
+            with db.engine.begin() as connection:
+                connection.execute(insert(Restaurant.__table__), data)
+        write_batch(rows)
+    monkeypatch.setattr(importer, 'write_batch', concurrent_insert)
+
+    result = RestaurantImport(str(path), batch_size=2).run()
+    assert (result['position'], result['inserted'], result['rejected']) == (5, 3, 2)
+    assert sorted(r.name for r in Restaurant.query) == ['Concorrente', 'Restaurante 2', 'Restaurante 3', 'Restaurante 4']
+
+    rejects = [json.loads(line) for line in open(f'{path}.rejects.ndjson', encoding='utf-8')]
+    assert [r['record'] for r in rejects] == [1, 2]
+    assert 'UNIQUE' in rejects[0]['errors'][0]
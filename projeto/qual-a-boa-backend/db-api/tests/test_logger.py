@@ -0,0 +1,51 @@
+"""
+Testes do pipeline de log baseado em fila.
+"""
+
+import json
+import logging
+import queue
+from logging.handlers import QueueListener
+
+from app.core.logger import DebugSampler, LazyQueueHandler, LoggerSingleton
+
+class _Capture(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(self.format(record))
+
+def _record(level, msg='Restaurante %s', args=(42,)):
+    return logging.LogRecord('test', level, __file__, 1, msg, args, None)
+
+def test_queue_handler_defers_formatting():
+    log_queue = queue.SimpleQueue()
+    LazyQueueHandler(log_queue).handle(_record(logging.INFO))
+    record = log_queue.get_nowait()
+    assert (record.msg, record.args) == ('Restaurante %s', (42,))
+    assert not hasattr(record, 'message')
+
+def test_listener_formats_records():
+    log_queue = queue.SimpleQueue()
+    capture = _Capture()
+    listener = QueueListener(log_queue, capture)
+    listener.start()
+    LazyQueueHandler(log_queue).handle(_record(logging.INFO))
+    listener.stop()
+    assert capture.messages == ['Restaurante 42']
+
+def test_debug_sampler_keeps_other_levels():
+    sampler = DebugSampler(0)
+    assert not sampler.filter(_record(logging.DEBUG))
+    assert sampler.filter(_record(logging.INFO))
+    assert DebugSampler(1).filter(_record(logging.DEBUG))
+
+def test_json_format(monkeypatch):
+    monkeypatch.setenv('LOG_FORMAT', 'json')
+    formatter = LoggerSingleton()._create_formatter()
+    entry = json.loads(formatter.format(_record(logging.WARNING)))
+    assert entry['event'] == 'Restaurante 42'
+    assert entry['level'] == 'warning'
+    assert 'timestamp' in entry
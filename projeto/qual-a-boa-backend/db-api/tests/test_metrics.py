@@ -0,0 +1,48 @@
+"""
+Testes das métricas expostas em /metrics.
+"""
+
+from prometheus_client import REGISTRY
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+def test_request_metrics(client, restaurants):
+    labels = {'blueprint': 'api.restaurants', 'endpoint': 'api.restaurants.get_restaurant', 'method': 'GET'}
+    before = _sample('qualaboa_http_request_duration_seconds_count', **labels)
+    ok = _sample('qualaboa_http_requests_total', status='200', **labels)
+    missing = _sample('qualaboa_http_requests_total', status='404', **labels)
+
+    client.get(f'/api/restaurants/{restaurants[0].id}')
+    client.get('/api/restaurants/999999')
+
+    assert _sample('qualaboa_http_request_duration_seconds_count', **labels) == before + 2
+    assert _sample('qualaboa_http_requests_total', status='200', **labels) == ok + 1
+    assert _sample('qualaboa_http_requests_total', status='404', **labels) == missing + 1
+    assert _sample('qualaboa_http_requests_in_progress') == 0
+
+def test_db_and_cache_metrics(client, restaurants):
+    endpoint = 'api.restaurants.search_restaurants'
+    queries = _sample('qualaboa_db_queries_total', endpoint=endpoint)
+    hits = _sample('qualaboa_cache_lookups_total', endpoint=endpoint, result='hit')
+    misses = _sample('qualaboa_cache_lookups_total', endpoint=endpoint, result='miss')
+
+    client.get('/api/restaurants/search?name=bistro')
+    client.get('/api/restaurants/search?name=bistro')
+
+    assert _sample('qualaboa_db_queries_total', endpoint=endpoint) > queries
+    assert _sample('qualaboa_db_query_seconds_total', endpoint=endpoint) > 0
+    assert _sample('qualaboa_cache_lookups_total', endpoint=endpoint, result='miss') == misses + 1
+    assert _sample('qualaboa_cache_lookups_total', endpoint=endpoint, result='hit') == hits + 1
+    assert _sample('qualaboa_db_pool_wait_seconds_count') > 0
+
+def test_metrics_endpoint(client, restaurants):
+    client.get('/api/restaurants/')
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain')
+    body = response.get_data(as_text=True)
+    assert 'qualaboa_http_request_duration_seconds_bucket{' in body
+    assert 'qualaboa_db_pool_checked_out' in body
+    # A própria rota não é medida
+    assert 'endpoint="metrics"' not in body
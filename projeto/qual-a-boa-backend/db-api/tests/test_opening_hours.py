@@ -0,0 +1,84 @@
+"""
+Testes do parser de horário de funcionamento e do filtro open_at/open_now.
+"""
+
+import pytest
+from sqlalchemy import delete, select
+
+from app.extensions import db
+from app.models import RestaurantHours
+from app.services import opening_hours
+from app.services.catalog_version import current_catalog_version
+from app.services.opening_hours import backfill_opening_hours
+from app.utils.opening_hours import OperatingHoursError, parse_operating_hours, parse_weekday_time
+
+def _open_days(text, hour):
+    minute = hour * 60
+    return [day for day in range(7)
+            if any(start <= day * 1440 + minute < end for start, end in parse_operating_hours(text))]
+
+def test_parser_understands_portuguese_and_english_formats():
+    assert _open_days('Mon-Fri: 11:00-22:00, Sat-Sun: 12:00-23:00', 11) == [0, 1, 2, 3, 4]
+    assert _open_days('Seg-Sex: 11:00-15:00, 18:00-23:00, Sáb e Dom: 12:00-00:00', 16) == [5, 6]
+    assert _open_days('Segunda a sexta 11h às 23h; Domingo: fechado', 12) == [0, 1, 2, 3, 4]
+    assert _open_days('11:00-23:00', 22) == list(range(7))
+    assert parse_operating_hours('24h') == [(day * 1440, (day + 1) * 1440) for day in range(7)]
+    assert parse_operating_hours('') == []
+
+def test_parser_splits_hours_past_midnight():
+    # Domingo 22h às 2h: o fim cai na segunda-feira, início da semana
+    assert parse_operating_hours('Dom: 22:00-02:00') == [(0, 120), (9960, 10080)]
+    assert parse_weekday_time('sáb 20:30') == 5 * 1440 + 20 * 60 + 30
+
+def test_parser_rejects_unknown_text():
+    for text in ('Horário comercial', 'Seg-Sex', 'Seg: 25:00-26:00'):
+        with pytest.raises(OperatingHoursError):
+            parse_operating_hours(text)
+
+def test_search_filters_by_open_at(client, restaurants):
+    # Segunda-feira 19h: o Sushi Express só abre de terça a domingo
+    monday = client.get('/api/restaurants/search?open_at=2026-10-19T19:00&fields=name').get_json()
+    assert [item['name'] for item in monday] == [
+        'Italian Bistro', 'Brazilian Grill', 'Taco House', 'Churrascaria Gaúcha'
+    ]
+    tuesday = client.get('/api/restaurants/search?open_at=ter 22:30&city=paulo&fields=name').get_json()
+    assert [item['name'] for item in tuesday] == ['Sushi Express']
+    facets = client.get('/api/restaurants/facets?open_at=sun 08:00').get_json()
+    assert facets['total'] == 0
+
+    assert client.get('/api/restaurants/search?open_at=amanha').status_code == 400
+    assert client.get('/api/restaurants/facets?open_at=amanha').status_code == 400
+
+def test_open_now_uses_current_minute_in_etag(client, restaurants, monkeypatch):
+    monkeypatch.setattr(opening_hours, 'current_minute', lambda: 1 * 1440 + 18 * 60 + 30)
+    response = client.get('/api/restaurants/search?open_now=1&fields=name')
+    assert len(response.get_json()) == 5
+
+    monkeypatch.setattr(opening_hours, 'current_minute', lambda: 1 * 1440 + 3 * 60)
+    later = client.get('/api/restaurants/search?open_now=1&fields=name',
+                       headers={'If-None-Match': response.headers['ETag']})
+    assert later.status_code == 200
+    assert later.get_json() == []
+
+def test_writes_keep_intervals_and_backfill_reports_unparsed(client, restaurants, auth_headers):
+    data = restaurants[2].to_dict()
+    del data['id']
+    client.put(f'/api/restaurants/{restaurants[2].id}', json={**data, 'operating_hours': 'Seg: 08:00-09:00'},
+               headers=auth_headers)
+    intervals = db.session.execute(
+        select(RestaurantHours.opens_at, RestaurantHours.closes_at).filter_by(restaurant_id=restaurants[2].id)
+    ).all()
+    assert intervals == [(480, 540)]
+    client.delete(f'/api/restaurants/{restaurants[3].id}', headers=auth_headers)
+    assert not db.session.execute(select(RestaurantHours).filter_by(restaurant_id=restaurants[3].id)).first()
+
+    restaurants[4].operating_hours = 'Sob consulta'
+    db.session.commit()
+    db.session.execute(delete(RestaurantHours))
+    db.session.commit()
+    version = current_catalog_version()
+    total, unparsed = backfill_opening_hours(batch_size=2)
+    assert total == 4
+    assert current_catalog_version() == version + 2  # um incremento por lote
+    assert [(restaurant_id, text) for restaurant_id, text, _ in unparsed] == [(restaurants[4].id, 'Sob consulta')]
+    assert db.session.query(RestaurantHours.restaurant_id).distinct().count() == 3
@@ -0,0 +1,57 @@
+"""
+Testes da paginação por cursor e da projeção de campos das listagens.
+"""
+
+from app.services.trigram_index import restaurant_index
+
+def _walk(client, url):
+    """Percorre todas as páginas seguindo o cabeçalho X-Next-Cursor."""
+    pages = []
+    after = None
+    while True:
+        response = client.get(url if after is None else f'{url}&after={after}')
+        assert response.status_code == 200
+        pages.append([r['id'] for r in response.get_json()])
+        after = response.headers.get('X-Next-Cursor')
+        if after is None:
+            return pages
+
+def test_list_is_paginated_by_id(client, restaurants):
+    ids = [r.id for r in restaurants]
+    assert _walk(client, '/api/restaurants/?limit=2') == [ids[0:2], ids[2:4], ids[4:5]]
+
+def test_link_header_points_to_next_page(client, restaurants):
+    response = client.get('/api/restaurants/?limit=4&fields=name')
+    assert response.headers['X-Next-Cursor'] == str(restaurants[3].id)
+    assert f'after={restaurants[3].id}' in response.headers['Link']
+    assert 'fields=name' in response.headers['Link']
+
+def test_fields_projection_always_includes_id(client, restaurants):
+    response = client.get('/api/restaurants/?fields=name,city&limit=1')
+    assert response.get_json() == [{'id': restaurants[0].id, 'name': 'Italian Bistro', 'city': 'São Paulo'}]
+
+def test_full_page_matches_to_dict(client, restaurants):
+    response = client.get('/api/restaurants/')
+    assert response.get_json() == [r.to_dict() for r in restaurants]
+    assert 'X-Next-Cursor' not in response.headers
+
+def test_invalid_pagination_arguments(client, restaurants):
+    assert client.get('/api/restaurants/?limit=0').status_code == 400
+    assert client.get('/api/restaurants/?after=abc').status_code == 400
+    assert client.get('/api/restaurants/?fields=password').status_code == 400
+
+def test_search_uses_same_contract(client, restaurants):
+    pages = _walk(client, '/api/restaurants/search?type=an&limit=2')
+    assert pages == [[r.id for r in restaurants[0:2]], [r.id for r in restaurants[2:4]]]
+
+def test_memory_search_fills_pages_after_remaining_filters(client, restaurants):
+    restaurant_index.enabled = True
+    try:
+        pages = _walk(client, '/api/restaurants/search?name=ian&state=rj&limit=1')
+        assert pages == [[restaurants[1].id]]
+        pages = _walk(client, '/api/restaurants/search?city=paulo&state=sp&limit=1')
+        assert pages == [[restaurants[0].id], [restaurants[2].id]]
+    finally:
+        restaurant_index.enabled = False
+        restaurant_index._built = False
+        restaurant_index._clear()
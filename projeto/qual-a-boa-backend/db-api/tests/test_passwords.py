@@ -0,0 +1,93 @@
+"""
+Testes do pool de hashing de senhas e do login.
+"""
+
+import threading
+
+import pytest
+
+from app.extensions import db
+from app.models import User
+from app.services.passwords import PasswordHasher, PasswordPoolBusy, password_hasher
+
+@pytest.fixture
+def user(app):
+    user = User(username='maria', email='maria@example.com')
+    user.set_password('Senha1234')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+def _login(client, password='Senha1234'):
+    return client.post('/api/auth/login', json={'email': 'maria@example.com', 'password': password})
+
+def test_login_verifies_password_in_pool(client, user):
+    assert user.password_hash.startswith('$2b$04$')
+    assert _login(client).status_code == 200
+    assert _login(client, 'errada').status_code == 401
+
+def test_login_rehashes_when_cost_changes(client, user):
+    password_hasher.rounds = 5
+    assert _login(client).status_code == 200
+    db.session.refresh(user)
+    assert user.password_hash.startswith('$2b$05$')
+    assert user.check_password('Senha1234')
+
+def test_saturated_pool_returns_503(client, user):
+    password_hasher.configure(rounds=4, workers=1, max_pending=0, timeout=5)
+    release = threading.Event()
+    blocker = threading.Thread(target=password_hasher.run, args=(release.wait,))
+    blocker.start()
+    try:
+        response = _login(client)
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '1'
+    finally:
+        release.set()
+        blocker.join()
+    assert _login(client).status_code == 200
+
+def test_shared_slots_limit_other_processes(client, user, tmp_path):
+    # Outro worker do mesmo host: outra instância, mesmas vagas em disco
+    other = PasswordHasher(rounds=4, workers=1, max_pending=0, lock_dir=str(tmp_path))
+    password_hasher.configure(rounds=4, workers=1, max_pending=0, timeout=5, lock_dir=str(tmp_path))
+    started, release = threading.Event(), threading.Event()
+    def hold():
+        started.set()
+        release.wait()
+    blocker = threading.Thread(target=other.run, args=(hold,))
+    blocker.start()
+    try:
+        assert started.wait(5)
+        assert _login(client).status_code == 503
+    finally:
+        release.set()
+        blocker.join()
+    assert _login(client).status_code == 200
+
+def test_shared_slots_wait_for_running_operation(tmp_path):
+    hasher = PasswordHasher(rounds=4, workers=1, max_pending=1, timeout=0.05, lock_dir=str(tmp_path))
+    slot = hasher._running.try_acquire()
+    try:
+        # Com vaga na fila, espera até o timeout pela vaga de execução
+        with pytest.raises(PasswordPoolBusy, match='timed out'):
+            hasher.hash('x')
+    finally:
+        hasher._running.release(slot)
+    assert hasher.verify('x', hasher.hash('x'))
+
+def test_pool_releases_slots_after_errors():
+    hasher = PasswordHasher(rounds=4, workers=1, max_pending=0)
+    for _ in range(3):
+        with pytest.raises(ZeroDivisionError):
+            hasher.run(lambda: 1 / 0)
+    assert hasher.verify('x', hasher.hash('x'))
+    hasher.shutdown()
+
+def test_inline_mode_has_no_limit():
+    hasher = PasswordHasher(rounds=4, workers=0)
+    assert hasher.run(threading.get_ident) == threading.get_ident()
+
+def test_slow_operation_times_out():
+    with pytest.raises(PasswordPoolBusy):
+        PasswordHasher(rounds=4, workers=1, max_pending=0, timeout=0.01).run(threading.Event().wait, 1)
@@ -0,0 +1,95 @@
+"""
+Testes do orçamento de consultas, do detector de N+1 e do log de consultas lentas.
+"""
+
+import pytest
+from flask import g
+from sqlalchemy import text
+
+from app.extensions import db
+from app.models import User
+from app.services import query_monitor as monitor
+from app.services.query_monitor import QueryBudgetExceeded, query_monitor
+
+class _Warnings:
+    def __init__(self):
+        self.messages = []
+
+    def warning(self, msg, *args):
+        self.messages.append(msg % args)
+
+@pytest.fixture
+def warnings(monkeypatch):
+    captured = _Warnings()
+    monkeypatch.setattr(monitor, 'logger', captured)
+    return captured
+
+@pytest.fixture
+def routes(app):
+    """Rotas de teste que executam N consultas."""
+    @app.route('/_queries/<int:count>')
+    @query_monitor.budget(2)
+    def run_queries(count):
+        for _ in range(count):
+            db.session.execute(text('SELECT 1'))
+        return 'ok'
+    return app
+
+def test_budget_fails_request_in_testing(client, routes):
+    assert client.get('/_queries/2').status_code == 200
+    with pytest.raises(QueryBudgetExceeded, match='executed 3 queries'):
+        client.get('/_queries/3')
+
+def test_budget_only_warns_when_not_enforced(client, routes, warnings, monkeypatch):
+    monkeypatch.setattr(query_monitor, 'enforce', False)
+    assert client.get('/_queries/3').status_code == 200
+    assert any('Query budget exceeded' in message for message in warnings.messages)
+
+def test_repeated_select_is_reported(client, routes, warnings, monkeypatch):
+    monkeypatch.setattr(query_monitor, 'enforce', False)
+    client.get(f'/_queries/{query_monitor.repeat_threshold}')
+    assert any('Possible N+1' in message for message in warnings.messages)
+
+def test_slow_query_logs_route_and_parameters(client, restaurants, warnings, monkeypatch):
+    monkeypatch.setattr(query_monitor, 'slow_seconds', 0.0)
+    client.get(f'/api/restaurants/{restaurants[0].id}')
+    slow = [message for message in warnings.messages if message.startswith('Slow query')]
+    assert slow
+    assert 'api.restaurants.get_restaurant' in slow[-1]
+    assert f'({restaurants[0].id},' in slow[-1]
+
+def test_slow_user_update_does_not_log_secrets(app, warnings, monkeypatch):
+    user = User(username='maria', email='maria@example.com')
+    user.set_password('Senha1234')
+    db.session.add(user)
+    db.session.commit()
+
+    monkeypatch.setattr(query_monitor, 'slow_seconds', 0.0)
+    user.set_password('OutraSenha1')
+    user.email = 'maria.silva@example.com'
+    db.session.commit()
+    updates = [message for message in warnings.messages if 'UPDATE users' in message]
+    assert updates
+    assert all(user.password_hash not in message for message in updates)
+    assert all('maria.silva@example.com' not in message for message in updates)
+    assert monitor._redact_parameters(
+        'UPDATE users SET email=%(email)s WHERE users.id = %(users_id)s', {'email': 'x@y.z', 'users_id': 1},
+    ) == {'email': monitor.REDACTED, 'users_id': 1}
+
+def test_write_paths_skip_extra_round_trips(client, restaurants, auth_headers):
+    data = restaurants[0].to_dict()
+    del data['id']
+    db.session.expunge_all()  # sessão vazia, como no início de uma requisição
+
+    # CNPJ inalterado: sem a consulta de duplicidade nem o SELECT de recarga
+    response = client.put(f'/api/restaurants/{restaurants[0].id}', json={**data, 'name': 'Novo Nome'}, headers=auth_headers)
+    assert response.get_json()['name'] == 'Novo Nome'
+    assert g.db_query_count == 3
+
+    # Criação: UPDATE da versão do catálogo, INSERT e INSERT dos horários, sem SELECT prévio
+    created = client.post('/api/restaurants/', json={**data, 'cnpj': '10.000.000/0001-00'}, headers=auth_headers)
+    assert created.status_code == 201
+    assert g.db_query_count == 3
+
+    duplicate = client.post('/api/restaurants/', json={**data, 'name': 'Outro'}, headers=auth_headers)
+    assert duplicate.status_code == 400
@@ -0,0 +1,62 @@
+"""
+Testes da busca de restaurantes executada no banco de dados.
+"""
+
+def _names(response):
+    return sorted(r['name'] for r in response.get_json())
+
+def test_search_ignores_accents_and_case(client, restaurants):
+    response = client.get('/api/restaurants/search?city=SAO paulo')
+    assert response.status_code == 200
+    assert _names(response) == ['Italian Bistro', 'Sushi Express']
+
+def test_search_accented_term_matches_plain_text(client, restaurants):
+    response = client.get('/api/restaurants/search?name=gaucha')
+    assert _names(response) == ['Churrascaria Gaúcha']
+    response = client.get('/api/restaurants/search?type=Brazílian')
+    assert _names(response) == ['Brazilian Grill']
+
+def test_search_combines_filters(client, restaurants):
+    response = client.get('/api/restaurants/search?state=sp&type=jap')
+    assert _names(response) == ['Sushi Express']
+
+def test_search_treats_like_wildcards_literally(client, restaurants):
+    response = client.get('/api/restaurants/search?name=%25')
+    assert response.get_json() == []
+    response = client.get('/api/restaurants/search?name=_')
+    assert response.get_json() == []
+
+def test_search_without_filters_returns_everything(client, restaurants):
+    response = client.get('/api/restaurants/search')
+    assert len(response.get_json()) == len(restaurants)
+
+def test_search_columns_follow_updates(app, restaurants):
+    from app.extensions import db
+    restaurant = restaurants[0]
+    restaurant.city = 'Ribeirão Preto'
+    db.session.commit()
+    assert restaurant.city_search == 'ribeirao preto'
+
+def test_backfill_fills_search_columns(app, restaurants):
+    from app.extensions import db
+    from app.services.catalog_version import current_catalog_version
+    from app.services.search import backfill_search_columns
+    from app.services.suggest import suggest_index
+    from app.services.trigram_index import restaurant_index
+    db.session.execute(db.text("UPDATE restaurants SET name_search = '', city_search = ''"))
+    db.session.commit()
+    restaurant_index.rebuild()
+    suggest_index.rebuild()
+    version = current_catalog_version()
+    try:
+        assert backfill_search_columns(batch_size=2) == len(restaurants)
+        db.session.expire_all()
+        assert restaurants[-1].name_search == 'churrascaria gaucha'
+        assert restaurants[-1].city_search == 'porto alegre'
+        assert current_catalog_version() > version
+        # Os índices em memória já construídos recebem os novos valores
+        assert restaurant_index.search({'name': 'gaucha'}) == [restaurants[-1].id]
+        assert [item['value'] for item in suggest_index.suggest('city', 'porto')] == ['Porto Alegre']
+    finally:
+        restaurant_index.reset()
+        suggest_index.reset()
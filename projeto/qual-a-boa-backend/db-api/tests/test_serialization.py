@@ -0,0 +1,52 @@
+"""
+Testes da serialização rápida das respostas de restaurantes.
+"""
+
+import json
+
+import pytest
+from flask import jsonify
+
+from app.extensions import db
+from app.models import Restaurant
+from app.services.serialization import encode_rows, row_encoder, row_serializer
+
+@pytest.fixture
+def compact(app):
+    """Provedor JSON compacto, como em produção (DEBUG desligado)."""
+    app.json.compact = True
+    yield
+    app.json.compact = None
+
+def test_row_encoder_matches_json_dumps():
+    fields = ('id', 'name', 'operating_hours', 'city')
+    row = (7, 'Café "Zé"\n ', None, 'São Paulo')
+    expected = json.dumps(dict(zip(fields, row)), sort_keys=True, separators=(',', ':'))
+    assert row_encoder(fields)(row) == expected
+    expected = json.dumps(dict(zip(fields, row)), sort_keys=True)
+    assert row_encoder(fields, (', ', ': '))(row) == expected
+
+def test_list_output_is_identical_to_jsonify(client, restaurants, compact):
+    Restaurant.query.first().operating_hours = None
+    db.session.commit()
+    expected = jsonify([r.to_dict() for r in Restaurant.query.order_by(Restaurant.id)]).get_data()
+    assert client.get('/api/restaurants/').get_data() == expected
+
+def test_detail_and_fields_output_are_identical_to_jsonify(client, restaurants, compact):
+    restaurant = restaurants[4]
+    assert client.get(f'/api/restaurants/{restaurant.id}').get_data() == jsonify(restaurant.to_dict()).get_data()
+
+    expected = jsonify([{'id': r.id, 'city': r.city} for r in restaurants[:2]]).get_data()
+    assert client.get('/api/restaurants/?fields=city&limit=2').get_data() == expected
+
+def test_indented_provider_falls_back_to_jsonify(client, restaurants):
+    # TestingConfig usa DEBUG, então o Flask indenta a saída
+    expected = jsonify(restaurants[0].to_dict()).get_data()
+    assert client.get(f'/api/restaurants/{restaurants[0].id}').get_data() == expected
+
+def test_orjson_backend_produces_equivalent_json(app, restaurants, compact):
+    pytest.importorskip('orjson')
+    rows = db.session.execute(db.select(Restaurant.id, Restaurant.name, Restaurant.city)).all()
+    app.config['JSON_BACKEND'] = 'orjson'
+    assert json.loads(encode_rows(rows)) == [row._asdict() for row in rows]
+    assert json.loads(row_serializer(rows[0]._fields)(rows[0])) == rows[0]._asdict()
@@ -0,0 +1,69 @@
+"""
+Testes do modo streaming da listagem de restaurantes.
+"""
+
+import json
+import resource
+
+from sqlalchemy import insert
+
+from app.extensions import db
+from app.models import Restaurant
+
+def _seed(count, start=0):
+    """Insere restaurantes sintéticos em lotes."""
+    batch = []
+    for i in range(start, start + count):
+        batch.append({
+            'cnpj': f'{i:014d}', 'name': f'Restaurante {i}', 'state': 'SP', 'city': 'São Paulo',
+            'type': 'Brasileira', 'operating_hours': 'Mon-Sun: 11:00-23:00',
+            'postal_code': '01000-000', 'street_number': str(i % 1000),
+            'name_search': f'restaurante {i}', 'city_search': 'sao paulo', 'type_search': 'brasileira',
+        })
+        if len(batch) == 10000:
+            db.session.execute(insert(Restaurant), batch)
+            batch = []
+    if batch:
+        db.session.execute(insert(Restaurant), batch)
+    db.session.commit()
+
+def _max_rss():
+    """Pico de memória residente do processo, em bytes (Linux)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def _consume(client, url):
+    """Consome a resposta em streaming e retorna (linhas, bytes recebidos)."""
+    response = client.get(url, buffered=False)
+    lines = size = 0
+    for chunk in response.iter_encoded():
+        lines += chunk.count(b'\n')
+        size += len(chunk)
+    response.close()
+    return lines, size
+
+def test_ndjson_stream_matches_to_dict(client, restaurants):
+    response = client.get('/api/restaurants/', headers={'Accept': 'application/x-ndjson'})
+    assert response.mimetype == 'application/x-ndjson'
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert rows == [r.to_dict() for r in restaurants]
+
+def test_chunked_json_stream_returns_full_list(client, restaurants):
+    response = client.get('/api/restaurants/?stream=1&limit=1&fields=name')
+    assert response.get_json() == [{'id': r.id, 'name': r.name} for r in restaurants]
+
+def test_browser_accept_header_keeps_paginated_response(client, restaurants):
+    response = client.get('/api/restaurants/?limit=1', headers={'Accept': '*/*'})
+    assert len(response.get_json()) == 1
+
+def test_stream_memory_is_flat_at_500k_rows(client, app):
+    _seed(500000)
+    db.session.expunge_all()
+    baseline = _max_rss()
+    lines, size = _consume(client, '/api/restaurants/?stream=ndjson')
+    growth = _max_rss() - baseline
+
+    assert lines == 500000
+    # O corpo completo tem mais de 100 MB, mas o streaming mantém em memória
+    # apenas um bloco de STREAM_BATCH_SIZE linhas por vez
+    assert size > 100 * 1024 * 1024
+    assert growth < 32 * 1024 * 1024
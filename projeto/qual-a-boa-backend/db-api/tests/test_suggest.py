@@ -0,0 +1,83 @@
+"""
+Testes das sugestões por prefixo (autocomplete) de nomes e cidades.
+"""
+
+import random
+
+import pytest
+from flask import g
+
+from app.extensions import db
+from app.models import Restaurant
+from app.services import suggest
+from app.services.suggest import SuggestIndex, suggest_index
+
+@pytest.fixture
+def fresh_index(app):
+    suggest_index.reset()
+    yield suggest_index
+    suggest_index.reset()
+
+def test_memoized_prefixes_follow_incremental_changes(monkeypatch):
+    # Trechos pequenos também são memorizados, para exercitar os ajustes incrementais
+    monkeypatch.setattr(suggest, 'SCAN_LIMIT', 3)
+    monkeypatch.setattr(suggest, 'MAX_SUGGEST_LIMIT', 4)
+    index = SuggestIndex()
+    index._built = True
+    rng = random.Random(3)
+    words = [f'{a}{b}{c}' for a in 'ab' for b in 'ab' for c in 'abc']
+    rows = {}
+    for step in range(600):
+        restaurant_id = rng.randrange(40)
+        if restaurant_id in rows and rng.random() < 0.3:
+            del rows[restaurant_id]
+            index.apply({restaurant_id: None})
+        else:
+            word = rng.choice(words)
+            rows[restaurant_id] = word
+            index.apply({restaurant_id: {'name': (word, word.upper()), 'city': ('', '')}})
+        for prefix in ('a', 'ab', 'b', 'bb'):
+            counts = {}
+            for word in rows.values():
+                if word.startswith(prefix):
+                    counts[word] = counts.get(word, 0) + 1
+            expected = sorted(counts, key=lambda word: (-counts[word], word))[:4]
+            assert [item['value'].lower() for item in index.suggest('name', prefix, 4)] == expected
+
+def test_suggest_ranks_by_frequency_without_db_round_trips(client, restaurants, fresh_index):
+    response = client.get('/api/restaurants/suggest?q=Sa&field=city')
+    assert response.get_json() == [{'value': 'São Paulo', 'count': 2}]
+
+    names = client.get('/api/restaurants/suggest?q=b&limit=5')
+    assert names.get_json() == [{'value': 'Brazilian Grill', 'count': 1}]
+    assert g.db_query_count == 0
+
+def test_suggest_follows_committed_writes(client, restaurants, fresh_index):
+    assert client.get('/api/restaurants/suggest?q=porto&field=city').get_json() == [
+        {'value': 'Porto Alegre', 'count': 1}
+    ]
+    db.session.add(Restaurant(
+        cnpj='66.777.888/0001-99', name='Bistrô do Porto', state='RS', city='Porto Alegre', type='Bistrô',
+        operating_hours='Mon-Sun: 11:00-23:00', postal_code='90000-000', street_number='1',
+    ))
+    restaurants[1].city = 'Portão'
+    db.session.delete(restaurants[4])
+    db.session.commit()
+
+    cities = client.get('/api/restaurants/suggest?q=port&field=city').get_json()
+    # Empate na contagem: ordem alfabética do valor normalizado ('portao' < 'porto alegre')
+    assert cities == [{'value': 'Portão', 'count': 1}, {'value': 'Porto Alegre', 'count': 1}]
+    assert client.get('/api/restaurants/suggest?q=churrascaria').get_json() == []
+
+def test_suggest_follows_writes_from_other_processes(client, restaurants, fresh_index, other_process, monkeypatch):
+    monkeypatch.setattr(fresh_index.catalog, 'interval', 0)
+    assert client.get('/api/restaurants/suggest?q=sa&field=city').get_json() == [{'value': 'São Paulo', 'count': 2}]
+    other_process(restaurants[1].id, city='Santos')
+    assert client.get('/api/restaurants/suggest?q=sa&field=city').get_json() == [
+        {'value': 'São Paulo', 'count': 2}, {'value': 'Santos', 'count': 1}
+    ]
+
+def test_suggest_rejects_invalid_parameters(client, fresh_index):
+    assert client.get('/api/restaurants/suggest').status_code == 400
+    assert client.get('/api/restaurants/suggest?q=sa&field=type').status_code == 400
+    assert client.get('/api/restaurants/suggest?q=sa&limit=0').status_code == 400
@@ -0,0 +1,65 @@
+"""
+Testes do índice de trigramas em memória usado pela busca.
+"""
+
+import pytest
+
+from app.extensions import db
+from app.models import Restaurant
+from app.services.catalog_version import current_catalog_version
+from app.services.trigram_index import TrigramIndex, restaurant_index
+
+@pytest.fixture
+def memory_index(app):
+    restaurant_index.enabled = True
+    restaurant_index.rebuild()
+    yield restaurant_index
+    restaurant_index.enabled = False
+    restaurant_index.reset()
+
+def _names(response):
+    return sorted(r['name'] for r in response.get_json())
+
+def test_search_intersects_postings_and_confirms_substring():
+    index = TrigramIndex()
+    index._built = True
+    index.upsert(1, {'name': 'pizzaria bella', 'city': 'sao paulo', 'type': 'pizza'})
+    index.upsert(2, {'name': 'bella napoli', 'city': 'campinas', 'type': 'italian'})
+    index.upsert(3, {'name': 'ellab', 'city': 'sao paulo', 'type': 'pizza'})
+    assert index.search({'name': 'bella'}) == [1, 2]
+    assert index.search({'name': 'Bélla', 'city': 'paulo'}) == [1]
+    assert index.search({'name': 'bella', 'type': 'pi'}) == [1]
+    index.remove(1)
+    assert index.search({'name': 'bella'}) == [2]
+    assert index.memory_usage()['fields']['name']['documents'] == 2
+
+def test_index_follows_committed_writes(client, restaurants, memory_index):
+    assert _names(client.get('/api/restaurants/search?city=sao paulo&state=sp')) == ['Italian Bistro', 'Sushi Express']
+
+    restaurants[1].city = 'São Paulo'
+    db.session.add(Restaurant(
+        cnpj='66.777.888/0001-99', name='Pastelaria Paulista', state='SP', city='São Paulo',
+        type='Snack', operating_hours='', postal_code='01000-000', street_number='1'
+    ))
+    db.session.delete(restaurants[0])
+    db.session.commit()
+    assert _names(client.get('/api/restaurants/search?city=paulo')) == [
+        'Brazilian Grill', 'Pastelaria Paulista', 'Sushi Express'
+    ]
+
+def test_index_follows_writes_from_other_processes(client, restaurants, memory_index, other_process, monkeypatch):
+    monkeypatch.setattr(memory_index.catalog, 'interval', 0)
+    # Commits do próprio processo avançam a versão sem reconstruir o índice
+    restaurants[1].name = 'Brazilian Grill House'
+    db.session.commit()
+    assert memory_index.catalog.version == current_catalog_version()
+
+    other_process(restaurants[3].id, name='Taco Bistro')
+    assert _names(client.get('/api/restaurants/search?name=bistro')) == ['Italian Bistro', 'Taco Bistro']
+
+def test_index_ignores_rolled_back_writes(client, restaurants, memory_index):
+    restaurants[0].name = 'Cantina Nova'
+    db.session.flush()
+    db.session.rollback()
+    assert client.get('/api/restaurants/search?name=cantina').get_json() == []
+    assert _names(client.get('/api/restaurants/search?name=bistro')) == ['Italian Bistro']
@@ -0,0 +1,88 @@
+"""
+Testes da rota /api/auth/me respondida a partir do token e do cache de usuários.
+"""
+
+import time
+
+import fakeredis
+import pytest
+from flask_jwt_extended import decode_token
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models import User
+from app.services import user_cache as user_cache_module
+from app.services.user_cache import UserCache
+
+@pytest.fixture
+def token(client):
+    user = User(username='maria', email='maria@example.com')
+    user.set_password('Senha1234')
+    db.session.add(user)
+    db.session.commit()
+    response = client.post('/api/auth/login', json={'email': 'maria@example.com', 'password': 'Senha1234'})
+    return response.get_json()['access_token']
+
+@pytest.fixture
+def statements(app):
+    captured = []
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    yield captured
+    event.remove(db.engine, 'before_cursor_execute', capture)
+
+def _me(client, token):
+    return client.get('/api/auth/me', headers={'Authorization': f'Bearer {token}'})
+
+def test_token_carries_public_profile(app, token):
+    claims = decode_token(token)
+    assert claims['profile'] == {'id': 1, 'username': 'maria', 'email': 'maria@example.com'}
+    assert claims['version'] == 1
+
+def test_me_is_answered_without_queries(client, token, statements):
+    _me(client, token)
+    statements.clear()
+    for _ in range(3):
+        response = _me(client, token)
+        assert response.get_json()['username'] == 'maria'
+    assert statements == []
+
+def test_profile_update_invalidates_cache(client, token):
+    user = User.query.filter_by(username='maria').one()
+    user.username = 'maria.silva'
+    db.session.commit()
+    assert _me(client, token).get_json()['username'] == 'maria.silva'
+
+def test_deleted_user_is_not_served_from_token(client, token):
+    db.session.delete(User.query.filter_by(username='maria').one())
+    db.session.commit()
+    assert _me(client, token).status_code == 404
+
+def test_deleted_by_other_process_is_not_served_from_token(client, token, monkeypatch):
+    assert _me(client, token).status_code == 200
+    # Outro processo (ex.: manage_users.py delete) tem o próprio cache
+    monkeypatch.setattr(user_cache_module, 'user_cache', UserCache())
+    db.session.delete(User.query.filter_by(username='maria').one())
+    db.session.commit()
+    monkeypatch.undo()
+    user_cache_module.user_cache._synced_at -= user_cache_module.user_cache.sync_interval
+    assert _me(client, token).status_code == 404
+
+def test_redis_generation_clears_other_processes():
+    server = fakeredis.FakeServer()
+    worker = UserCache(ttl=60, client=fakeredis.FakeRedis(server=server))
+    cli = UserCache(ttl=60, client=fakeredis.FakeRedis(server=server))
+    worker.set(1, 3)
+    worker.set(2, 1)
+    assert worker.get(1) == 3
+
+    cli.invalidate([1])
+    assert worker.get(1) is None
+    assert worker.get(2) is None
+
+def test_entries_expire_after_ttl():
+    cache = UserCache(ttl=0.001)
+    cache.set(1, 1)
+    time.sleep(0.01)
+    assert cache.get(1) is None
@@ -0,0 +1,44 @@
+"""
+Testes da validação única das requisições de escrita de restaurantes.
+"""
+
+from app.models import Restaurant
+
+PAYLOAD = {
+    'cnpj': '33.444.555/0001-66', 'name': 'Cantina', 'state': 'sp', 'city': 'Campinas',
+    'type': 'Italian', 'operating_hours': 'Mon-Sun: 11:00-23:00', 'postal_code': '13010000',
+    'street_number': '10',
+}
+
+def test_create_receives_normalized_payload(client, auth_headers):
+    response = client.post('/api/restaurants/', json=PAYLOAD, headers=auth_headers)
+    assert response.status_code == 201
+    data = response.get_json()
+    assert (data['state'], data['postal_code']) == ('SP', '13010-000')
+    assert Restaurant.query.get(data['id']).city_search == 'campinas'
+
+def test_create_applies_pydantic_rules(client, auth_headers):
+    payload = {**PAYLOAD, 'cnpj': '33444555000166', 'state': 'XX'}
+    response = client.post('/api/restaurants/', json=payload, headers=auth_headers)
+    assert response.status_code == 400
+    errors = response.get_json()['errors']
+    assert set(errors) == {'cnpj', 'state'}
+
+def test_update_reports_missing_fields(client, restaurants, auth_headers):
+    payload = {key: value for key, value in PAYLOAD.items() if key != 'name'}
+    response = client.put(f'/api/restaurants/{restaurants[0].id}', json=payload, headers=auth_headers)
+    assert response.status_code == 400
+    assert 'name' in response.get_json()['errors']
+
+def test_invalid_json_and_content_type(client, auth_headers):
+    response = client.post('/api/restaurants/', data='{"cnpj":', headers={**auth_headers, 'Content-Type': 'application/json'})
+    assert response.status_code == 400
+    response = client.post('/api/restaurants/', data='cnpj=1', headers=auth_headers)
+    assert response.status_code == 415
+
+def test_bulk_uses_the_same_rules(client, auth_headers):
+    payload = [PAYLOAD, {**PAYLOAD, 'cnpj': '11.111.111/0001-11', 'postal_code': '123'}]
+    report = client.post('/api/restaurants/bulk', json=payload, headers=auth_headers).get_json()
+    assert [r['status'] for r in report['results']] == ['created', 'error']
+    assert 'postal_code' in report['results'][1]['errors']
+    assert Restaurant.query.filter_by(cnpj=PAYLOAD['cnpj']).one().state == 'SP'
@@ -0,0 +1,104 @@
+"""
+Testes do estado por worker (pós-fork) e do isolamento de sessões entre threads.
+"""
+
+import os
+import runpy
+import threading
+
+import pytest
+from sqlalchemy import func, select
+
+from app.extensions import db
+from app.models import Restaurant
+from app.services.cache import response_cache
+from app.services.suggest import suggest_index
+from app.services.trigram_index import restaurant_index
+from app.services.workers import init_worker
+
+GUNICORN_CONFIG = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'deploy', 'gunicorn_config.py')
+
+def test_init_worker_replaces_inherited_state(app, restaurants):
+    pool = db.engine.pool
+    backend = response_cache.backend
+    restaurant_index.rebuild()
+    suggest_index.rebuild()
+
+    init_worker(app)
+
+    assert db.engine.pool is not pool
+    assert response_cache.backend is not backend
+    assert not restaurant_index._built
+    assert not suggest_index._built
+    assert db.session.execute(select(func.count(Restaurant.id))).scalar() == len(restaurants)
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='requer os.fork')
+def test_forked_worker_uses_its_own_connections(app, restaurants):
+    # O processo "mestre" deixa uma conexão no pool, como o create_all do preload
+    db.session.execute(select(1))
+    db.session.commit()
+
+    pid = os.fork()
+    if pid == 0:
+        status = 1
+        try:
+            init_worker(app)
+            with app.app_context():
+                if db.session.execute(select(func.count(Restaurant.id))).scalar() == len(restaurants):
+                    status = 0
+        finally:
+            os._exit(status)
+
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
+    # As conexões do mestre continuam utilizáveis
+    assert db.session.execute(select(func.count(Restaurant.id))).scalar() == len(restaurants)
+
+def test_threads_get_isolated_sessions(app):
+    barrier = threading.Barrier(4)
+    errors = []
+
+    def worker(number):
+        with app.app_context():
+            restaurant = Restaurant(
+                cnpj=f'00.000.000/000{number}-00', name=f'Thread {number}', state='SP',
+                city='São Paulo', type='Brasileira', postal_code='01000-000', street_number=str(number),
+            )
+            db.session.add(restaurant)
+            barrier.wait(timeout=5)
+            if list(db.session.new) != [restaurant]:
+                errors.append(number)
+            db.session.rollback()
+
+    threads = [threading.Thread(target=worker, args=(number,)) for number in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+def test_concurrent_requests_return_their_own_rows(app, restaurants):
+    barrier = threading.Barrier(len(restaurants))
+    results = {}
+
+    def worker(restaurant_id):
+        client = app.test_client()
+        barrier.wait(timeout=5)
+        results[restaurant_id] = client.get(f'/api/restaurants/{restaurant_id}').get_json()['id']
+
+    ids = [restaurant.id for restaurant in restaurants]
+    threads = [threading.Thread(target=worker, args=(restaurant_id,)) for restaurant_id in ids]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == {restaurant_id: restaurant_id for restaurant_id in ids}
+
+@pytest.mark.parametrize('worker_class, preload', [('sync', True), ('gthread', True), ('gevent', False)])
+def test_gunicorn_config_by_worker_class(monkeypatch, worker_class, preload):
+    monkeypatch.setenv('GUNICORN_WORKER_CLASS', worker_class)
+    monkeypatch.setenv('WEB_CONCURRENCY', '3')
+    monkeypatch.setenv('GUNICORN_THREADS', '8')
+    settings = runpy.run_path(GUNICORN_CONFIG)
+    assert (settings['worker_class'], settings['workers'], settings['threads']) == (worker_class, 3, 8)
+    assert settings['preload_app'] is preload